@@ -1,26 +1,48 @@
 """FastAPI dependency injection."""
 
 from functools import lru_cache
+from typing import Annotated
+
+from fastapi import Depends, Request, Response
 
 from app.config import get_settings
-from app.repositories import ImageRepository, SlidesRepository, StyleRepository
+from app.exceptions import NotModifiedError
+from app.repositories import (
+    CacheRepository,
+    DownloadRepository,
+    ImageRepository,
+    SlidesRepository,
+    StyleRepository,
+)
 from app.services import (
+    Broker,
+    CassetteImageService,
     CostService,
+    EngineQueue,
+    EventBus,
     ExportService,
     GeminiService,
+    GenerationCache,
     ImageService,
+    InMemoryBroker,
+    LatencyStats,
+    MockImageService,
     NanoBananaService,
     SlidesService,
+    SqliteBroker,
     StyleService,
+    TaskRegistry,
     VolcEngineService,
 )
+from app.services.image_generation_service import ImageGenerationService
+from app.utils import etag_matches
 
 
 @lru_cache
 def get_slides_repository() -> SlidesRepository:
     """Get slides repository instance."""
     settings = get_settings()
-    return SlidesRepository(settings.slides_base_path)
+    return SlidesRepository(settings.slides_base_path, default_engine=settings.default_engine)
 
 
 @lru_cache
@@ -37,29 +59,120 @@ def get_image_repository() -> ImageRepository:
     return ImageRepository(settings.slides_base_path)
 
 
-def get_gemini_service() -> GeminiService:
-    """Get Gemini service instance (lazy-loaded)."""
+@lru_cache
+def get_generation_cache() -> GenerationCache | None:
+    """Get the shared generation cache, or None if disabled."""
+    settings = get_settings()
+    if not settings.generation_cache_enabled:
+        return None
+    return GenerationCache(
+        CacheRepository(
+            settings.generation_cache_path,
+            max_bytes=settings.generation_cache_max_mb * 1024 * 1024,
+            max_age_seconds=settings.generation_cache_max_age_days * 86400,
+        )
+    )
+
+
+def _with_cassette(engine: ImageGenerationService) -> ImageGenerationService:
+    """Wrap an engine in a record/replay cassette if one is configured.
+
+    The engine getters are cached, so every request shares one cassette per
+    engine and with it the locks and replay cursor that keep takes in order.
+    """
     settings = get_settings()
-    return GeminiService(settings.gemini_api_key)
+    if not settings.engine_cassette_mode:
+        return engine
+    return CassetteImageService(
+        engine,
+        settings.engine_cassette_path,
+        mode=settings.engine_cassette_mode,
+        replay_timing=settings.engine_cassette_replay_timing,
+    )
 
 
-def get_volcengine_service() -> VolcEngineService:
-    """Get VolcEngine service instance (lazy-loaded)."""
+@lru_cache
+def get_gemini_service() -> ImageGenerationService:
+    """Get Gemini service instance."""
     settings = get_settings()
-    return VolcEngineService(settings.ark_api_key)
+    return _with_cassette(GeminiService(settings.gemini_api_key))
 
 
-def get_nano_banana_service() -> NanoBananaService:
-    """Get Nano Banana service instance (lazy-loaded)."""
+@lru_cache
+def get_volcengine_service() -> ImageGenerationService:
+    """Get VolcEngine service instance."""
     settings = get_settings()
-    return NanoBananaService(
-        api_key=settings.nano_api_key,
-        base_url=settings.nano_base_url,
-        model=settings.nano_model,
-        image_size=settings.nano_image_size,
+    return _with_cassette(VolcEngineService(settings.ark_api_key))
+
+
+@lru_cache
+def get_nano_banana_service() -> ImageGenerationService:
+    """Get Nano Banana service instance."""
+    settings = get_settings()
+    return _with_cassette(
+        NanoBananaService(
+            api_key=settings.nano_api_key,
+            base_url=settings.nano_base_url,
+            model=settings.nano_model,
+            image_size=settings.nano_image_size,
+        )
     )
 
 
+@lru_cache
+def get_broker() -> Broker:
+    """Get the broker that carries WebSocket messages between API workers."""
+    settings = get_settings()
+    if settings.ws_broker == "sqlite":
+        return SqliteBroker(
+            settings.ws_broker_path,
+            poll_interval=settings.ws_broker_poll_interval,
+            retention_seconds=settings.ws_broker_retention_seconds,
+            worker_timeout=settings.ws_broker_worker_timeout,
+        )
+    return InMemoryBroker()
+
+
+@lru_cache
+def get_event_bus() -> EventBus:
+    """Get the process-wide bus for project change events."""
+    return EventBus()
+
+
+@lru_cache
+def get_task_registry() -> TaskRegistry:
+    """Get the process-wide background task registry."""
+    return TaskRegistry()
+
+
+@lru_cache
+def get_mock_image_service() -> MockImageService:
+    """Get the mock image service instance (shared so its RNG state persists)."""
+    settings = get_settings()
+    return MockImageService(
+        latency_distribution=settings.mock_latency_distribution,
+        latency_mean=settings.mock_latency_mean,
+        latency_stddev=settings.mock_latency_stddev,
+        failure_rate=settings.mock_failure_rate,
+        image_width=settings.mock_image_width,
+        seed=settings.mock_seed,
+    )
+
+
+@lru_cache
+def get_latency_stats() -> LatencyStats:
+    """Get the process-wide engine latency histograms."""
+    settings = get_settings()
+    return LatencyStats(settings.latency_stats_path)
+
+
+@lru_cache
+def get_engine_queue() -> EngineQueue:
+    """Get the process-wide per-engine concurrency queue."""
+    settings = get_settings()
+    return EngineQueue(settings.engine_max_concurrency or None)
+
+
 @lru_cache
 def get_cost_service() -> CostService:
     """Get cost service instance."""
@@ -69,7 +182,9 @@ def get_cost_service() -> CostService:
 
 def get_slides_service() -> SlidesService:
     """Get slides service instance."""
-    return SlidesService(get_slides_repository())
+    return SlidesService(
+        get_slides_repository(), task_registry=get_task_registry(), event_bus=get_event_bus()
+    )
 
 
 def get_style_service() -> StyleService:
@@ -80,6 +195,9 @@ def get_style_service() -> StyleService:
         gemini_service=get_gemini_service(),
         volcengine_service=get_volcengine_service(),
         nano_banana_service=get_nano_banana_service(),
+        mock_service=get_mock_image_service(),
+        generation_cache=get_generation_cache(),
+        event_bus=get_event_bus(),
     )
 
 
@@ -92,12 +210,65 @@ def get_image_service() -> ImageService:
         gemini_service=get_gemini_service(),
         volcengine_service=get_volcengine_service(),
         nano_banana_service=get_nano_banana_service(),
+        mock_service=get_mock_image_service(),
+        generation_cache=get_generation_cache(),
+        latency_stats=get_latency_stats(),
+        engine_queue=get_engine_queue(),
+    )
+
+
+@lru_cache
+def get_export_cache() -> CacheRepository | None:
+    """Get the shared cache of finished exports, or None if disabled."""
+    settings = get_settings()
+    if not settings.export_cache_enabled:
+        return None
+    return CacheRepository(
+        settings.export_cache_path,
+        max_bytes=settings.export_cache_max_mb * 1024 * 1024,
+        max_age_seconds=settings.export_cache_max_age_days * 86400,
+        suffix=".export",
+    )
+
+
+@lru_cache
+def get_download_repository() -> DownloadRepository:
+    """Get the store of finished background exports."""
+    settings = get_settings()
+    return DownloadRepository(
+        settings.export_downloads_path, ttl_seconds=settings.export_download_ttl_seconds
     )
 
 
 def get_export_service() -> ExportService:
     """Get export service instance."""
+    settings = get_settings()
     return ExportService(
         slides_repository=get_slides_repository(),
         image_repository=get_image_repository(),
+        prefetch_depth=settings.export_prefetch_depth,
+        export_cache=get_export_cache(),
+        download_repository=get_download_repository(),
     )
+
+
+async def check_project_etag(
+    slug: str,
+    request: Request,
+    response: Response,
+    repository: Annotated[SlidesRepository, Depends(get_slides_repository)],
+) -> None:
+    """Conditional GET for views of a project: the project version is the ETag.
+
+    A matching If-None-Match raises NotModifiedError (answered with 304) before
+    the project is loaded or serialized.
+    """
+    version = await repository.get_version(slug)
+    if version is None:
+        return  # Let the route handle a missing project
+    etag = f'"{version}"'
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None and etag_matches(if_none_match, etag):
+        raise NotModifiedError(etag)
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = "no-cache"
@@ -0,0 +1,40 @@
+"""Response classes."""
+
+import json
+from datetime import datetime
+from typing import Any
+
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # Optional speedup (pip install genslides-backend[speedups])
+    orjson = None  # type: ignore[assignment]
+
+
+def _default(value: Any) -> str:
+    """Encode values the stdlib encoder does not know (as orjson would)."""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def encode_json(content: Any) -> bytes:
+    """Encode content built by ``app.api.serializers`` as compact UTF-8 JSON."""
+    if orjson is not None:
+        return orjson.dumps(content)
+    return json.dumps(
+        content, ensure_ascii=False, allow_nan=False, separators=(",", ":"), default=_default
+    ).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """JSON response for content built by ``app.api.serializers``.
+
+    The content is encoded as-is, skipping response-model validation, with
+    orjson when installed and the stdlib encoder otherwise. Datetimes are
+    written in ISO 8601 either way.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return encode_json(content)
@@ -1,39 +1,72 @@
 """Images API routes."""
 
-import io
+import asyncio
 import logging
 import uuid
+from datetime import datetime, timedelta
+from email.utils import format_datetime
 from typing import Annotated
 
-from fastapi import APIRouter, BackgroundTasks, Depends
-from fastapi.responses import StreamingResponse
+from fastapi import APIRouter, Depends, Header, Query
+from fastapi.responses import FileResponse, Response, StreamingResponse
 
-from app.api.dependencies import get_export_service, get_image_service, get_slides_service
+from app.api.dependencies import (
+    check_project_etag,
+    get_export_service,
+    get_image_service,
+    get_slides_service,
+    get_task_registry,
+)
+from app.api.responses import FastJSONResponse
 from app.api.routes.websocket import manager
 from app.api.schemas import (
+    CancelTaskResponse,
     DeleteImageResponse,
+    ExportDownloadResponse,
+    ExportJobRequest,
+    ExportJobResponse,
     GenerateImageRequest,
     GenerateTaskResponse,
+    GenerationEstimateResponse,
     GetImagesResponse,
     SelectImageRequest,
     SelectImageResponse,
-    SlideImageResponse,
 )
-from app.services import ExportService, ImageService, SlidesService
-from app.utils import compute_content_hash
+from app.api.serializers import image_to_dict
+from app.config import Settings, get_settings
+from app.exceptions import InvalidRequestError, TaskNotFoundError
+from app.services import (
+    ExportArtifact,
+    ExportFormat,
+    ExportService,
+    ImageService,
+    SlidesService,
+    TaskRegistry,
+)
+from app.utils import compute_content_hash, etag_matches, paginate
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/slides", tags=["images"])
 
 
-@router.get("/{slug}/{sid}/images", response_model=GetImagesResponse)
+@router.get(
+    "/{slug}/{sid}/images",
+    response_model=GetImagesResponse,
+    dependencies=[Depends(check_project_etag)],
+)
 async def get_images(
     slug: str,
     sid: str,
-    service: Annotated[ImageService, Depends(get_image_service)],
+    response: Response,
     slides_service: Annotated[SlidesService, Depends(get_slides_service)],
-) -> GetImagesResponse:
-    """Get all images for a slide."""
+    limit: Annotated[int | None, Query(ge=1, le=200)] = None,
+    cursor: str | None = None,
+) -> FastJSONResponse:
+    """Get the images of a slide, oldest first.
+
+    Paginated when ``limit`` is given: pass the returned ``next_cursor`` as
+    ``cursor`` to get the next page.
+    """
     project = await slides_service.get_project(slug)
     slide = project.get_slide(sid)
 
@@ -44,22 +77,25 @@ async def get_images(
 
     content_hash = compute_content_hash(slide.content)
     has_matched = any(img.hash == content_hash for img in slide.images)
+    try:
+        page, next_cursor = paginate(
+            slide.images,
+            key=lambda img: (img.created_at.isoformat(), img.hash),
+            limit=limit,
+            cursor=cursor,
+        )
+    except ValueError as e:
+        raise InvalidRequestError(str(e)) from e
 
-    return GetImagesResponse(
-        sid=sid,
-        content_hash=content_hash,
-        images=[
-            SlideImageResponse(
-                hash=img.hash,
-                url=service.get_image_url(slug, sid, img.hash),
-                thumbnail_url=service.get_thumbnail_url(slug, sid, img.hash),
-                created_at=img.created_at.isoformat(),
-                matched=img.hash == content_hash,
-            )
-            for img in slide.images
-        ],
-        has_matched_image=has_matched,
-    )
+    content = {
+        "sid": sid,
+        "content_hash": content_hash,
+        "images": [image_to_dict(img, slug, sid, content_hash) for img in page],
+        "has_matched_image": has_matched,
+        "next_cursor": next_cursor,
+    }
+    # Keep the ETag set by check_project_etag
+    return FastJSONResponse(content, headers=response.headers)
 
 
 @router.post("/{slug}/{sid}/generate", response_model=GenerateTaskResponse)
@@ -67,14 +103,34 @@ async def generate_image(
     slug: str,
     sid: str,
     request: GenerateImageRequest,
-    background_tasks: BackgroundTasks,
     service: Annotated[ImageService, Depends(get_image_service)],
+    registry: Annotated[TaskRegistry, Depends(get_task_registry)],
+    settings: Annotated[Settings, Depends(get_settings)],
 ) -> GenerateTaskResponse:
     """Start async image generation for a slide."""
+    task_id = await start_generation(
+        slug, sid, service, registry, settings.generation_progress_interval, request.force
+    )
+    return GenerateTaskResponse(
+        task_id=task_id,
+        status="pending",
+        message="Image generation task submitted",
+    )
+
+
+async def start_generation(
+    slug: str,
+    sid: str,
+    service: ImageService,
+    registry: TaskRegistry,
+    progress_interval: float,
+    force: bool = False,
+) -> str:
+    """Submit a tracked generation task for a slide and return its task ID."""
     task_id = str(uuid.uuid4())
 
     # Track the generating task
-    manager.add_generating_task(slug, sid, task_id)
+    await manager.add_generating_task(slug, sid, task_id)
 
     # Notify clients that generation started
     await manager.broadcast(
@@ -85,21 +141,14 @@ async def generate_image(
         },
     )
 
-    # Run generation in background
-    background_tasks.add_task(
-        _generate_and_notify,
+    # Run generation as a tracked task so it can be cancelled by task_id or slide
+    registry.spawn(
         slug,
-        sid,
-        task_id,
-        request.force,
-        service,
-    )
-
-    return GenerateTaskResponse(
+        _generate_and_notify(slug, sid, task_id, force, service, progress_interval),
+        sid=sid,
         task_id=task_id,
-        status="pending",
-        message="Image generation task submitted",
     )
+    return task_id
 
 
 async def _generate_and_notify(
@@ -108,17 +157,20 @@ async def _generate_and_notify(
     task_id: str,
     force: bool,
     service: ImageService,
+    progress_interval: float,
 ) -> None:
     """Generate image and notify via WebSocket."""
+    progress = asyncio.create_task(_report_progress(slug, sid, task_id, service, progress_interval))
     try:
         logger.info(
             "Starting generation",
             extra={"slug": slug, "sid": sid, "task_id": task_id},
         )
-        slide_image = await service.generate_image(slug, sid, force)
+        slide_image = await service.generate_image(slug, sid, force, task_id=task_id)
+        progress.cancel()
 
         # Remove from generating tasks
-        manager.remove_generating_task(slug, sid)
+        await manager.remove_generating_task(slug, sid, task_id)
 
         # Notify success
         await manager.broadcast(
@@ -130,8 +182,13 @@ async def _generate_and_notify(
                     "sid": sid,
                     "image": {
                         "hash": slide_image.hash,
-                        "url": service.get_image_url(slug, sid, slide_image.hash),
-                        "thumbnail_url": service.get_thumbnail_url(slug, sid, slide_image.hash),
+                        "url": service.get_image_url(
+                            slug, sid, slide_image.hash, slide_image.data_hash
+                        ),
+                        "thumbnail_url": service.get_thumbnail_url(
+                            slug, sid, slide_image.hash, slide_image.data_hash
+                        ),
+                        "engine": slide_image.engine,
                     },
                 },
             },
@@ -139,11 +196,37 @@ async def _generate_and_notify(
 
         logger.info("Generation completed", extra={"slug": slug, "sid": sid})
 
+    except asyncio.CancelledError as e:
+        progress.cancel()
+        reason = str(e.args[0]) if e.args else "cancelled"
+        logger.info(
+            "Generation cancelled",
+            extra={"slug": slug, "sid": sid, "task_id": task_id, "reason": reason},
+        )
+
+        # Remove from generating tasks
+        await manager.remove_generating_task(slug, sid, task_id)
+
+        # Notify cancellation
+        await manager.broadcast(
+            slug,
+            {
+                "type": "generation_cancelled",
+                "data": {
+                    "task_id": task_id,
+                    "sid": sid,
+                    "reason": reason,
+                },
+            },
+        )
+        raise
+
     except Exception as e:
+        progress.cancel()
         logger.exception("Generation failed", extra={"slug": slug, "sid": sid})
 
         # Remove from generating tasks
-        manager.remove_generating_task(slug, sid)
+        await manager.remove_generating_task(slug, sid, task_id)
 
         # Notify failure
         await manager.broadcast(
@@ -159,6 +242,87 @@ async def _generate_and_notify(
         )
 
 
+async def _report_progress(
+    slug: str,
+    sid: str,
+    task_id: str,
+    service: ImageService,
+    interval: float,
+) -> None:
+    """Periodically broadcast queue position and ETA for a generation."""
+    while True:
+        await asyncio.sleep(interval)
+        estimate = await service.estimate_task(task_id)
+        if estimate is None:
+            continue
+
+        total = estimate.elapsed_seconds + estimate.remaining_seconds
+        await manager.broadcast(
+            slug,
+            {
+                "type": "generation_progress",
+                "data": {
+                    "task_id": task_id,
+                    "sid": sid,
+                    "engine": estimate.engine,
+                    "queue_position": estimate.queue_position,
+                    "elapsed_seconds": round(estimate.elapsed_seconds, 1),
+                    "remaining_seconds": round(estimate.remaining_seconds, 1),
+                    "progress": round(estimate.elapsed_seconds / total, 3) if total else 0.0,
+                    "eta": (
+                        datetime.now() + timedelta(seconds=estimate.remaining_seconds)
+                    ).isoformat(),
+                },
+            },
+            replay=False,
+        )
+
+
+@router.get("/{slug}/generate/estimate", response_model=GenerationEstimateResponse)
+async def estimate_generation(
+    slug: str,
+    service: Annotated[ImageService, Depends(get_image_service)],
+) -> GenerationEstimateResponse:
+    """Estimate how long generating all stale slides of a deck would take."""
+    estimate = await service.estimate_stale_slides(slug)
+    return GenerationEstimateResponse(
+        slug=slug,
+        engine=estimate.engine,
+        image_size=estimate.image_size,
+        stale_sids=estimate.stale_sids,
+        per_slide_p50_seconds=round(estimate.per_slide_p50, 1),
+        per_slide_p90_seconds=round(estimate.per_slide_p90, 1),
+        queued_ahead=estimate.queued_ahead,
+        estimated_seconds=round(estimate.estimated_seconds, 1),
+        estimated_seconds_p90=round(estimate.estimated_seconds_p90, 1),
+        samples=estimate.samples,
+    )
+
+
+@router.delete("/{slug}/tasks/{task_id}", response_model=CancelTaskResponse)
+async def cancel_task(
+    slug: str,
+    task_id: str,
+    registry: Annotated[TaskRegistry, Depends(get_task_registry)],
+) -> CancelTaskResponse:
+    """Cancel an in-flight background task (generation or export) by ID."""
+    entry = registry.get(task_id)
+    if entry is None or entry.slug != slug or not registry.cancel(task_id, "user"):
+        raise TaskNotFoundError(task_id)
+    return CancelTaskResponse(success=True, cancelled_task_ids=[task_id])
+
+
+@router.delete("/{slug}/{sid}/generate", response_model=CancelTaskResponse)
+async def cancel_generation(
+    slug: str,
+    sid: str,
+    registry: Annotated[TaskRegistry, Depends(get_task_registry)],
+) -> CancelTaskResponse:
+    """Cancel all in-flight generation tasks for a slide."""
+    task_ids = registry.cancel_slide(slug, sid, "user")
+    return CancelTaskResponse(success=bool(task_ids), cancelled_task_ids=task_ids)
+
+
 @router.put("/{slug}/{sid}/selected-image", response_model=SelectImageResponse)
 async def select_image(
     slug: str,
@@ -179,14 +343,158 @@ async def select_image(
 async def export_project(
     slug: str,
     service: Annotated[ExportService, Depends(get_export_service)],
-) -> StreamingResponse:
-    """Export project as ZIP file with numbered JPG images."""
-    zip_data = await service.export_zip(slug)
-
+    format: ExportFormat = "zip",
+    if_none_match: Annotated[str | None, Header()] = None,
+) -> Response:
+    """Export project as a ZIP of numbered JPG images, a PDF or a PPTX.
+
+    The ETag is the deck's manifest hash, so clients can revalidate with
+    If-None-Match. Unchanged decks are served from the export cache as a file
+    (with Range support); otherwise the export is streamed as it is built.
+    """
+    artifact = await service.export(slug, format)
+    headers = {"ETag": f'"{artifact.etag}"', "Cache-Control": "no-cache"}
+    if if_none_match is not None and etag_matches(if_none_match, headers["ETag"]):
+        return Response(status_code=304, headers=headers)
+
+    if artifact.path is not None:
+        return FileResponse(
+            artifact.path,
+            media_type=artifact.media_type,
+            filename=artifact.filename,
+            headers=headers,
+        )
+    assert artifact.chunks is not None  # Set whenever there is no cached file
     return StreamingResponse(
-        io.BytesIO(zip_data),
-        media_type="application/zip",
-        headers={"Content-Disposition": f'attachment; filename="{slug}.zip"'},
+        artifact.chunks,
+        media_type=artifact.media_type,
+        headers={
+            **headers,
+            "Content-Disposition": f'attachment; filename="{artifact.filename}"',
+        },
+    )
+
+
+@router.post("/{slug}/exports", response_model=ExportJobResponse)
+async def start_export(
+    slug: str,
+    request: ExportJobRequest,
+    service: Annotated[ExportService, Depends(get_export_service)],
+    registry: Annotated[TaskRegistry, Depends(get_task_registry)],
+) -> ExportJobResponse:
+    """Build an export in the background, for decks too large to download in one request.
+
+    Progress is broadcast as export_progress events; export_completed carries a
+    download URL that supports Range requests (so downloads can resume) and
+    expires after a TTL. The job can be cancelled with DELETE /{slug}/tasks/{task_id}.
+    """
+    task_id = str(uuid.uuid4())
+    last_percent = -1
+
+    async def on_progress(done: int, total: int) -> None:
+        # At most one event per percent, however large the deck
+        nonlocal last_percent
+        percent = 100 * done // total
+        if percent == last_percent:
+            return
+        last_percent = percent
+        await manager.broadcast(
+            slug,
+            {
+                "type": "export_progress",
+                "data": {
+                    "task_id": task_id,
+                    "format": request.format,
+                    "done": done,
+                    "total": total,
+                    "progress": done / total,
+                },
+            },
+            replay=False,
+        )
+
+    # Validates the project up front, so errors are returned with this request
+    artifact = await service.export(slug, request.format, on_progress)
+
+    await manager.broadcast(
+        slug,
+        {"type": "export_started", "data": {"task_id": task_id, "format": request.format}},
+    )
+    registry.spawn(
+        slug,
+        _export_and_notify(slug, task_id, request.format, artifact, service),
+        kind="export",
+        task_id=task_id,
+    )
+
+    return ExportJobResponse(
+        task_id=task_id,
+        status="pending",
+        message="Export task submitted",
+    )
+
+
+async def _export_and_notify(
+    slug: str,
+    task_id: str,
+    export_format: ExportFormat,
+    artifact: ExportArtifact,
+    service: ExportService,
+) -> None:
+    """Write an export to a download and notify via WebSocket."""
+    try:
+        download = await service.save_download(slug, artifact)
+        result = ExportDownloadResponse(
+            download_url=f"/api/slides/{slug}/exports/{download.token}",
+            filename=download.filename,
+            size=download.size,
+            expires_at=download.expires_at,
+        )
+        await manager.broadcast(
+            slug,
+            {
+                "type": "export_completed",
+                "data": {
+                    "task_id": task_id,
+                    "format": export_format,
+                    **result.model_dump(mode="json"),
+                },
+            },
+        )
+
+    except asyncio.CancelledError as e:
+        reason = str(e.args[0]) if e.args else "cancelled"
+        logger.info(
+            "Export cancelled",
+            extra={"slug": slug, "task_id": task_id, "reason": reason},
+        )
+        await manager.broadcast(
+            slug,
+            {"type": "export_cancelled", "data": {"task_id": task_id, "reason": reason}},
+        )
+        raise
+
+    except Exception as e:
+        logger.exception("Export failed", extra={"slug": slug, "task_id": task_id})
+        await manager.broadcast(
+            slug,
+            {"type": "export_failed", "data": {"task_id": task_id, "error": str(e)}},
+        )
+
+
+@router.get("/{slug}/exports/{token}")
+async def download_export(
+    slug: str,
+    token: str,
+    service: Annotated[ExportService, Depends(get_export_service)],
+) -> FileResponse:
+    """Download a finished background export (supports Range requests)."""
+    download, path = await service.get_download(slug, token)
+    return FileResponse(
+        path,
+        media_type=download.media_type,
+        filename=download.filename,
+        headers={"Expires": format_datetime(download.expires_at.astimezone(), usegmt=True)},
     )
 
 
@@ -3,77 +3,80 @@
 import logging
 from typing import Annotated
 
-from fastapi import APIRouter, Depends
-
-from app.api.dependencies import get_cost_service, get_slides_service
+from fastapi import APIRouter, Depends, Query, Request, Response
+
+from app.api.dependencies import (
+    check_project_etag,
+    get_cost_service,
+    get_image_service,
+    get_slides_service,
+    get_task_registry,
+)
+from app.api.responses import FastJSONResponse
+from app.api.routes.images import start_generation
+from app.api.routes.websocket import manager
 from app.api.schemas import (
+    BatchRequest,
+    BatchResponse,
     CostResponse,
     CreateSlideRequest,
     DeleteProjectResponse,
     DeleteSlideResponse,
     GetEngineResponse,
+    ImportOutlineResponse,
     ProjectListResponse,
     ProjectResponse,
     ProjectSummaryResponse,
     ReorderSlidesRequest,
     ReorderSlidesResponse,
-    SlideImageResponse,
     SlideResponse,
-    StyleResponse,
     UpdateEngineRequest,
     UpdateEngineResponse,
     UpdateSlideRequest,
     UpdateTitleRequest,
     UpdateTitleResponse,
 )
-from app.models import Slide
-from app.services import CostService, SlidesService
-from app.utils import compute_content_hash
+from app.api.serializers import (
+    PROJECT_INCLUDES,
+    SLIDE_FIELDS,
+    parse_selection,
+    project_to_dict,
+    slide_to_dict,
+)
+from app.config import Settings, get_settings
+from app.exceptions import InvalidRequestError, StyleNotSetError
+from app.models import SlideOperation
+from app.services import CostService, ImageService, SlidesService, TaskRegistry
+from app.utils import compute_content_hash, paginate
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/slides", tags=["slides"])
 
 
-def _slide_to_response(slide: Slide, slug: str) -> SlideResponse:
-    """Convert a Slide model to response schema."""
-    current_image = None
-    content_hash = compute_content_hash(slide.content)
-
-    # Build list of all images
-    all_images: list[SlideImageResponse] = []
-    for img in slide.images:
-        all_images.append(
-            SlideImageResponse(
-                hash=img.hash,
-                url=f"/static/slides/{slug}/{img.path}",
-                thumbnail_url=f"/static/slides/{slug}/images/{slide.sid}/{img.hash}_thumb.jpg",
-                created_at=img.created_at.isoformat(),
-                matched=img.hash == content_hash,
-            )
-        )
-
-    # Current image is the latest one
-    if all_images:
-        current_image = all_images[-1]
-
-    return SlideResponse(
-        sid=slide.sid,
-        content=slide.content,
-        created_at=slide.created_at.isoformat(),
-        updated_at=slide.updated_at.isoformat(),
-        current_image=current_image,
-        images=all_images,
-        selected_image_hash=slide.selected_image_hash,
-    )
-
-
 @router.get("", response_model=ProjectListResponse)
 async def list_projects(
     service: Annotated[SlidesService, Depends(get_slides_service)],
+    limit: Annotated[int | None, Query(ge=1, le=200)] = None,
+    cursor: str | None = None,
 ) -> ProjectListResponse:
-    """List all existing projects."""
+    """List existing projects, most recently updated first.
+
+    Paginated when ``limit`` is given: pass the returned ``next_cursor`` as
+    ``cursor`` to get the next page.
+    """
     projects = await service.list_projects()
+    try:
+        page, next_cursor = paginate(
+            projects,
+            key=lambda p: (p.updated_at.isoformat(), p.slug),
+            limit=limit,
+            cursor=cursor,
+            reverse=True,
+        )
+    except ValueError as e:
+        raise InvalidRequestError(str(e)) from e
     return ProjectListResponse(
+        next_cursor=next_cursor,
         projects=[
             ProjectSummaryResponse(
                 slug=p.slug,
@@ -83,44 +86,39 @@ async def list_projects(
                 slide_count=len(p.slides),
                 has_style=p.style is not None,
             )
-            for p in projects
-        ]
+            for p in page
+        ],
     )
 
 
-@router.get("/{slug}", response_model=ProjectResponse)
+@router.get(
+    "/{slug}",
+    response_model=ProjectResponse,
+    dependencies=[Depends(check_project_etag)],
+)
 async def get_project(
     slug: str,
+    response: Response,
     service: Annotated[SlidesService, Depends(get_slides_service)],
     cost_service: Annotated[CostService, Depends(get_cost_service)],
-) -> ProjectResponse:
-    """Get project information, creating it if it doesn't exist."""
+    fields: str | None = None,
+    include: str | None = None,
+) -> FastJSONResponse:
+    """Get project information, creating it if it doesn't exist.
+
+    ``fields`` (comma-separated slide fields, e.g. ``selected_image_hash``)
+    and ``include`` (any of ``style``, ``cost``, ``images``) trim the response
+    to what the client shows. Without ``images`` in ``include``, each slide
+    lists only its selected image instead of its whole history.
+    """
+    slide_fields = parse_selection(fields, SLIDE_FIELDS, "slide fields")
+    includes = parse_selection(include, PROJECT_INCLUDES, "include")
     project = await service.get_project(slug)
-
-    style_response: StyleResponse | None = None
-    if project.style:
-        style_response = StyleResponse(
-            prompt=project.style.prompt,
-            image=f"/static/slides/{slug}/{project.style.image}",
-            created_at=project.style.created_at.isoformat(),
-        )
-
-    return ProjectResponse(
-        slug=project.slug,
-        title=project.title,
-        created_at=project.created_at.isoformat(),
-        updated_at=project.updated_at.isoformat(),
-        style=style_response,
-        slides=[_slide_to_response(s, slug) for s in project.slides],
-        cost=CostResponse(
-            total_images=project.cost.total_images,
-            style_generations=project.cost.style_generations,
-            slide_generations=project.cost.slide_generations,
-            estimated_cost=project.cost.estimated_cost,
-            breakdown=cost_service.get_breakdown(project.cost),
-        ),
-        image_engine=project.image_engine,
+    content = project_to_dict(
+        project, cost_service.get_breakdown(project.cost), slide_fields, includes
     )
+    # Keep the ETag set by check_project_etag
+    return FastJSONResponse(content, headers=response.headers)
 
 
 @router.delete("/{slug}", response_model=DeleteProjectResponse)
@@ -130,6 +128,7 @@ async def delete_project(
 ) -> DeleteProjectResponse:
     """Delete a project and all its files."""
     await service.delete_project(slug)
+    manager.drop_history(slug)
     return DeleteProjectResponse(success=True, deleted_slug=slug)
 
 
@@ -153,10 +152,10 @@ async def create_slide(
     slug: str,
     request: CreateSlideRequest,
     service: Annotated[SlidesService, Depends(get_slides_service)],
-) -> SlideResponse:
+) -> FastJSONResponse:
     """Create a new slide."""
     slide = await service.create_slide(slug, request.content, request.after_sid)
-    return _slide_to_response(slide, slug)
+    return FastJSONResponse(slide_to_dict(slide, slug))
 
 
 @router.put("/{slug}/reorder", response_model=ReorderSlidesResponse)
@@ -164,16 +163,109 @@ async def reorder_slides(
     slug: str,
     request: ReorderSlidesRequest,
     service: Annotated[SlidesService, Depends(get_slides_service)],
-) -> ReorderSlidesResponse:
+) -> FastJSONResponse:
     """Reorder slides."""
     slides = await service.reorder_slides(slug, request.order)
-    return ReorderSlidesResponse(
-        success=True,
-        slides=[_slide_to_response(s, slug) for s in slides],
+    return FastJSONResponse(
+        {"success": True, "slides": [slide_to_dict(slide, slug) for slide in slides]}
+    )
+
+
+@router.post("/{slug}/batch", response_model=BatchResponse)
+async def apply_batch(
+    slug: str,
+    request: BatchRequest,
+    service: Annotated[SlidesService, Depends(get_slides_service)],
+) -> FastJSONResponse:
+    """Apply several slide edits in order and save them in one write.
+
+    Either every operation is applied or, if one fails, none is. Connected
+    clients get a single slides_updated event for the whole batch.
+    """
+    operations = [SlideOperation(**operation.model_dump()) for operation in request.operations]
+    result = await service.apply_batch(slug, operations)
+    project = result.project
+
+    logger.info(
+        "Applied slide batch",
+        extra={
+            "slug": slug,
+            "operations": len(operations),
+            "created_count": len(result.created),
+            "updated_count": len(result.updated),
+            "deleted_count": len(result.deleted),
+        },
+    )
+    return FastJSONResponse(
+        {
+            "success": True,
+            "title": project.title,
+            "updated_at": project.updated_at,
+            "slides": [slide_to_dict(slide, slug) for slide in project.slides],
+            "refs": result.refs,
+        }
     )
 
 
-@router.get("/{slug}/cost", response_model=CostResponse)
+@router.post("/{slug}/import", response_model=ImportOutlineResponse)
+async def import_outline(
+    slug: str,
+    request: Request,
+    service: Annotated[SlidesService, Depends(get_slides_service)],
+    image_service: Annotated[ImageService, Depends(get_image_service)],
+    registry: Annotated[TaskRegistry, Depends(get_task_registry)],
+    settings: Annotated[Settings, Depends(get_settings)],
+    after_sid: str | None = None,
+    heading_level: Annotated[int, Query(ge=1, le=6)] = 2,
+    generate: bool = False,
+) -> FastJSONResponse:
+    """Import a Markdown or plain-text document as new slides.
+
+    The request body is the raw UTF-8 document. It is split into slides as it
+    streams in: a heading up to ``heading_level`` starts a slide, and a
+    ``---`` separator ends one. All slides are added in one save, after
+    ``after_sid`` or at the end. With ``generate``, an image generation is
+    queued for each new slide.
+    """
+    if generate:
+        project = await service.get_project(slug)
+        if project.style is None:
+            raise StyleNotSetError()
+
+    slides = await service.import_outline(
+        slug,
+        request.stream(),
+        after_sid=after_sid,
+        heading_level=heading_level,
+        max_slides=settings.outline_import_max_slides,
+        max_bytes=settings.outline_import_max_mb * 1024 * 1024,
+    )
+    task_ids: dict[str, str] = {}
+    if generate:
+        for slide in slides:
+            task_ids[slide.sid] = await start_generation(
+                slug, slide.sid, image_service, registry, settings.generation_progress_interval
+            )
+
+    logger.info(
+        "Imported outline",
+        extra={"slug": slug, "created_count": len(slides), "generate": generate},
+    )
+    return FastJSONResponse(
+        {
+            "success": True,
+            "slides": [slide_to_dict(slide, slug) for slide in slides],
+            "content_hashes": {slide.sid: compute_content_hash(slide.content) for slide in slides},
+            "task_ids": task_ids,
+        }
+    )
+
+
+@router.get(
+    "/{slug}/cost",
+    response_model=CostResponse,
+    dependencies=[Depends(check_project_etag)],
+)
 async def get_cost(
     slug: str,
     service: Annotated[SlidesService, Depends(get_slides_service)],
@@ -190,14 +282,22 @@ async def get_cost(
     )
 
 
-@router.get("/{slug}/engine", response_model=GetEngineResponse)
+@router.get(
+    "/{slug}/engine",
+    response_model=GetEngineResponse,
+    dependencies=[Depends(check_project_etag)],
+)
 async def get_image_engine(
     slug: str,
     service: Annotated[SlidesService, Depends(get_slides_service)],
 ) -> GetEngineResponse:
     """Get the current image generation engine for a project."""
     project = await service.get_project(slug)
-    return GetEngineResponse(engine=project.image_engine)
+    return GetEngineResponse(
+        engine=project.image_engine,
+        hedge_engine=project.hedge_engine,
+        hedge_after_seconds=project.hedge_after_seconds if project.hedge_engine else None,
+    )
 
 
 @router.put("/{slug}/engine", response_model=UpdateEngineResponse)
@@ -209,19 +309,34 @@ async def update_image_engine(
     """Update the image generation engine for a project."""
     from app.exceptions import InvalidRequestError
 
-    if request.engine not in ["gemini", "volcengine", "nano_banana"]:
-        raise InvalidRequestError("Engine must be 'gemini', 'volcengine', or 'nano_banana'")
+    if request.engine not in ["gemini", "volcengine", "nano_banana", "mock"]:
+        raise InvalidRequestError("Engine must be 'gemini', 'volcengine', 'nano_banana', or 'mock'")
+
+    # Hedging policy is opt-in and only touched when the client sends it; a latency
+    # budget alone applies to the project's current hedge engine
+    hedge_engine = request.hedge_engine
+    if "hedge_engine" not in request.model_fields_set:
+        hedge_engine = (await service.get_project(slug)).hedge_engine
+    if request.hedge_after_seconds is not None and hedge_engine is None:
+        raise InvalidRequestError("hedge_after_seconds requires a hedge_engine")
 
     project = await service.update_engine(slug, request.engine)
 
+    if request.model_fields_set & {"hedge_engine", "hedge_after_seconds"}:
+        project = await service.update_engine_policy(
+            slug, hedge_engine, request.hedge_after_seconds
+        )
+
     logger.info(
         f"Updated image engine to {request.engine}",
-        extra={"slug": slug, "engine": request.engine},
+        extra={"slug": slug, "engine": request.engine, "hedge_engine": project.hedge_engine},
     )
 
     return UpdateEngineResponse(
         success=True,
         engine=project.image_engine,
+        hedge_engine=project.hedge_engine,
+        hedge_after_seconds=project.hedge_after_seconds if project.hedge_engine else None,
     )
 
 
@@ -233,10 +348,12 @@ async def update_slide(
     sid: str,
     request: UpdateSlideRequest,
     service: Annotated[SlidesService, Depends(get_slides_service)],
-) -> SlideResponse:
+) -> FastJSONResponse:
     """Update slide content."""
-    slide = await service.update_slide(slug, sid, request.content)
-    return _slide_to_response(slide, slug)
+    slide = await service.update_slide(
+        slug, sid, request.content, cancel_generation=request.cancel_generation
+    )
+    return FastJSONResponse(slide_to_dict(slide, slug))
 
 
 @router.delete("/{slug}/{sid}", response_model=DeleteSlideResponse)
@@ -244,7 +361,8 @@ async def delete_slide(
     slug: str,
     sid: str,
     service: Annotated[SlidesService, Depends(get_slides_service)],
+    cancel_generation: bool = True,
 ) -> DeleteSlideResponse:
-    """Delete a slide."""
-    await service.delete_slide(slug, sid)
+    """Delete a slide, cancelling its in-flight generation unless told otherwise."""
+    await service.delete_slide(slug, sid, cancel_generation=cancel_generation)
     return DeleteSlideResponse(success=True, deleted_sid=sid)
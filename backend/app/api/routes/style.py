@@ -1,11 +1,15 @@
 """Style API routes."""
 
+import asyncio
 import logging
+import uuid
+from collections.abc import Awaitable, Callable
 from typing import Annotated
 
 from fastapi import APIRouter, Depends
 
-from app.api.dependencies import get_style_service
+from app.api.dependencies import check_project_etag, get_style_service, get_task_registry
+from app.api.routes.websocket import manager
 from app.api.schemas import (
     GenerateStyleFromTemplateRequest,
     GenerateStyleFromTemplateResponse,
@@ -19,7 +23,9 @@ from app.api.schemas import (
     StyleTemplateResponse,
     StyleTemplatesResponse,
 )
-from app.services import StyleService
+from app.exceptions import GenerationFailedError, InvalidRequestError
+from app.models import StyleCandidate
+from app.services import StyleService, TaskRegistry
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/slides", tags=["style"])
@@ -27,6 +33,9 @@ router = APIRouter(prefix="/slides", tags=["style"])
 # 单独的风格模板路由（不依赖 slug）
 templates_router = APIRouter(prefix="/style", tags=["style"])
 
+CandidateCallback = Callable[[StyleCandidate], Awaitable[None]]
+FailureCallback = Callable[[Exception], Awaitable[None]]
+
 
 @templates_router.get("/templates", response_model=StyleTemplatesResponse)
 async def get_style_templates(
@@ -48,7 +57,11 @@ async def get_style_templates(
     )
 
 
-@router.get("/{slug}/style", response_model=GetStyleResponse)
+@router.get(
+    "/{slug}/style",
+    response_model=GetStyleResponse,
+    dependencies=[Depends(check_project_etag)],
+)
 async def get_style(
     slug: str,
     service: Annotated[StyleService, Depends(get_style_service)],
@@ -63,7 +76,7 @@ async def get_style(
         has_style=True,
         style=StyleResponse(
             prompt=style.prompt,
-            image=service.get_style_url(slug),
+            image=service.get_style_url(slug, style),
             created_at=style.created_at.isoformat(),
             style_type=style.style_type.value if style.style_type else None,
             style_name=style.style_name,
@@ -71,18 +84,166 @@ async def get_style(
     )
 
 
+async def _stream_candidates(
+    slug: str,
+    task_id: str,
+    generate: Callable[[CandidateCallback, FailureCallback], Awaitable[object]],
+    service: StyleService,
+    ready: asyncio.Queue[StyleCandidate | Exception | None],
+) -> None:
+    """Run a style job, announcing each candidate over WebSocket as it is saved.
+
+    Candidates and per-candidate failures are also put on ``ready``, then None
+    once the job has finished.
+    """
+
+    async def _announce(candidate: StyleCandidate) -> None:
+        ready.put_nowait(candidate)
+        await manager.broadcast(
+            slug,
+            {
+                "type": "style_candidate_ready",
+                "data": {
+                    "task_id": task_id,
+                    "candidate": {
+                        "id": candidate.id,
+                        "url": service.get_candidate_url(slug, candidate.id),
+                    },
+                },
+            },
+        )
+
+    async def _failed(error: Exception) -> None:
+        ready.put_nowait(error)
+
+    try:
+        await generate(_announce, _failed)
+        await manager.broadcast(
+            slug,
+            {"type": "style_generation_completed", "data": {"task_id": task_id}},
+        )
+
+    except asyncio.CancelledError as e:
+        reason = str(e.args[0]) if e.args else "cancelled"
+        logger.info(
+            "Style generation cancelled",
+            extra={"slug": slug, "task_id": task_id, "reason": reason},
+        )
+        await manager.broadcast(
+            slug,
+            {
+                "type": "style_generation_cancelled",
+                "data": {"task_id": task_id, "reason": reason},
+            },
+        )
+        raise
+
+    except Exception as e:
+        logger.exception("Style generation failed", extra={"slug": slug})
+        await manager.broadcast(
+            slug,
+            {
+                "type": "style_generation_failed",
+                "data": {"task_id": task_id, "error": str(e)},
+            },
+        )
+
+    finally:
+        # Sentinel: the job has finished, no more candidates will arrive
+        ready.put_nowait(None)
+
+
+async def _start_style_job(
+    slug: str,
+    generate: Callable[[CandidateCallback, FailureCallback], Awaitable[object]],
+    count: int,
+    min_candidates: int | None,
+    cancel_stragglers: bool,
+    service: StyleService,
+    registry: TaskRegistry,
+) -> tuple[str, list[StyleCandidate], int]:
+    """Start a style job and wait until the first K of N candidates are ready.
+
+    Returns:
+        Tuple of (task id, ready candidates, candidates still to come over
+        WebSocket: neither ready, failed nor cancelled)
+    """
+    task_id = str(uuid.uuid4())
+    ready: asyncio.Queue[StyleCandidate | Exception | None] = asyncio.Queue()
+    registry.spawn(
+        slug,
+        _stream_candidates(slug, task_id, generate, service, ready),
+        kind="style",
+        task_id=task_id,
+    )
+
+    wanted = count if min_candidates is None else min(min_candidates, count)
+    candidates: list[StyleCandidate] = []
+    failed = 0
+    finished = False
+    while len(candidates) < wanted:
+        item = await ready.get()
+        if item is None:
+            finished = True
+            break
+        if isinstance(item, Exception):
+            failed += 1
+        else:
+            candidates.append(item)
+    # Failures reported meanwhile are not pending either
+    while not finished and not ready.empty():
+        item = ready.get_nowait()
+        if item is None:
+            finished = True
+        elif isinstance(item, Exception):
+            failed += 1
+        else:
+            candidates.append(item)
+
+    if wanted and not candidates:
+        raise GenerationFailedError("Failed to generate any style images")
+
+    # Stragglers either keep streaming over WebSocket or are cancelled
+    pending = 0 if finished else count - len(candidates) - failed
+    if pending and cancel_stragglers:
+        registry.cancel(task_id, "enough_candidates")
+        pending = 0
+
+    return task_id, candidates, pending
+
+
 @router.post("/{slug}/style/generate", response_model=GenerateStyleResponse)
 async def generate_style(
     slug: str,
     request: GenerateStyleRequest,
     service: Annotated[StyleService, Depends(get_style_service)],
+    registry: Annotated[TaskRegistry, Depends(get_task_registry)],
 ) -> GenerateStyleResponse:
-    """Generate candidate style images."""
+    """Generate candidate style images.
+
+    Candidates are announced as ``style_candidate_ready`` events as soon as
+    each one is saved; the response returns once ``min_candidates`` are ready.
+    """
     logger.info(
         "Generating style candidates",
         extra={"slug": slug, "prompt": request.prompt},
     )
-    candidates = await service.generate_candidates(slug, request.prompt)
+    task_id, candidates, pending = await _start_style_job(
+        slug,
+        lambda on_candidate, on_failed: service.generate_candidates(
+            slug,
+            request.prompt,
+            force=request.force,
+            count=request.count,
+            on_candidate=on_candidate,
+            on_failed=on_failed,
+        ),
+        request.count,
+        request.min_candidates,
+        request.cancel_stragglers,
+        service,
+        registry,
+    )
 
     return GenerateStyleResponse(
         candidates=[
@@ -93,6 +254,8 @@ async def generate_style(
             for c in candidates
         ],
         prompt=request.prompt,
+        task_id=task_id,
+        pending=pending,
     )
 
 
@@ -104,6 +267,7 @@ async def generate_style_from_template(
     slug: str,
     request: GenerateStyleFromTemplateRequest,
     service: Annotated[StyleService, Depends(get_style_service)],
+    registry: Annotated[TaskRegistry, Depends(get_task_registry)],
 ) -> GenerateStyleFromTemplateResponse:
     """基于预设模板生成风格候选图像"""
     logger.info(
@@ -111,10 +275,26 @@ async def generate_style_from_template(
         extra={"slug": slug, "style_type": request.style_type},
     )
 
-    candidates, template = await service.generate_candidates_from_template(
+    template = service.get_template_by_type(request.style_type)
+    if not template:
+        raise InvalidRequestError(f"Unknown style type: {request.style_type}")
+
+    task_id, candidates, pending = await _start_style_job(
         slug,
-        request.style_type,
-        request.custom_prompt,
+        lambda on_candidate, on_failed: service.generate_candidates_from_template(
+            slug,
+            request.style_type,
+            request.custom_prompt,
+            force=request.force,
+            count=request.count,
+            on_candidate=on_candidate,
+            on_failed=on_failed,
+        ),
+        request.count,
+        request.min_candidates,
+        request.cancel_stragglers,
+        service,
+        registry,
     )
 
     return GenerateStyleFromTemplateResponse(
@@ -132,6 +312,8 @@ async def generate_style_from_template(
             description=template.description,
             preview_prompt=template.preview_prompt,
         ),
+        task_id=task_id,
+        pending=pending,
     )
 
 
@@ -158,7 +340,7 @@ async def save_style(
         success=True,
         style=StyleResponse(
             prompt=style.prompt,
-            image=service.get_style_url(slug),
+            image=service.get_style_url(slug, style),
             created_at=style.created_at.isoformat(),
             style_type=style.style_type.value if style.style_type else None,
             style_name=style.style_name,
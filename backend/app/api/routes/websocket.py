@@ -1,101 +1,419 @@
 """WebSocket routes for real-time updates."""
 
+import asyncio
 import logging
+import time
+from collections import Counter, deque
+from contextlib import suppress
 from typing import Any
 
-from fastapi import APIRouter, WebSocket, WebSocketDisconnect
+from fastapi import APIRouter, WebSocket, WebSocketDisconnect, status
+
+from app.api.dependencies import get_broker
+from app.api.responses import encode_json
+from app.api.serializers import event_to_dict
+from app.config import get_settings
+from app.models import ProjectEvent
+from app.services import Broker, InMemoryBroker
 
 logger = logging.getLogger(__name__)
 router = APIRouter(tags=["websocket"])
 
+_PING = '{"type":"ping"}'
+_CLOSE_TIMEOUT = 5.0  # seconds; a half-open socket may never complete the close handshake
+
+
+class _Connection:
+    """A registered client: its socket and outbound queue, drained by a writer task."""
+
+    def __init__(self, websocket: WebSocket, queue_size: int) -> None:
+        self.websocket = websocket
+        self.queue: asyncio.Queue[str] = asyncio.Queue(maxsize=queue_size)
+        self.writer: asyncio.Task[None] | None = None
+        self.lagging = False  # Dropped for falling behind; closed by the writer
+
 
 class ConnectionManager:
-    """Manages WebSocket connections per project slug."""
+    """Manages WebSocket connections per project slug.
+
+    Broadcasts and generating-task state go through a ``Broker``, so with a
+    shared broker every worker's clients get every worker's messages.
+    Messages are numbered per slug (``seq``) by the broker and the last
+    ``replay_size`` of them are kept, so a client that reconnects, to any
+    worker, with the last ``seq`` it saw gets exactly the messages it missed.
+    ``epoch`` identifies the broker's numbering: after a restart, or once the
+    missed messages have rolled out of the buffer, the client is told to resync.
+    A project's messages are dropped when it is deleted, and once it has had
+    no viewers and no messages for ``replay_ttl`` seconds.
+
+    Broadcasting never waits on a client: each message is encoded once and
+    queued for every connection, and each connection has a writer task that
+    sends its queue. When a connection's queue (``send_queue_size``) is full,
+    it is behind: transient messages are dropped for it, and a numbered one
+    makes the manager close it (1013, try again later) so the client
+    reconnects and catches up by replay, or resyncs.
 
-    def __init__(self) -> None:
-        self.active_connections: dict[str, list[WebSocket]] = {}
-        # Track generating tasks: {slug: {sid: task_id}}
-        self.generating_tasks: dict[str, dict[str, str]] = {}
+    Once started, the manager pings every connection each ``heartbeat_interval``
+    seconds; the endpoint reaps a client it has heard nothing from (pong or
+    otherwise) for ``idle_timeout`` seconds, so half-open sockets don't linger
+    and keep being sent to. New connections beyond ``max_connections_per_slug``
+    or ``max_connections`` (on this worker) are closed with 1013.
+    """
 
-    def add_generating_task(self, slug: str, sid: str, task_id: str) -> None:
+    def __init__(
+        self,
+        broker: Broker | None = None,
+        replay_size: int = 256,
+        replay_ttl: float = 600,
+        send_queue_size: int = 64,
+        heartbeat_interval: float = 20.0,
+        idle_timeout: float = 60.0,
+        max_connections_per_slug: int = 200,
+        max_connections: int = 2000,
+    ) -> None:
+        self.active_connections: dict[str, list[_Connection]] = {}
+        self.broker = broker or InMemoryBroker()
+        self.broker.subscribe(self._deliver)
+        self.replay_size = replay_size
+        self.replay_ttl = replay_ttl
+        self.send_queue_size = send_queue_size
+        self.heartbeat_interval = heartbeat_interval
+        self.idle_timeout = idle_timeout
+        self.max_connections_per_slug = max_connections_per_slug
+        self.max_connections = max_connections
+        self.connection_count = 0
+        self.counters: Counter[str] = Counter()  # Totals reported by get_metrics
+        self._heartbeat: asyncio.Task[None] | None = None
+        self._seq: dict[str, int] = {}  # slug -> seq of its last numbered message
+        self._history: dict[str, deque[tuple[int, str]]] = {}  # slug -> (seq, encoded message)
+        self._last_message: dict[str, float] = {}  # slug -> monotonic time of its last message
+
+    @property
+    def epoch(self) -> str:
+        return self.broker.epoch
+
+    async def start(self) -> None:
+        """Start receiving messages from other workers and sending heartbeats."""
+        await self.broker.start()
+        if self._heartbeat is None:
+            self._heartbeat = asyncio.create_task(self._send_heartbeats())
+
+    async def close(self) -> None:
+        """Stop sending heartbeats and receiving messages from other workers."""
+        if self._heartbeat is not None:
+            self._heartbeat.cancel()
+            await asyncio.gather(self._heartbeat, return_exceptions=True)
+            self._heartbeat = None
+        await self.broker.close()
+
+    def get_metrics(self) -> dict[str, int]:
+        """Get this worker's connection counts and totals since startup."""
+        return {
+            "active_connections": self.connection_count,
+            "active_projects": len(self.active_connections),
+            "queued_messages": sum(
+                connection.queue.qsize()
+                for connections in self.active_connections.values()
+                for connection in connections
+            ),
+            "connections_accepted": self.counters["accepted"],
+            "connections_rejected": self.counters["rejected"],
+            "connections_reaped": self.counters["reaped"],
+            "slow_clients_dropped": self.counters["dropped"],
+            "failed_sends": self.counters["failed_sends"],
+        }
+
+    async def add_generating_task(self, slug: str, sid: str, task_id: str) -> None:
         """Add a generating task to track."""
-        if slug not in self.generating_tasks:
-            self.generating_tasks[slug] = {}
-        self.generating_tasks[slug][sid] = task_id
-
-    def remove_generating_task(self, slug: str, sid: str) -> None:
-        """Remove a generating task."""
-        if slug in self.generating_tasks:
-            self.generating_tasks[slug].pop(sid, None)
-            if not self.generating_tasks[slug]:
-                del self.generating_tasks[slug]
-
-    def get_generating_sids(self, slug: str) -> list[str]:
-        """Get list of sids that are currently generating."""
-        return list(self.generating_tasks.get(slug, {}).keys())
-
-    async def connect(self, slug: str, websocket: WebSocket) -> None:
-        """Accept and register a WebSocket connection."""
+        await self.broker.add_generating_task(slug, sid, task_id)
+
+    async def remove_generating_task(self, slug: str, sid: str, task_id: str | None = None) -> None:
+        """Remove a generating task.
+
+        If task_id is given, the entry is only removed when it still belongs to that
+        task, so a cancelled task cannot untrack a newer generation for the same slide.
+        """
+        await self.broker.remove_generating_task(slug, sid, task_id)
+
+    async def get_generating_sids(self, slug: str) -> list[str]:
+        """Get list of sids that are currently generating, by any worker."""
+        return await self.broker.get_generating_sids(slug)
+
+    def get_seq(self, slug: str) -> int:
+        """Get the seq of the last numbered message broadcast for a slug (0 if none)."""
+        return self._seq.get(slug, 0)
+
+    def drop_history(self, slug: str) -> None:
+        """Forget a project's messages; reconnecting clients will resync."""
+        self._seq.pop(slug, None)
+        self._history.pop(slug, None)
+        self._last_message.pop(slug, None)
+
+    def _expire_history(self) -> None:
+        """Drop the messages of projects idle for ``replay_ttl`` with no viewers."""
+        cutoff = time.monotonic() - self.replay_ttl
+        for slug, last in list(self._last_message.items()):
+            if last < cutoff and slug not in self.active_connections:
+                self.drop_history(slug)
+
+    def get_missed(self, slug: str, last_seq: int, epoch: str) -> list[tuple[int, str]] | None:
+        """Get the messages after ``last_seq``, or None if they can't all be replayed."""
+        current = self.get_seq(slug)
+        if epoch != self.epoch or last_seq > current:
+            return None
+        history = self._history.get(slug)
+        if not history:
+            return [] if last_seq == current else None
+        if history[0][0] > last_seq + 1:
+            return None  # Rolled over: some missed messages were dropped
+        return [(seq, text) for seq, text in history if seq > last_seq]
+
+    async def connect(
+        self,
+        slug: str,
+        websocket: WebSocket,
+        last_seq: int | None = None,
+        epoch: str | None = None,
+    ) -> bool:
+        """Accept and register a WebSocket connection.
+
+        The client first gets a ``connected`` message with the current epoch and
+        seq, then ``sync_generating_tasks``. A reconnecting client that passes its
+        ``last_seq`` and ``epoch`` then gets the messages it missed, in order, or
+        ``resync_required`` if they are no longer available, before any new message.
+
+        Returns False, having closed the socket, when the connection caps are reached.
+        """
         await websocket.accept()
-        if slug not in self.active_connections:
-            self.active_connections[slug] = []
-        self.active_connections[slug].append(websocket)
-        logger.info(
-            "WebSocket connected",
-            extra={"slug": slug, "total_connections": len(self.active_connections[slug])},
+        slug_count = len(self.active_connections.get(slug, []))
+        if (
+            slug_count >= self.max_connections_per_slug
+            or self.connection_count >= self.max_connections
+        ):
+            self.counters["rejected"] += 1
+            logger.warning(
+                "WebSocket rejected: too many connections",
+                extra={"slug": slug, "total_connections": self.connection_count},
+            )
+            await websocket.close(
+                code=status.WS_1013_TRY_AGAIN_LATER, reason="Too many connections"
+            )
+            return False
+        current = self.get_seq(slug)
+        await websocket.send_json(
+            {"type": "connected", "data": {"epoch": self.epoch, "seq": current}}
         )
 
-        # Send current generating tasks to the new connection
-        generating_sids = self.get_generating_sids(slug)
+        # Send current generating tasks to the new connection; messages that change
+        # them after this are replayed below
+        generating_sids = await self.get_generating_sids(slug)
         if generating_sids:
             await websocket.send_json({
                 "type": "sync_generating_tasks",
                 "data": {"sids": generating_sids},
             })
 
+        # Messages broadcast during the awaits above and below are not queued for this
+        # socket yet, so a new client also catches up from the seq it was sent.
+        # Each pass replays what is missing; the connection is registered right
+        # after a pass finds nothing left, with no await in between.
+        resuming = last_seq is not None
+        if last_seq is None:
+            last_seq, epoch = current, self.epoch
+        replayed = 0
+        while True:
+            missed = self.get_missed(slug, last_seq, epoch or "")
+            if missed is None:
+                last_seq, epoch = self.get_seq(slug), self.epoch
+                await websocket.send_json(
+                    {"type": "resync_required", "data": {"epoch": epoch, "seq": last_seq}}
+                )
+                continue
+            if not missed:
+                break
+            for seq, text in missed:
+                await websocket.send_text(text)
+                last_seq = seq
+            replayed += len(missed)
+        if resuming:
+            logger.info(
+                "WebSocket resumed",
+                extra={"slug": slug, "replayed": replayed, "last_seq": last_seq},
+            )
+
+        # From here on only the writer task sends to this socket
+        connection = _Connection(websocket, self.send_queue_size)
+        connection.writer = asyncio.create_task(self._write(slug, connection))
+        self.active_connections.setdefault(slug, []).append(connection)
+        self.connection_count += 1
+        self.counters["accepted"] += 1
+        logger.info(
+            "WebSocket connected",
+            extra={"slug": slug, "total_connections": len(self.active_connections[slug])},
+        )
+        return True
+
     def disconnect(self, slug: str, websocket: WebSocket) -> None:
         """Remove a WebSocket connection."""
-        if slug in self.active_connections:
-            if websocket in self.active_connections[slug]:
-                self.active_connections[slug].remove(websocket)
-            if not self.active_connections[slug]:
-                del self.active_connections[slug]
+        for connection in self.active_connections.get(slug, []):
+            if connection.websocket is websocket:
+                self._remove(slug, connection)
+                break
         logger.info("WebSocket disconnected", extra={"slug": slug})
 
-    async def broadcast(self, slug: str, message: dict[str, Any]) -> None:
-        """Broadcast a message to all connections for a slug."""
+    async def reap(self, slug: str, websocket: WebSocket) -> None:
+        """Disconnect a client that stopped responding, closing its socket (1001)."""
+        self.counters["reaped"] += 1
+        logger.info(
+            "Reaping idle WebSocket", extra={"slug": slug, "idle_timeout": self.idle_timeout}
+        )
+        self.disconnect(slug, websocket)
+        with suppress(Exception):
+            await asyncio.wait_for(
+                websocket.close(code=status.WS_1001_GOING_AWAY), timeout=_CLOSE_TIMEOUT
+            )
+
+    def _remove(self, slug: str, connection: _Connection) -> None:
+        """Unregister a connection and stop its writer."""
+        connections = self.active_connections.get(slug)
+        if connections is None or connection not in connections:
+            return
+        connections.remove(connection)
+        self.connection_count -= 1
+        if not connections:
+            del self.active_connections[slug]
+        if connection.writer is not None and connection.writer is not asyncio.current_task():
+            connection.writer.cancel()
+
+    def send(self, slug: str, websocket: WebSocket, message: dict[str, Any]) -> None:
+        """Queue a message for one registered connection (dropped if it is full)."""
+        for connection in self.active_connections.get(slug, []):
+            if connection.websocket is websocket:
+                with suppress(asyncio.QueueFull):
+                    connection.queue.put_nowait(encode_json(message).decode("utf-8"))
+                return
+
+    async def _write(self, slug: str, connection: _Connection) -> None:
+        """Send a connection's queued messages in order until it is removed."""
+        try:
+            while True:
+                text = await connection.queue.get()
+                await connection.websocket.send_text(text)
+        except asyncio.CancelledError:
+            if connection.lagging:
+                with suppress(Exception):
+                    await asyncio.wait_for(
+                        connection.websocket.close(code=status.WS_1013_TRY_AGAIN_LATER),
+                        timeout=_CLOSE_TIMEOUT,
+                    )
+            raise
+        except Exception as e:
+            self.counters["failed_sends"] += 1
+            logger.warning("Failed to send to WebSocket", extra={"slug": slug, "error": str(e)})
+            self._remove(slug, connection)
+
+    async def _send_heartbeats(self) -> None:
+        """Queue a ping for every connection each heartbeat interval."""
+        while True:
+            await asyncio.sleep(self.heartbeat_interval)
+            self._expire_history()
+            for connections in list(self.active_connections.values()):
+                for connection in connections:
+                    # A full queue is a lagging client; it gets dropped or reaped anyway
+                    with suppress(asyncio.QueueFull):
+                        connection.queue.put_nowait(_PING)
+
+    async def broadcast(self, slug: str, message: dict[str, Any], replay: bool = True) -> None:
+        """Broadcast a message to all connections for a slug, on every worker.
+
+        The message is encoded once for all connections; it may hold datetimes.
+        With ``replay`` it is numbered and kept for reconnecting clients, even
+        when nobody is connected; transient messages (progress) pass False.
+        """
+        await self.broker.publish(slug, encode_json(message).decode("utf-8"), replay)
+
+    async def _deliver(self, slug: str, seq: int | None, payload: str) -> None:
+        """Queue a message from the broker for this worker's connections."""
+        if seq is not None:
+            text = f'{{"seq":{seq},{payload[1:]}'  # Prepend seq to the encoded object
+            self._seq[slug] = seq
+            history = self._history.get(slug)
+            if history is None:
+                history = self._history[slug] = deque(maxlen=self.replay_size)
+            history.append((seq, text))
+            self._last_message[slug] = time.monotonic()
+        else:
+            text = payload
         if slug not in self.active_connections:
             return
 
-        disconnected = []
-        for connection in self.active_connections[slug]:
+        for connection in list(self.active_connections[slug]):
             try:
-                await connection.send_json(message)
-            except Exception as e:
-                logger.warning("Failed to send to WebSocket", extra={"error": str(e)})
-                disconnected.append(connection)
-
-        # Clean up disconnected connections
-        for connection in disconnected:
-            self.disconnect(slug, connection)
+                connection.queue.put_nowait(text)
+            except asyncio.QueueFull:
+                if seq is None:
+                    continue  # Transient; the next one supersedes it
+                logger.warning(
+                    "Dropping slow WebSocket client",
+                    extra={"slug": slug, "queued": connection.queue.qsize()},
+                )
+                connection.lagging = True
+                self.counters["dropped"] += 1
+                self._remove(slug, connection)
 
 
 # Global connection manager instance
-manager = ConnectionManager()
+manager = ConnectionManager(
+    get_broker(),
+    replay_size=get_settings().ws_replay_buffer_size,
+    replay_ttl=get_settings().ws_replay_ttl_seconds,
+    send_queue_size=get_settings().ws_send_queue_size,
+    heartbeat_interval=get_settings().ws_heartbeat_interval,
+    idle_timeout=get_settings().ws_idle_timeout,
+    max_connections_per_slug=get_settings().ws_max_connections_per_project,
+    max_connections=get_settings().ws_max_connections,
+)
+
+
+async def broadcast_project_event(event: ProjectEvent) -> None:
+    """Send a project change event to the project's connections (an EventBus handler)."""
+    await manager.broadcast(event.slug, event_to_dict(event))
+
+
+@router.get("/ws/metrics")
+async def websocket_metrics() -> dict[str, int]:
+    """WebSocket connection metrics for this worker."""
+    return manager.get_metrics()
 
 
 @router.websocket("/ws/slides/{slug}")
-async def websocket_endpoint(websocket: WebSocket, slug: str) -> None:
-    """WebSocket endpoint for real-time updates."""
-    await manager.connect(slug, websocket)
+async def websocket_endpoint(
+    websocket: WebSocket,
+    slug: str,
+    last_seq: int | None = None,
+    epoch: str | None = None,
+) -> None:
+    """WebSocket endpoint for real-time updates.
+
+    Reconnecting clients pass the ``seq`` and ``epoch`` of the last message
+    they received to get the messages they missed. The server pings every
+    heartbeat interval; a client that sends nothing (such as a ``pong``) for
+    the idle timeout is disconnected.
+    """
+    if not await manager.connect(slug, websocket, last_seq, epoch):
+        return
 
     try:
         while True:
-            data = await websocket.receive_json()
+            try:
+                data = await asyncio.wait_for(websocket.receive_json(), manager.idle_timeout)
+            except TimeoutError:
+                await manager.reap(slug, websocket)
+                return
 
             # Handle ping messages
             if data.get("type") == "ping":
-                await websocket.send_json({"type": "pong"})
+                manager.send(slug, websocket, {"type": "pong"})
 
     except WebSocketDisconnect:
         manager.disconnect(slug, websocket)
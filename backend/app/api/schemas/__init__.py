@@ -1,19 +1,27 @@
 """API request/response schemas."""
 
 from .images import (
+    CancelTaskResponse,
     DeleteImageResponse,
+    ExportDownloadResponse,
+    ExportJobRequest,
+    ExportJobResponse,
     GenerateImageRequest,
     GenerateTaskResponse,
+    GenerationEstimateResponse,
     GetImagesResponse,
     SelectImageRequest,
     SelectImageResponse,
 )
 from .slides import (
+    BatchRequest,
+    BatchResponse,
     CostResponse,
     CreateSlideRequest,
     DeleteProjectResponse,
     DeleteSlideResponse,
     GetEngineResponse,
+    ImportOutlineResponse,
     ProjectListResponse,
     ProjectResponse,
     ProjectSummaryResponse,
@@ -43,11 +51,14 @@ from .style import (
 
 __all__ = [
     # Slides
+    "BatchRequest",
+    "BatchResponse",
     "CostResponse",
     "CreateSlideRequest",
     "DeleteProjectResponse",
     "DeleteSlideResponse",
     "GetEngineResponse",
+    "ImportOutlineResponse",
     "ProjectListResponse",
     "ProjectResponse",
     "ProjectSummaryResponse",
@@ -73,9 +84,14 @@ __all__ = [
     "StyleTemplateResponse",
     "StyleTemplatesResponse",
     # Images
+    "CancelTaskResponse",
     "DeleteImageResponse",
+    "ExportDownloadResponse",
+    "ExportJobRequest",
+    "ExportJobResponse",
     "GenerateImageRequest",
     "GenerateTaskResponse",
+    "GenerationEstimateResponse",
     "GetImagesResponse",
     "SelectImageRequest",
     "SelectImageResponse",
@@ -1,5 +1,8 @@
 """Pydantic schemas for images API."""
 
+from datetime import datetime
+from typing import Literal
+
 from pydantic import BaseModel
 
 from .slides import SlideImageResponse
@@ -12,6 +15,7 @@ class GetImagesResponse(BaseModel):
     content_hash: str
     images: list[SlideImageResponse]
     has_matched_image: bool
+    next_cursor: str | None = None  # Cursor of the next page of images, if any
 
 
 class GenerateImageRequest(BaseModel):
@@ -28,6 +32,28 @@ class GenerateTaskResponse(BaseModel):
     message: str
 
 
+class CancelTaskResponse(BaseModel):
+    """Response schema for cancelling generation tasks."""
+
+    success: bool
+    cancelled_task_ids: list[str]
+
+
+class GenerationEstimateResponse(BaseModel):
+    """Response schema for estimating generation time of a deck's stale slides."""
+
+    slug: str
+    engine: str
+    image_size: str
+    stale_sids: list[str]
+    per_slide_p50_seconds: float
+    per_slide_p90_seconds: float
+    queued_ahead: int  # Generations already running or waiting on the engine
+    estimated_seconds: float
+    estimated_seconds_p90: float
+    samples: int  # Latency samples the estimate is based on
+
+
 class DeleteImageResponse(BaseModel):
     """Response schema for deleting an image."""
 
@@ -47,3 +73,26 @@ class SelectImageResponse(BaseModel):
     success: bool
     sid: str
     selected_image_hash: str
+
+
+class ExportJobRequest(BaseModel):
+    """Request schema for starting a background export."""
+
+    format: Literal["zip", "pdf", "pptx"] = "zip"
+
+
+class ExportJobResponse(BaseModel):
+    """Response schema for a started background export."""
+
+    task_id: str
+    status: str
+    message: str
+
+
+class ExportDownloadResponse(BaseModel):
+    """A finished background export, sent with export_completed."""
+
+    download_url: str
+    filename: str
+    size: int
+    expires_at: datetime
@@ -1,5 +1,7 @@
 """Pydantic schemas for slides API."""
 
+from typing import Annotated, Literal
+
 from pydantic import BaseModel, Field
 
 
@@ -11,6 +13,7 @@ class SlideImageResponse(BaseModel):
     thumbnail_url: str | None = None
     created_at: str
     matched: bool
+    engine: str | None = None  # Engine that produced the image
 
 
 class SlideResponse(BaseModel):
@@ -56,7 +59,7 @@ class ProjectResponse(BaseModel):
     style: StyleResponse | None = None
     slides: list[SlideResponse]
     cost: CostResponse
-    image_engine: str = "volcengine"  # "gemini" | "volcengine" | "nano_banana"
+    image_engine: str = "volcengine"  # "gemini" | "volcengine" | "nano_banana" | "mock"
 
 
 class UpdateTitleRequest(BaseModel):
@@ -84,6 +87,7 @@ class UpdateSlideRequest(BaseModel):
     """Request schema for updating slide content."""
 
     content: str = Field(..., max_length=20000)
+    cancel_generation: bool = True  # Cancel in-flight generation if content changed
 
 
 class ReorderSlidesRequest(BaseModel):
@@ -99,6 +103,90 @@ class ReorderSlidesResponse(BaseModel):
     slides: list[SlideResponse]
 
 
+class CreateSlideOperation(BaseModel):
+    """Batch operation: create a slide."""
+
+    op: Literal["create"]
+    content: str = Field(default="", max_length=20000)
+    after_sid: str | None = None  # Slide (sid or ref) to insert after; appended if omitted
+    ref: str | None = Field(default=None, max_length=64)  # Name for later operations
+
+
+class UpdateSlideOperation(BaseModel):
+    """Batch operation: update a slide's content."""
+
+    op: Literal["update"]
+    sid: str  # sid, or ref of a slide created earlier in the batch
+    content: str = Field(..., max_length=20000)
+    cancel_generation: bool = True
+
+
+class DeleteSlideOperation(BaseModel):
+    """Batch operation: delete a slide."""
+
+    op: Literal["delete"]
+    sid: str
+    cancel_generation: bool = True
+
+
+class ReorderSlidesOperation(BaseModel):
+    """Batch operation: reorder slides; the order must list every slide."""
+
+    op: Literal["reorder"]
+    order: list[str]
+
+
+class SelectImageOperation(BaseModel):
+    """Batch operation: select a slide's image."""
+
+    op: Literal["select_image"]
+    sid: str
+    image_hash: str
+
+
+class UpdateTitleOperation(BaseModel):
+    """Batch operation: update the project title."""
+
+    op: Literal["title"]
+    title: str = Field(..., min_length=1, max_length=200)
+
+
+BatchOperation = Annotated[
+    CreateSlideOperation
+    | UpdateSlideOperation
+    | DeleteSlideOperation
+    | ReorderSlidesOperation
+    | SelectImageOperation
+    | UpdateTitleOperation,
+    Field(discriminator="op"),
+]
+
+
+class BatchRequest(BaseModel):
+    """Request schema for applying several edits in one write."""
+
+    operations: list[BatchOperation] = Field(..., min_length=1, max_length=1000)
+
+
+class BatchResponse(BaseModel):
+    """Response schema for a batch: the resulting deck."""
+
+    success: bool
+    title: str
+    updated_at: str
+    slides: list[SlideResponse]
+    refs: dict[str, str] = {}  # ref -> sid of slides created by the batch
+
+
+class ImportOutlineResponse(BaseModel):
+    """Response schema for an outline import: the slides it created."""
+
+    success: bool
+    slides: list[SlideResponse]
+    content_hashes: dict[str, str]  # sid -> content hash of each new slide
+    task_ids: dict[str, str] = {}  # sid -> generation task, when generation was requested
+
+
 class DeleteSlideResponse(BaseModel):
     """Response schema for delete operation."""
 
@@ -128,12 +216,19 @@ class ProjectListResponse(BaseModel):
     """Response schema for project list."""
 
     projects: list[ProjectSummaryResponse]
+    next_cursor: str | None = None  # Cursor of the next page of projects, if any
 
 
 class UpdateEngineRequest(BaseModel):
-    """Request schema for updating image generation engine."""
+    """Request schema for updating image generation engine.
+
+    hedge_engine / hedge_after_seconds are only applied when present in the request;
+    send hedge_engine=null to disable hedging.
+    """
 
-    engine: str = Field(..., pattern="^(gemini|volcengine|nano_banana)$")
+    engine: str = Field(..., pattern="^(gemini|volcengine|nano_banana|mock)$")
+    hedge_engine: str | None = Field(default=None, pattern="^(gemini|volcengine|nano_banana|mock)$")
+    hedge_after_seconds: float | None = Field(default=None, gt=0, le=600)
 
 
 class UpdateEngineResponse(BaseModel):
@@ -141,9 +236,13 @@ class UpdateEngineResponse(BaseModel):
 
     success: bool
     engine: str
+    hedge_engine: str | None = None
+    hedge_after_seconds: float | None = None
 
 
 class GetEngineResponse(BaseModel):
     """Response schema for getting current engine."""
 
     engine: str
+    hedge_engine: str | None = None  # Secondary engine for hedged requests (opt-in)
+    hedge_after_seconds: float | None = None  # Latency budget before hedging
@@ -23,6 +23,12 @@ class GenerateStyleRequest(BaseModel):
     """Request schema for generating style candidates."""
 
     prompt: str = Field(..., min_length=1, max_length=5000)
+    force: bool = False  # Bypass the generation cache
+    count: int = Field(2, ge=1, le=8)  # Number of candidates (N)
+    # Return once this many candidates are ready (K); None waits for all,
+    # 0 returns immediately. The rest arrive as style_candidate_ready events.
+    min_candidates: int | None = Field(None, ge=0)
+    cancel_stragglers: bool = False  # Cancel the rest once K are ready
 
 
 class GenerateStyleResponse(BaseModel):
@@ -30,6 +36,8 @@ class GenerateStyleResponse(BaseModel):
 
     candidates: list[StyleCandidateResponse]
     prompt: str
+    task_id: str  # Style job streaming the remaining candidates
+    pending: int = 0  # Candidates still generating when the response was sent
 
 
 class SaveStyleRequest(BaseModel):
@@ -74,6 +82,10 @@ class GenerateStyleFromTemplateRequest(BaseModel):
 
     style_type: str
     custom_prompt: str | None = None  # 用户编辑后的提示词（可选）
+    force: bool = False  # 跳过生成缓存
+    count: int = Field(2, ge=1, le=8)  # 候选数量
+    min_candidates: int | None = Field(None, ge=0)  # 就绪多少个后返回（None 表示全部）
+    cancel_stragglers: bool = False  # 返回后取消剩余候选
 
 
 class GenerateStyleFromTemplateResponse(BaseModel):
@@ -81,3 +93,5 @@ class GenerateStyleFromTemplateResponse(BaseModel):
 
     candidates: list[StyleCandidateResponse]
     template: StyleTemplateResponse
+    task_id: str  # 继续推送剩余候选的任务 ID
+    pending: int = 0  # 返回时仍在生成的候选数量
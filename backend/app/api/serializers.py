@@ -0,0 +1,151 @@
+"""Direct encoders from domain models to API response content.
+
+They build the same JSON as the response schemas in ``app.api.schemas`` (the
+schemas still document the routes), without constructing and validating
+Pydantic models, and leave datetimes for ``FastJSONResponse`` to encode.
+"""
+
+from typing import Any
+
+from app.api.schemas import SlideResponse
+from app.exceptions import InvalidRequestError
+from app.models import Project, ProjectEvent, Slide, SlideImage, Style
+from app.utils import compute_content_hash, versioned_url
+
+# Slide fields that can be selected with ?fields= (sid is always returned)
+SLIDE_FIELDS = frozenset(SlideResponse.model_fields) - {"sid"}
+# Optional parts of a project that can be selected with ?include=
+PROJECT_INCLUDES = frozenset({"style", "cost", "images"})
+
+
+def parse_selection(value: str | None, allowed: frozenset[str], name: str) -> frozenset[str]:
+    """Parse a comma-separated selection; None selects everything."""
+    if value is None:
+        return allowed
+    selected = frozenset(part.strip() for part in value.split(",") if part.strip())
+    unknown = selected - allowed
+    if unknown:
+        raise InvalidRequestError(f"Unknown {name}: {', '.join(sorted(unknown))}")
+    return selected
+
+
+def image_to_dict(image: SlideImage, slug: str, sid: str, content_hash: str) -> dict[str, Any]:
+    """Encode a slide image as a ``SlideImageResponse``."""
+    return {
+        "hash": image.hash,
+        "url": versioned_url(f"/static/slides/{slug}/{image.path}", image.data_hash),
+        "thumbnail_url": versioned_url(
+            f"/static/slides/{slug}/images/{sid}/{image.hash}_thumb.jpg", image.data_hash
+        ),
+        "created_at": image.created_at,
+        "matched": image.hash == content_hash,
+        "engine": image.engine,
+    }
+
+
+def slide_to_dict(
+    slide: Slide,
+    slug: str,
+    fields: frozenset[str] = SLIDE_FIELDS,
+    history: bool = True,
+) -> dict[str, Any]:
+    """Encode a slide as a ``SlideResponse``, with only the selected ``fields``.
+
+    The current image is the latest one. Without ``history``, ``images`` holds
+    only the selected image.
+    """
+    content_hash = compute_content_hash(slide.content)
+    data: dict[str, Any] = {"sid": slide.sid}
+    if "content" in fields:
+        data["content"] = slide.content
+    if "created_at" in fields:
+        data["created_at"] = slide.created_at
+    if "updated_at" in fields:
+        data["updated_at"] = slide.updated_at
+    if "current_image" in fields:
+        data["current_image"] = (
+            image_to_dict(slide.images[-1], slug, slide.sid, content_hash) if slide.images else None
+        )
+    if "images" in fields:
+        if history:
+            images = slide.images
+        else:
+            selected = slide.get_selected_image()
+            images = [] if selected is None else [selected]
+        data["images"] = [image_to_dict(img, slug, slide.sid, content_hash) for img in images]
+    if "selected_image_hash" in fields:
+        data["selected_image_hash"] = slide.selected_image_hash
+    return data
+
+
+def style_to_dict(style: Style, slug: str) -> dict[str, Any]:
+    """Encode a project style as a ``StyleResponse``."""
+    return {
+        "prompt": style.prompt,
+        "image": versioned_url(f"/static/slides/{slug}/{style.image}", style.image_hash),
+        "created_at": style.created_at,
+        "style_type": style.style_type.value if style.style_type else None,
+        "style_name": style.style_name,
+    }
+
+
+def project_to_dict(
+    project: Project,
+    cost_breakdown: dict[str, float],
+    fields: frozenset[str] = SLIDE_FIELDS,
+    includes: frozenset[str] = PROJECT_INCLUDES,
+) -> dict[str, Any]:
+    """Encode a project as a ``ProjectResponse``, trimmed to ``fields`` and ``includes``.
+
+    Args:
+        project: Project to encode
+        cost_breakdown: Cost by type, from ``CostService.get_breakdown``
+        fields: Slide fields to include
+        includes: Optional parts to include: "style", "cost" and "images"
+            (each slide's image history, rather than its selected image only)
+    """
+    slug = project.slug
+    history = "images" in includes
+    data: dict[str, Any] = {
+        "slug": slug,
+        "title": project.title,
+        "created_at": project.created_at,
+        "updated_at": project.updated_at,
+    }
+    if "style" in includes:
+        data["style"] = style_to_dict(project.style, slug) if project.style else None
+    data["slides"] = [slide_to_dict(slide, slug, fields, history) for slide in project.slides]
+    if "cost" in includes:
+        data["cost"] = {
+            "total_images": project.cost.total_images,
+            "style_generations": project.cost.style_generations,
+            "slide_generations": project.cost.slide_generations,
+            "estimated_cost": project.cost.estimated_cost,
+            "currency": "USD",
+            "breakdown": cost_breakdown,
+        }
+    data["image_engine"] = project.image_engine
+    return data
+
+
+def _event_value_to_dict(value: Any, slug: str) -> Any:
+    if isinstance(value, Slide):
+        return slide_to_dict(value, slug)
+    if isinstance(value, Style):
+        return style_to_dict(value, slug)
+    if isinstance(value, list):
+        return [_event_value_to_dict(item, slug) for item in value]
+    return value
+
+
+def event_to_dict(event: ProjectEvent) -> dict[str, Any]:
+    """Encode a project change event as a WebSocket message.
+
+    Slides and styles in the event are encoded as in the REST responses, so
+    clients can patch them into the state they loaded.
+    """
+    return {
+        "type": event.type,
+        "version": event.version,
+        "data": {key: _event_value_to_dict(value, event.slug) for key, value in event.data.items()},
+    }
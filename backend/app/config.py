@@ -21,8 +21,68 @@ class Settings(BaseSettings):
     nano_model: str = "[A]gemini-3-pro-image-preview"
     nano_image_size: str = "2K"
 
+    # Default engine for new projects: "gemini" | "volcengine" | "nano_banana" | "mock"
+    default_engine: str = "volcengine"
+
+    # Mock engine (local, deterministic; for load tests and offline development)
+    mock_latency_distribution: str = "lognormal"  # fixed | uniform | exponential | lognormal
+    mock_latency_mean: float = 2.0  # seconds
+    mock_latency_stddev: float = 1.0  # seconds
+    mock_failure_rate: float = 0.0  # 0.0 - 1.0
+    mock_image_width: int = 1920  # height follows 16:9
+    mock_seed: int | None = None
+
+    # Engine cassettes: record real engine responses, or replay them offline
+    engine_cassette_mode: str = ""  # "" (off) | record | replay
+    engine_cassette_path: str = "./cassettes"
+    engine_cassette_replay_timing: bool = True  # sleep for the recorded latency
+
     # Storage
     slides_base_path: str = "./slides"
+    # nginx internal location mapped to slides_base_path; when set, slide images are
+    # sent by nginx via X-Accel-Redirect instead of being streamed from Python
+    static_accel_redirect_prefix: str = ""
+
+    # Generation cache (shared across projects, keyed by the full request)
+    generation_cache_enabled: bool = True
+    generation_cache_path: str = "./cache/generations"
+    generation_cache_max_mb: int = 2048
+    generation_cache_max_age_days: int = 30
+
+    # Generation scheduling and progress
+    # In-flight requests per engine, the rest queue in order; 0 = unbounded
+    engine_max_concurrency: int = 0
+    latency_stats_path: str = "./cache/latency_stats.json"
+    generation_progress_interval: float = 2.0  # seconds between generation_progress events
+
+    # WebSocket
+    ws_replay_buffer_size: int = 256  # Recent messages per project replayed to reconnecting clients
+    ws_replay_ttl_seconds: int = 600  # Replay history kept for a project idle with no viewers
+    ws_send_queue_size: int = 64  # Messages queued per client before it counts as too slow
+    ws_heartbeat_interval: float = 20.0  # seconds between server pings
+    ws_idle_timeout: float = 60.0  # seconds without any message from a client before it is reaped
+    ws_max_connections_per_project: int = 200  # per worker
+    ws_max_connections: int = 2000  # per worker
+    # Broadcasts and generating tasks shared between workers: "memory" (one worker)
+    # or "sqlite" (workers on one host sharing ws_broker_path)
+    ws_broker: str = "memory"
+    ws_broker_path: str = "./cache/broker.db"
+    ws_broker_poll_interval: float = 0.05  # seconds
+    ws_broker_retention_seconds: int = 600  # How long messages stay available for replay
+    ws_broker_worker_timeout: float = 30.0  # Silence after which a worker's tasks are dropped
+
+    # Export
+    export_prefetch_depth: int = 8  # Images read ahead concurrently while exporting
+    export_cache_enabled: bool = True  # Keep finished exports, keyed by deck manifest hash
+    export_cache_path: str = "./cache/exports"
+    export_cache_max_mb: int = 4096
+    export_cache_max_age_days: int = 7
+    export_downloads_path: str = "./cache/downloads"  # Finished background exports
+    export_download_ttl_seconds: int = 3600  # Lifetime of a background export's download link
+
+    # Outline import
+    outline_import_max_mb: int = 5  # Largest document accepted by POST /slides/{slug}/import
+    outline_import_max_slides: int = 1000
 
     # Server
     server_host: str = "0.0.0.0"
@@ -11,6 +11,14 @@ class AppError(Exception):
         super().__init__(message)
 
 
+class NotModifiedError(Exception):
+    """Raised to answer a conditional request with 304 Not Modified."""
+
+    def __init__(self, etag: str):
+        self.etag = etag
+        super().__init__(etag)
+
+
 class ProjectNotFoundError(AppError):
     """Raised when a project is not found."""
 
@@ -44,6 +52,28 @@ class ImageNotFoundError(AppError):
         )
 
 
+class TaskNotFoundError(AppError):
+    """Raised when a background task is not found or already finished."""
+
+    def __init__(self, task_id: str):
+        super().__init__(
+            code="TASK_NOT_FOUND",
+            message=f"Task '{task_id}' not found",
+            status_code=404,
+        )
+
+
+class ExportNotFoundError(AppError):
+    """Raised when an export download does not exist or has expired."""
+
+    def __init__(self, token: str):
+        super().__init__(
+            code="EXPORT_NOT_FOUND",
+            message=f"Export '{token}' not found or expired",
+            status_code=404,
+        )
+
+
 class StyleNotSetError(AppError):
     """Raised when style is required but not set."""
 
@@ -66,6 +96,17 @@ class InvalidRequestError(AppError):
         )
 
 
+class BatchOperationError(AppError):
+    """Raised when an operation in a batch fails; none of the batch is applied."""
+
+    def __init__(self, index: int, error: AppError):
+        super().__init__(
+            code=error.code,
+            message=f"Operation {index}: {error.message}",
+            status_code=error.status_code,
+        )
+
+
 class GenerationFailedError(AppError):
     """Raised when image generation fails."""
 
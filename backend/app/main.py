@@ -8,12 +8,14 @@ from pathlib import Path
 from fastapi import FastAPI, Request
 from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
-from fastapi.staticfiles import StaticFiles
+from fastapi.responses import JSONResponse, Response
 
 from app.api import images_router, slides_router, style_router, style_templates_router, websocket_router
+from app.api.dependencies import get_event_bus
+from app.api.routes.websocket import broadcast_project_event, manager
 from app.config import get_settings
-from app.exceptions import AppError
+from app.exceptions import AppError, NotModifiedError
+from app.utils import VersionedStaticFiles
 
 # Configure logging
 logging.basicConfig(
@@ -41,8 +43,13 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     # Ensure slides directory exists
     Path(settings.slides_base_path).mkdir(parents=True, exist_ok=True)
 
+    # Receive WebSocket messages published by other workers
+    await manager.start()
+
     yield
 
+    await manager.close()
+
     # Shutdown
     logger.info("GenSlides API shutting down...", extra={"phase": "shutdown"})
 
@@ -62,6 +69,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag"],
 )
 
 
@@ -80,6 +88,12 @@ async def app_exception_handler(request: Request, exc: AppError) -> JSONResponse
     )
 
 
+@app.exception_handler(NotModifiedError)
+async def not_modified_handler(request: Request, exc: NotModifiedError) -> Response:
+    """Answer a conditional GET for an unchanged resource (no body)."""
+    return Response(status_code=304, headers={"ETag": exc.etag, "Cache-Control": "no-cache"})
+
+
 @app.exception_handler(RequestValidationError)
 async def validation_exception_handler(
     request: Request, exc: RequestValidationError
@@ -145,12 +159,19 @@ app.include_router(slides_router, prefix="/api")
 app.include_router(images_router, prefix="/api")
 app.include_router(websocket_router)
 
-# Ensure slides directory exists and mount static files
+# Project changes published by the services reach clients over WebSocket
+get_event_bus().subscribe(broadcast_project_event)
+
+# Ensure slides directory exists and mount static files; versioned (?v=) URLs
+# are served as immutable
 slides_path = Path(settings.slides_base_path)
 slides_path.mkdir(parents=True, exist_ok=True)
 app.mount(
     "/static/slides",
-    StaticFiles(directory=str(slides_path)),
+    VersionedStaticFiles(
+        directory=str(slides_path),
+        accel_redirect_prefix=settings.static_accel_redirect_prefix,
+    ),
     name="slides",
 )
 
@@ -1,14 +1,21 @@
 """Domain models."""
 
+from .batch import BatchResult, SlideOperation
+from .event import ProjectEvent
+from .export import ExportDownload
 from .project import CostInfo, Project
 from .slide import Slide, SlideImage
 from .style import STYLE_TEMPLATES, Style, StyleCandidate, StyleTemplate, StyleType
 
 __all__ = [
+    "BatchResult",
     "CostInfo",
+    "ExportDownload",
     "Project",
+    "ProjectEvent",
     "Slide",
     "SlideImage",
+    "SlideOperation",
     "Style",
     "StyleCandidate",
     "StyleTemplate",
@@ -0,0 +1,33 @@
+"""Batch edit domain models."""
+
+from dataclasses import dataclass, field
+
+from .project import Project
+
+
+@dataclass
+class SlideOperation:
+    """One edit in a batch applied to a project in a single write."""
+
+    op: str  # "create" | "update" | "delete" | "reorder" | "select_image" | "title"
+    sid: str | None = None  # Target slide: a sid, or the ref of a slide created earlier
+    content: str | None = None
+    after_sid: str | None = None  # create: insert after this slide (sid or ref)
+    ref: str | None = None  # create: name for the new slide, usable later in the batch
+    order: list[str] | None = None  # reorder: every slide, as sids or refs
+    image_hash: str | None = None  # select_image
+    title: str | None = None  # title
+    cancel_generation: bool = True  # update/delete: cancel in-flight generation
+
+
+@dataclass
+class BatchResult:
+    """A saved batch: the resulting project and what the batch changed."""
+
+    project: Project
+    refs: dict[str, str] = field(default_factory=dict)  # ref -> sid of created slides
+    created: list[str] = field(default_factory=list)
+    updated: list[str] = field(default_factory=list)  # Content or selected image changed
+    deleted: list[str] = field(default_factory=list)
+    reordered: bool = False
+    title_changed: bool = False
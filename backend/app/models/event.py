@@ -0,0 +1,18 @@
+"""Project change event domain models."""
+
+from dataclasses import dataclass, field
+from typing import Any
+
+
+@dataclass
+class ProjectEvent:
+    """A change to a saved project, published after the write.
+
+    ``data`` holds domain objects (``Slide``, ``Style``) and plain values; it
+    is encoded for clients by the subscriber.
+    """
+
+    slug: str
+    type: str  # "slide_created" | "slide_updated" | "slide_deleted" | "slides_reordered" | ...
+    version: str  # Project version after the change (the project's ETag)
+    data: dict[str, Any] = field(default_factory=dict)
@@ -0,0 +1,20 @@
+"""Export domain models."""
+
+from dataclasses import dataclass
+from datetime import datetime
+
+
+@dataclass
+class ExportDownload:
+    """A finished background export, downloadable until it expires."""
+
+    token: str  # Unguessable ID used in the download URL
+    slug: str
+    filename: str
+    media_type: str
+    size: int
+    expires_at: datetime
+
+    def is_expired(self, now: datetime | None = None) -> bool:
+        """Check whether the download link has expired."""
+        return (now or datetime.now()) >= self.expires_at
@@ -26,7 +26,11 @@ class Project:
     title: str = "Untitled"
     style: Style | None = None
     slides: list[Slide] = field(default_factory=list)
-    image_engine: str = "volcengine"  # "gemini" | "volcengine" | "nano_banana"
+    image_engine: str = "volcengine"  # "gemini" | "volcengine" | "nano_banana" | "mock"
+    # Opt-in hedging: if image_engine has not answered within hedge_after_seconds,
+    # fire the same request at hedge_engine and keep whichever returns first.
+    hedge_engine: str | None = None
+    hedge_after_seconds: float = 45.0
     created_at: datetime = field(default_factory=datetime.now)
     updated_at: datetime = field(default_factory=datetime.now)
     cost: CostInfo = field(default_factory=CostInfo)
@@ -11,6 +11,8 @@ class SlideImage:
     hash: str  # blake3 hash of content
     path: str  # relative path to image file
     created_at: datetime = field(default_factory=datetime.now)
+    engine: str | None = None  # Engine that produced the image (None for legacy images)
+    data_hash: str | None = None  # blake3 hash of the image bytes (None for legacy images)
 
 
 @dataclass
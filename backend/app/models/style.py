@@ -80,6 +80,7 @@ class Style:
     created_at: datetime = field(default_factory=datetime.now)
     style_type: StyleType | None = None  # 风格类型（可选，向后兼容）
     style_name: str | None = None  # 风格名称（可选）
+    image_hash: str | None = None  # blake3 hash of the style image bytes（可选）
 
 
 @dataclass
@@ -1,10 +1,14 @@
 """Data access repositories."""
 
+from .cache_repository import CacheRepository
+from .download_repository import DownloadRepository
 from .image_repository import ImageRepository
 from .slides_repository import SlidesRepository
 from .style_repository import StyleRepository
 
 __all__ = [
+    "CacheRepository",
+    "DownloadRepository",
     "ImageRepository",
     "SlidesRepository",
     "StyleRepository",
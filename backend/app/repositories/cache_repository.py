@@ -0,0 +1,168 @@
+"""Cache repository for content-addressed files on disk."""
+
+import asyncio
+import logging
+import os
+import time
+import uuid
+from collections.abc import AsyncGenerator
+from contextlib import aclosing
+from pathlib import Path
+
+import aiofiles
+
+from app.utils import delete_file, ensure_directory, file_exists, read_bytes, write_bytes
+
+logger = logging.getLogger(__name__)
+
+
+class CacheRepository:
+    """Repository for cached files keyed by a content hash.
+
+    Entries are stored as ``{base_path}/{key[:2]}/{key}{suffix}``. A file's mtime
+    records when it was last used: hits refresh it, and eviction removes entries
+    idle for longer than ``max_age_seconds`` and then the least recently used
+    entries until the cache fits in ``max_bytes``.
+    """
+
+    def __init__(
+        self,
+        base_path: str,
+        max_bytes: int,
+        max_age_seconds: float,
+        suffix: str = ".jpg",
+    ):
+        self.base_path = Path(base_path)
+        self.max_bytes = max_bytes
+        self.max_age_seconds = max_age_seconds
+        self.suffix = suffix
+        # Running estimate of the cache size; None until the first scan
+        self._size_estimate: int | None = None
+        self._evict_lock = asyncio.Lock()
+
+    def _get_entry_path(self, key: str) -> Path:
+        """Get the path to a cache entry."""
+        return self.base_path / key[:2] / f"{key}{self.suffix}"
+
+    def _is_expired(self, path: Path) -> bool:
+        """Check if an entry has been idle for longer than max_age_seconds."""
+        return time.time() - path.stat().st_mtime > self.max_age_seconds
+
+    async def get_path(self, key: str) -> Path | None:
+        """Get the path of a fresh cache entry and mark it as recently used."""
+        path = self._get_entry_path(key)
+        if not await file_exists(path):
+            return None
+        try:
+            if self._is_expired(path):
+                await delete_file(path)
+                return None
+            os.utime(path)  # LRU: refresh last-used time
+        except FileNotFoundError:
+            return None  # Evicted concurrently
+        return path
+
+    async def get(self, key: str) -> bytes | None:
+        """Get a cache entry's data, or None on a miss."""
+        path = await self.get_path(key)
+        if path is None:
+            return None
+        try:
+            return await read_bytes(path)
+        except FileNotFoundError:
+            return None
+
+    def get_temp_path(self, key: str) -> Path:
+        """Get a unique temporary path next to a key's entry, for writing it in place.
+
+        Temporary files never match the entry suffix, so they are not served or
+        counted by eviction; commit one with ``put_file``.
+        """
+        path = self._get_entry_path(key)
+        return path.with_name(f".{path.name}.{uuid.uuid4().hex[:8]}.tmp")
+
+    async def put(self, key: str, data: bytes) -> Path:
+        """Store data under a key and return the entry path."""
+        tmp_path = self.get_temp_path(key)
+        await write_bytes(tmp_path, data)
+        return await self._commit(tmp_path, self._get_entry_path(key), len(data))
+
+    async def put_file(self, key: str, source: Path) -> Path:
+        """Move a finished file (from ``get_temp_path``) into the cache under a key."""
+        size = source.stat().st_size
+        return await self._commit(source, self._get_entry_path(key), size)
+
+    async def put_stream(
+        self, key: str, chunks: AsyncGenerator[bytes, None]
+    ) -> AsyncGenerator[bytes, None]:
+        """Pass a stream through while storing it under a key.
+
+        The entry is committed only once the stream is exhausted; if the consumer
+        stops early (e.g. the client disconnects), the partial file is removed.
+        """
+        tmp_path = self.get_temp_path(key)
+        await ensure_directory(tmp_path.parent)
+        try:
+            async with aclosing(chunks), aiofiles.open(tmp_path, "wb") as f:
+                async for chunk in chunks:
+                    await f.write(chunk)
+                    yield chunk
+            await self.put_file(key, tmp_path)
+        finally:
+            await delete_file(tmp_path)
+
+    async def _commit(self, source: Path, path: Path, size: int) -> Path:
+        """Atomically move a file into place and evict if the cache is over budget."""
+        await ensure_directory(path.parent)
+        os.replace(source, path)
+
+        if self._size_estimate is not None:
+            self._size_estimate += size
+        if self._size_estimate is None or self._size_estimate > self.max_bytes:
+            await self.evict()
+        return path
+
+    async def evict(self) -> int:
+        """Evict expired and least recently used entries. Returns the number removed."""
+        async with self._evict_lock:
+            removed, total = await asyncio.to_thread(self._evict_sync)
+            self._size_estimate = total
+        if removed:
+            logger.info(
+                "Cache entries evicted",
+                extra={"cache": str(self.base_path), "removed": removed, "bytes": total},
+            )
+        return removed
+
+    def _evict_sync(self) -> tuple[int, int]:
+        """Scan the cache directory and evict entries (runs in a worker thread)."""
+        if not self.base_path.exists():
+            return 0, 0
+
+        now = time.time()
+        entries: list[tuple[float, int, Path]] = []
+        removed = 0
+        for path in self.base_path.glob(f"*/*{self.suffix}"):
+            try:
+                stat = path.stat()
+                if now - stat.st_mtime > self.max_age_seconds:
+                    path.unlink()
+                    removed += 1
+                    continue
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        entries.sort()  # Oldest last-used first
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+            total -= size
+            removed += 1
+
+        return removed, total
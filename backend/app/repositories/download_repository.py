@@ -0,0 +1,175 @@
+"""Download repository for finished exports served at expiring links."""
+
+import asyncio
+import json
+import logging
+import os
+import shutil
+import time
+import uuid
+from collections.abc import AsyncGenerator
+from contextlib import aclosing
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any
+
+import aiofiles
+
+from app.models import ExportDownload
+from app.utils import (
+    delete_file,
+    ensure_directory,
+    file_exists,
+    is_safe_name,
+    read_file,
+    write_file,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def _link_or_copy(source: Path, target: Path) -> None:
+    """Hard-link a file (no copy on the same filesystem), falling back to copying."""
+    try:
+        os.link(source, target)
+    except OSError:
+        shutil.copyfile(source, target)
+
+
+class DownloadRepository:
+    """Repository for export files downloadable for a limited time.
+
+    Each download is stored as ``{base_path}/{token}.data`` with its metadata in
+    ``{token}.json``. A download expires ``ttl_seconds`` after it is created,
+    however often it is fetched; expired files are removed when accessed and
+    whenever a new download is created.
+    """
+
+    def __init__(self, base_path: str, ttl_seconds: float):
+        self.base_path = Path(base_path)
+        self.ttl_seconds = ttl_seconds
+
+    def _get_data_path(self, token: str) -> Path:
+        return self.base_path / f"{token}.data"
+
+    def _get_meta_path(self, token: str) -> Path:
+        return self.base_path / f"{token}.json"
+
+    async def create(
+        self,
+        slug: str,
+        filename: str,
+        media_type: str,
+        source: Path | AsyncGenerator[bytes, None],
+    ) -> ExportDownload:
+        """Store a file (or a stream of its bytes) as a new download.
+
+        Args:
+            slug: Project the download belongs to
+            filename: Filename offered to the client
+            media_type: Content type of the file
+            source: Existing file to link or copy, or a stream to write out
+
+        Returns:
+            The new download, with its token and expiry
+        """
+        token = uuid.uuid4().hex
+        data_path = self._get_data_path(token)
+        tmp_path = self.base_path / f".{token}.tmp"
+        await ensure_directory(self.base_path)
+        try:
+            if isinstance(source, Path):
+                await asyncio.to_thread(_link_or_copy, source, tmp_path)
+            else:
+                async with aclosing(source), aiofiles.open(tmp_path, "wb") as f:
+                    async for chunk in source:
+                        await f.write(chunk)
+            os.replace(tmp_path, data_path)
+        finally:
+            await delete_file(tmp_path)
+
+        download = ExportDownload(
+            token=token,
+            slug=slug,
+            filename=filename,
+            media_type=media_type,
+            size=data_path.stat().st_size,
+            expires_at=datetime.now() + timedelta(seconds=self.ttl_seconds),
+        )
+        await write_file(self._get_meta_path(token), json.dumps(self._to_dict(download)))
+        await self.purge_expired()
+        return download
+
+    async def get(self, token: str) -> tuple[ExportDownload, Path] | None:
+        """Get an unexpired download and the path of its file, or None."""
+        if not is_safe_name(token):
+            return None
+        meta_path = self._get_meta_path(token)
+        data_path = self._get_data_path(token)
+        if not await file_exists(meta_path):
+            return None
+        try:
+            download = self._from_dict(json.loads(await read_file(meta_path)))
+        except FileNotFoundError:
+            return None  # Purged concurrently
+        if download.is_expired():
+            await self.delete(token)
+            return None
+        if not await file_exists(data_path):
+            return None
+        return download, data_path
+
+    async def delete(self, token: str) -> None:
+        """Delete a download's file and metadata."""
+        await delete_file(self._get_data_path(token))
+        await delete_file(self._get_meta_path(token))
+
+    async def purge_expired(self) -> int:
+        """Delete expired downloads. Returns the number removed."""
+        removed = await asyncio.to_thread(self._purge_sync)
+        if removed:
+            logger.info(
+                "Expired downloads removed",
+                extra={"path": str(self.base_path), "removed": removed},
+            )
+        return removed
+
+    def _purge_sync(self) -> int:
+        """Scan metadata files and remove expired downloads (runs in a worker thread)."""
+        if not self.base_path.exists():
+            return 0
+        now = time.time()
+        removed = 0
+        for meta_path in self.base_path.glob("*.json"):
+            # Metadata is written once, at creation, so its mtime is the creation time
+            try:
+                if now - meta_path.stat().st_mtime < self.ttl_seconds:
+                    continue
+                self._get_data_path(meta_path.stem).unlink(missing_ok=True)
+                meta_path.unlink()
+            except FileNotFoundError:
+                continue
+            removed += 1
+        return removed
+
+    @staticmethod
+    def _to_dict(download: ExportDownload) -> dict[str, Any]:
+        return {
+            "token": download.token,
+            "slug": download.slug,
+            "filename": download.filename,
+            "media_type": download.media_type,
+            "size": download.size,
+            "expires_at": download.expires_at.isoformat(),
+        }
+
+    @staticmethod
+    def _from_dict(data: dict[str, Any]) -> ExportDownload:
+        return ExportDownload(
+            token=data["token"],
+            slug=data["slug"],
+            filename=data["filename"],
+            media_type=data["media_type"],
+            size=data["size"],
+            expires_at=datetime.fromisoformat(data["expires_at"]),
+        )
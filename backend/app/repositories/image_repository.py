@@ -2,7 +2,15 @@
 
 from pathlib import Path
 
-from app.utils import delete_file, ensure_directory, file_exists, list_files, read_bytes, write_bytes
+from app.utils import (
+    delete_file,
+    ensure_directory,
+    file_exists,
+    list_files,
+    read_bytes,
+    versioned_url,
+    write_bytes,
+)
 
 
 class ImageRepository:
@@ -73,10 +81,10 @@ class ImageRepository:
                 hashes.append(name)
         return hashes
 
-    def get_image_url(self, slug: str, sid: str, hash: str) -> str:
-        """Get the URL for an image."""
-        return f"/static/slides/{slug}/images/{sid}/{hash}.jpg"
+    def get_image_url(self, slug: str, sid: str, hash: str, version: str | None = None) -> str:
+        """Get the URL for an image, pinned to ``version`` (its data hash) if given."""
+        return versioned_url(f"/static/slides/{slug}/images/{sid}/{hash}.jpg", version)
 
-    def get_thumbnail_url(self, slug: str, sid: str, hash: str) -> str:
-        """Get the URL for a thumbnail."""
-        return f"/static/slides/{slug}/images/{sid}/{hash}_thumb.jpg"
+    def get_thumbnail_url(self, slug: str, sid: str, hash: str, version: str | None = None) -> str:
+        """Get the URL for a thumbnail, pinned to ``version`` (its image's data hash) if given."""
+        return versioned_url(f"/static/slides/{slug}/images/{sid}/{hash}_thumb.jpg", version)
@@ -6,18 +6,22 @@ from datetime import datetime
 from pathlib import Path
 from typing import Any
 
+import aiofiles.os
 import yaml
 
 from app.models import CostInfo, Project, Slide, SlideImage, Style, StyleType
-from app.utils import ensure_directory, file_exists, read_file, write_file
+from app.utils import compute_content_hash, ensure_directory, file_exists, read_file, write_file
 
 
 class SlidesRepository:
     """Repository for slides project data stored in YAML files."""
 
-    def __init__(self, base_path: str = "./slides"):
+    def __init__(self, base_path: str = "./slides", default_engine: str = "volcengine"):
         self.base_path = Path(base_path)
+        self.default_engine = default_engine  # image_engine for newly created projects
         self._locks: dict[str, Lock] = {}
+        # slug -> (outline mtime_ns, size, version); see get_version
+        self._versions: dict[str, tuple[int, int, str]] = {}
 
     def _get_lock(self, slug: str) -> Lock:
         """Get or create a lock for a project."""
@@ -49,8 +53,8 @@ class SlidesRepository:
             data = yaml.safe_load(content)
             return self._parse_project(slug, data)
 
-    async def save_project(self, project: Project) -> None:
-        """Save a project to disk."""
+    async def save_project(self, project: Project) -> str:
+        """Save a project to disk. Returns its new version (see ``get_version``)."""
         outline_path = self._get_outline_path(project.slug)
 
         async with self._get_lock(project.slug):
@@ -58,12 +62,41 @@ class SlidesRepository:
             data = self._serialize_project(project)
             content = yaml.dump(data, allow_unicode=True, default_flow_style=False)
             await write_file(outline_path, content)
+            stat = await aiofiles.os.stat(outline_path)
+            version = compute_content_hash(content)
+            self._versions[project.slug] = (stat.st_mtime_ns, stat.st_size, version)
+            return version
+
+    async def get_version(self, slug: str) -> str | None:
+        """Get a hash identifying the project's current state, or None if it does not exist.
+
+        The version changes whenever the outline changes. It is kept up to date by
+        ``save_project`` and otherwise validated against the outline's mtime and
+        size, so it costs a ``stat`` unless the file was changed outside the app.
+        """
+        outline_path = self._get_outline_path(slug)
+        try:
+            stat = await aiofiles.os.stat(outline_path)
+        except FileNotFoundError:
+            self._versions.pop(slug, None)
+            return None
+
+        cached = self._versions.get(slug)
+        if cached is not None and cached[:2] == (stat.st_mtime_ns, stat.st_size):
+            return cached[2]
+
+        async with self._get_lock(slug):
+            content = await read_file(outline_path)
+        version = compute_content_hash(content)
+        self._versions[slug] = (stat.st_mtime_ns, stat.st_size, version)
+        return version
 
     async def create_project(self, slug: str, title: str = "Untitled") -> Project:
         """Create a new project."""
         project = Project(
             slug=slug,
             title=title,
+            image_engine=self.default_engine,
             created_at=datetime.now(),
             updated_at=datetime.now(),
         )
@@ -91,8 +124,9 @@ class SlidesRepository:
                     if project:
                         projects.append(project)
 
-        # Sort by updated_at descending (most recent first)
-        projects.sort(key=lambda p: p.updated_at, reverse=True)
+        # Sort by updated_at descending (most recent first); slug breaks ties so
+        # the order is stable for cursor pagination
+        projects.sort(key=lambda p: (p.updated_at, p.slug), reverse=True)
         return projects
 
     async def delete_project(self, slug: str) -> bool:
@@ -109,6 +143,7 @@ class SlidesRepository:
             # Clean up the lock
             if slug in self._locks:
                 del self._locks[slug]
+            self._versions.pop(slug, None)
 
         return True
 
@@ -134,6 +169,7 @@ class SlidesRepository:
                 created_at=datetime.fromisoformat(data["style"]["created_at"]),
                 style_type=style_type,
                 style_name=data["style"].get("style_name"),
+                image_hash=data["style"].get("image_hash"),
             )
 
         slides = []
@@ -143,6 +179,8 @@ class SlidesRepository:
                     hash=img["hash"],
                     path=img["path"],
                     created_at=datetime.fromisoformat(img["created_at"]),
+                    engine=img.get("engine"),
+                    data_hash=img.get("data_hash"),
                 )
                 for img in slide_data.get("images", [])
             ]
@@ -170,6 +208,8 @@ class SlidesRepository:
             style=style,
             slides=slides,
             image_engine=data.get("image_engine", "volcengine"),
+            hedge_engine=data.get("hedge_engine"),
+            hedge_after_seconds=data.get("hedge_after_seconds", 45.0),
             created_at=datetime.fromisoformat(data["created_at"]),
             updated_at=datetime.fromisoformat(data["updated_at"]),
             cost=cost,
@@ -191,6 +231,11 @@ class SlidesRepository:
             },
         }
 
+        # 只有启用对冲请求时才保存对冲配置
+        if project.hedge_engine:
+            data["hedge_engine"] = project.hedge_engine
+            data["hedge_after_seconds"] = project.hedge_after_seconds
+
         if project.style:
             style_data: dict[str, Any] = {
                 "prompt": project.style.prompt,
@@ -202,6 +247,8 @@ class SlidesRepository:
                 style_data["style_type"] = project.style.style_type.value
             if project.style.style_name:
                 style_data["style_name"] = project.style.style_name
+            if project.style.image_hash:
+                style_data["image_hash"] = project.style.image_hash
             data["style"] = style_data
 
         for slide in project.slides:
@@ -210,17 +257,24 @@ class SlidesRepository:
                 "content": slide.content,
                 "created_at": slide.created_at.isoformat(),
                 "updated_at": slide.updated_at.isoformat(),
-                "images": [
-                    {
-                        "hash": img.hash,
-                        "path": img.path,
-                        "created_at": img.created_at.isoformat(),
-                    }
-                    for img in slide.images
-                ],
+                "images": [self._serialize_image(img) for img in slide.images],
             }
             if slide.selected_image_hash:
                 slide_data["selected_image_hash"] = slide.selected_image_hash
             data["slides"].append(slide_data)
 
         return data
+
+    @staticmethod
+    def _serialize_image(image: SlideImage) -> dict[str, Any]:
+        """Serialize a slide image to YAML-compatible dict."""
+        image_data: dict[str, Any] = {
+            "hash": image.hash,
+            "path": image.path,
+            "created_at": image.created_at.isoformat(),
+        }
+        if image.engine:
+            image_data["engine"] = image.engine
+        if image.data_hash:
+            image_data["data_hash"] = image.data_hash
+        return image_data
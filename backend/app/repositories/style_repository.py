@@ -3,7 +3,15 @@
 import uuid
 from pathlib import Path
 
-from app.utils import ensure_directory, file_exists, list_files, read_bytes, write_bytes
+from app.utils import (
+    compute_bytes_hash,
+    ensure_directory,
+    file_exists,
+    list_files,
+    read_bytes,
+    versioned_url,
+    write_bytes,
+)
 
 
 class StyleRepository:
@@ -59,11 +67,12 @@ class StyleRepository:
         return await read_bytes(path)
 
     async def promote_candidate(self, slug: str, candidate_id: str) -> str | None:
-        """Promote a candidate to the main style image."""
+        """Promote a candidate to the main style image and return its data hash."""
         candidate_data = await self.get_candidate(slug, candidate_id)
         if candidate_data is None:
             return None
-        return await self.save_style_image(slug, candidate_data)
+        await self.save_style_image(slug, candidate_data)
+        return compute_bytes_hash(candidate_data)
 
     async def clear_candidates(self, slug: str) -> None:
         """Clear all candidate images."""
@@ -72,9 +81,9 @@ class StyleRepository:
         for file in files:
             file.unlink()
 
-    def get_style_url(self, slug: str) -> str:
-        """Get the URL for the style image."""
-        return f"/static/slides/{slug}/style/style.jpg"
+    def get_style_url(self, slug: str, version: str | None = None) -> str:
+        """Get the URL for the style image, pinned to ``version`` (its data hash) if given."""
+        return versioned_url(f"/static/slides/{slug}/style/style.jpg", version)
 
     def get_candidate_url(self, slug: str, candidate_id: str) -> str:
         """Get the URL for a candidate image."""
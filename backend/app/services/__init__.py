@@ -1,21 +1,54 @@
 """Business logic services."""
 
+from .broker import Broker, InMemoryBroker, MessageHandler, SqliteBroker
+from .cassette_service import CassetteImageService
 from .cost_service import CostService
-from .export_service import ExportService
+from .engine_queue import EngineQueue, QueueStatus
+from .event_bus import EventBus, EventHandler
+from .export_service import (
+    ExportArtifact,
+    ExportFormat,
+    ExportProgressCallback,
+    ExportService,
+)
 from .gemini_service import GeminiService
+from .generation_cache import GenerationCache
 from .image_service import ImageService
+from .latency_stats import DeckEstimate, GenerationEstimate, LatencyHistogram, LatencyStats
+from .mock_image_service import MockImageService
 from .nano_banana_service import NanoBananaService
 from .slides_service import SlidesService
 from .style_service import StyleService
+from .task_registry import BackgroundTask, TaskRegistry
 from .volcengine_service import VolcEngineService
 
 __all__ = [
+    "BackgroundTask",
+    "Broker",
+    "CassetteImageService",
     "CostService",
+    "DeckEstimate",
+    "EngineQueue",
+    "EventBus",
+    "EventHandler",
+    "ExportArtifact",
+    "ExportFormat",
+    "ExportProgressCallback",
     "ExportService",
     "GeminiService",
+    "GenerationCache",
+    "GenerationEstimate",
     "ImageService",
+    "InMemoryBroker",
+    "LatencyHistogram",
+    "LatencyStats",
+    "MessageHandler",
+    "MockImageService",
     "NanoBananaService",
+    "QueueStatus",
     "SlidesService",
+    "SqliteBroker",
     "StyleService",
+    "TaskRegistry",
     "VolcEngineService",
 ]
@@ -0,0 +1,305 @@
+"""Pub/sub brokers carrying WebSocket messages and generation state between workers."""
+
+import asyncio
+import logging
+import sqlite3
+import threading
+import time
+import uuid
+from abc import ABC, abstractmethod
+from collections.abc import Awaitable, Callable
+from pathlib import Path
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+# Called with (slug, seq, payload) for every published message, in publish order
+# per slug; seq is None for transient messages
+MessageHandler = Callable[[str, int | None, str], Awaitable[None]]
+
+
+class Broker(ABC):
+    """Backbone shared by all API workers for broadcasts and in-flight generations.
+
+    A published message reaches the handlers of every worker subscribed to the
+    same broker, including the publisher's. Numbered messages get a per-slug
+    ``seq`` assigned by the broker, so all workers number them alike; ``epoch``
+    identifies that numbering. Payloads are opaque (encoded JSON).
+
+    Implementations: ``InMemoryBroker`` (one process) and ``SqliteBroker``
+    (workers sharing a SQLite file). A networked broker (e.g. Redis pub/sub
+    with a hash per slug for the tasks) would implement the same methods.
+
+    Only the generating-task list is shared, not the tasks themselves: a
+    generation can only be cancelled by the worker running it, so cancelling
+    (explicitly, or on a slide update or delete) only reaches tasks of the
+    worker that handles the request.
+    """
+
+    def __init__(self) -> None:
+        self._handlers: list[MessageHandler] = []
+
+    @property
+    @abstractmethod
+    def epoch(self) -> str:
+        """Identifier of the broker's message numbering."""
+
+    def subscribe(self, handler: MessageHandler) -> None:
+        """Deliver every published message to ``handler``."""
+        self._handlers.append(handler)
+
+    async def _deliver(self, slug: str, seq: int | None, payload: str) -> None:
+        for handler in list(self._handlers):
+            try:
+                await handler(slug, seq, payload)
+            except Exception:
+                logger.exception("Broker message handler failed", extra={"slug": slug})
+
+    async def start(self) -> None:
+        """Start receiving messages from other workers."""
+
+    async def close(self) -> None:
+        """Stop receiving messages and release resources."""
+
+    @abstractmethod
+    async def publish(self, slug: str, payload: str, replay: bool = True) -> None:
+        """Publish a message to every worker; numbered unless ``replay`` is False."""
+
+    @abstractmethod
+    async def add_generating_task(self, slug: str, sid: str, task_id: str) -> None:
+        """Record that a slide is being generated."""
+
+    @abstractmethod
+    async def remove_generating_task(self, slug: str, sid: str, task_id: str | None = None) -> None:
+        """Forget a slide's generation.
+
+        If task_id is given, the entry is only removed when it still belongs to that
+        task, so a cancelled task cannot untrack a newer generation for the same slide.
+        """
+
+    @abstractmethod
+    async def get_generating_sids(self, slug: str) -> list[str]:
+        """Get the slides being generated, by any worker."""
+
+
+class InMemoryBroker(Broker):
+    """Broker for a single process: messages are delivered as they are published."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._epoch = uuid.uuid4().hex
+        self._seq: dict[str, int] = {}
+        # Track generating tasks: {slug: {sid: task_id}}
+        self._tasks: dict[str, dict[str, str]] = {}
+
+    @property
+    def epoch(self) -> str:
+        return self._epoch
+
+    async def publish(self, slug: str, payload: str, replay: bool = True) -> None:
+        seq = None
+        if replay:
+            seq = self._seq[slug] = self._seq.get(slug, 0) + 1
+        await self._deliver(slug, seq, payload)
+
+    async def add_generating_task(self, slug: str, sid: str, task_id: str) -> None:
+        self._tasks.setdefault(slug, {})[sid] = task_id
+
+    async def remove_generating_task(self, slug: str, sid: str, task_id: str | None = None) -> None:
+        tasks = self._tasks.get(slug)
+        if tasks is None or (task_id is not None and tasks.get(sid) != task_id):
+            return
+        tasks.pop(sid, None)
+        if not tasks:
+            del self._tasks[slug]
+
+    async def get_generating_sids(self, slug: str) -> list[str]:
+        return list(self._tasks.get(slug, {}))
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS seqs (slug TEXT PRIMARY KEY, seq INTEGER NOT NULL);
+CREATE TABLE IF NOT EXISTS messages (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    slug TEXT NOT NULL,
+    seq INTEGER,
+    payload TEXT NOT NULL,
+    created REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS tasks (
+    slug TEXT NOT NULL,
+    sid TEXT NOT NULL,
+    task_id TEXT NOT NULL,
+    owner TEXT NOT NULL,
+    PRIMARY KEY (slug, sid)
+);
+CREATE TABLE IF NOT EXISTS workers (owner TEXT PRIMARY KEY, touched_at REAL NOT NULL);
+"""
+
+
+class SqliteBroker(Broker):
+    """Broker for workers on one host, through a shared SQLite database.
+
+    Publishing appends a row (numbering it per slug in the same transaction)
+    and every worker, the publisher included, polls for new rows every
+    ``poll_interval`` seconds, so all workers see messages in the same order.
+    Rows older than ``retention_seconds`` are deleted. On start, the retained
+    numbered messages are delivered first so a new worker can replay them to
+    reconnecting clients. Needs no external service; SQLite runs in worker
+    threads.
+
+    Each worker refreshes its ``touched_at`` in ``workers`` while polling; the
+    generating tasks of a worker silent for ``worker_timeout`` seconds (one
+    that crashed without closing the broker) are dropped by the others.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        poll_interval: float = 0.05,
+        retention_seconds: float = 600,
+        worker_timeout: float = 30,
+    ) -> None:
+        super().__init__()
+        self.path = Path(path)
+        self.poll_interval = poll_interval
+        self.retention_seconds = retention_seconds
+        self.worker_timeout = max(worker_timeout, poll_interval * 10)
+        self.owner = uuid.uuid4().hex  # This worker, for the tasks it registers
+        self._lock = threading.Lock()
+        self._db = self._connect()
+        self._epoch = self._load_epoch()
+        self._touch_sync()
+        self._last_id = 0
+        self._poller: asyncio.Task[None] | None = None
+
+    def _connect(self) -> sqlite3.Connection:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        db = sqlite3.connect(self.path, timeout=10, isolation_level=None, check_same_thread=False)
+        db.execute("PRAGMA journal_mode=WAL")
+        db.executescript(_SCHEMA)
+        return db
+
+    def _load_epoch(self) -> str:
+        with self._lock:
+            self._db.execute(
+                "INSERT OR IGNORE INTO meta (key, value) VALUES ('epoch', ?)", (uuid.uuid4().hex,)
+            )
+            row = self._db.execute("SELECT value FROM meta WHERE key = 'epoch'").fetchone()
+        return str(row[0])
+
+    def _touch_sync(self) -> None:
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO workers (owner, touched_at) VALUES (?, ?)",
+                (self.owner, time.time()),
+            )
+
+    @property
+    def epoch(self) -> str:
+        return self._epoch
+
+    async def _run(self, sql: str, params: tuple[Any, ...] = ()) -> list[Any]:
+        def _execute() -> list[Any]:
+            with self._lock:
+                return self._db.execute(sql, params).fetchall()
+
+        return await asyncio.to_thread(_execute)
+
+    async def start(self) -> None:
+        if self._poller is not None:
+            return
+        rows = await self._run("SELECT id, slug, seq, payload FROM messages ORDER BY id")
+        for row_id, slug, seq, payload in rows:
+            if seq is not None:
+                await self._deliver(slug, seq, payload)
+            self._last_id = row_id
+        self._poller = asyncio.create_task(self._poll())
+
+    async def close(self) -> None:
+        if self._poller is not None:
+            self._poller.cancel()
+            await asyncio.gather(self._poller, return_exceptions=True)
+            self._poller = None
+        await self._run("DELETE FROM tasks WHERE owner = ?", (self.owner,))
+        await self._run("DELETE FROM workers WHERE owner = ?", (self.owner,))
+        with self._lock:
+            self._db.close()
+
+    async def _poll(self) -> None:
+        last_prune = last_touch = time.monotonic()
+        while True:
+            try:
+                rows = await self._run(
+                    "SELECT id, slug, seq, payload FROM messages WHERE id > ? ORDER BY id",
+                    (self._last_id,),
+                )
+                for row_id, slug, seq, payload in rows:
+                    self._last_id = row_id
+                    await self._deliver(slug, seq, payload)
+                if time.monotonic() - last_prune > self.retention_seconds / 10:
+                    last_prune = time.monotonic()
+                    await self._run(
+                        "DELETE FROM messages WHERE created < ?",
+                        (time.time() - self.retention_seconds,),
+                    )
+                if time.monotonic() - last_touch > self.worker_timeout / 3:
+                    last_touch = time.monotonic()
+                    await asyncio.to_thread(self._touch_sync)
+                    await self._drop_silent_workers()
+            except sqlite3.Error:
+                logger.exception("Broker poll failed", extra={"path": str(self.path)})
+            await asyncio.sleep(self.poll_interval)
+
+    async def _drop_silent_workers(self) -> None:
+        """Forget the workers, and their tasks, that stopped refreshing ``touched_at``."""
+        await self._run(
+            "DELETE FROM workers WHERE touched_at < ?", (time.time() - self.worker_timeout,)
+        )
+        await self._run("DELETE FROM tasks WHERE owner NOT IN (SELECT owner FROM workers)")
+
+    def _publish_sync(self, slug: str, payload: str, replay: bool) -> None:
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                seq = None
+                if replay:
+                    self._db.execute(
+                        "INSERT INTO seqs (slug, seq) VALUES (?, 1) "
+                        "ON CONFLICT (slug) DO UPDATE SET seq = seq + 1",
+                        (slug,),
+                    )
+                    seq = self._db.execute(
+                        "SELECT seq FROM seqs WHERE slug = ?", (slug,)
+                    ).fetchone()[0]
+                self._db.execute(
+                    "INSERT INTO messages (slug, seq, payload, created) VALUES (?, ?, ?, ?)",
+                    (slug, seq, payload, time.time()),
+                )
+                self._db.execute("COMMIT")
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+
+    async def publish(self, slug: str, payload: str, replay: bool = True) -> None:
+        await asyncio.to_thread(self._publish_sync, slug, payload, replay)
+
+    async def add_generating_task(self, slug: str, sid: str, task_id: str) -> None:
+        await self._run(
+            "INSERT OR REPLACE INTO tasks (slug, sid, task_id, owner) VALUES (?, ?, ?, ?)",
+            (slug, sid, task_id, self.owner),
+        )
+
+    async def remove_generating_task(self, slug: str, sid: str, task_id: str | None = None) -> None:
+        if task_id is None:
+            await self._run("DELETE FROM tasks WHERE slug = ? AND sid = ?", (slug, sid))
+        else:
+            await self._run(
+                "DELETE FROM tasks WHERE slug = ? AND sid = ? AND task_id = ?",
+                (slug, sid, task_id),
+            )
+
+    async def get_generating_sids(self, slug: str) -> list[str]:
+        rows = await self._run("SELECT sid FROM tasks WHERE slug = ? ORDER BY rowid", (slug,))
+        return [row[0] for row in rows]
@@ -0,0 +1,198 @@
+"""Record-and-replay wrapper for image generation services.
+
+In ``record`` mode every call to the wrapped engine is stored on disk: a request
+fingerprint, the returned images (or error) and the observed latency. In
+``replay`` mode the recordings are served back, optionally with the recorded
+timing, so post-processing and persistence can be measured against
+production-like traffic without network access or spend.
+"""
+
+import asyncio
+import json
+import logging
+import time
+from collections.abc import Awaitable, Callable
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+from app.exceptions import AppError
+from app.services.image_generation_service import ImageGenerationService
+from app.utils import (
+    compute_bytes_hash,
+    compute_content_hash,
+    file_exists,
+    read_bytes,
+    read_file,
+    write_bytes,
+    write_file,
+)
+
+logger = logging.getLogger(__name__)
+
+# Supported cassette modes
+CASSETTE_MODES = ("record", "replay")
+
+
+class CassetteImageService:
+    """Wraps any ImageGenerationService to record or replay its responses."""
+
+    def __init__(
+        self,
+        inner: ImageGenerationService,
+        base_path: str,
+        mode: str = "replay",
+        replay_timing: bool = True,
+    ):
+        if mode not in CASSETTE_MODES:
+            raise ValueError(f"Unknown cassette mode '{mode}', expected record or replay")
+        self.inner = inner
+        self.name = inner.name
+        self.model = inner.model
+        self.image_size = inner.image_size
+        self.base_path = Path(base_path) / inner.name
+        self.mode = mode
+        self.replay_timing = replay_timing
+        self._locks: dict[str, asyncio.Lock] = {}
+        # Replay cursor per fingerprint, cycling through recorded takes
+        self._replay_index: dict[str, int] = {}
+
+    async def generate_style_images(
+        self,
+        prompt: str,
+        count: int = 2,
+        start_index: int = 0,
+    ) -> list[bytes]:
+        """Generate (or replay) candidate style images from a prompt."""
+        request: dict[str, Any] = {
+            "method": "generate_style_images",
+            "prompt": prompt,
+            "count": count,
+        }
+        if start_index:
+            # Only when set, so cassettes recorded before it existed still match
+            request["start_index"] = start_index
+        return await self._play(
+            request,
+            lambda: self.inner.generate_style_images(prompt, count=count, start_index=start_index),
+        )
+
+    async def generate_slide_image(
+        self,
+        content: str,
+        style_image: bytes,
+        style_prompt: str,
+    ) -> bytes:
+        """Generate (or replay) a slide image."""
+        request = {
+            "method": "generate_slide_image",
+            "content": content,
+            "style_image_hash": compute_bytes_hash(style_image),
+            "style_prompt": style_prompt,
+        }
+
+        async def _call() -> list[bytes]:
+            image = await self.inner.generate_slide_image(
+                content=content, style_image=style_image, style_prompt=style_prompt
+            )
+            return [image]
+
+        images = await self._play(request, _call)
+        return images[0]
+
+    def _fingerprint(self, request: dict[str, Any]) -> str:
+        """Hash a request (including the engine configuration) into a fingerprint."""
+        keyed = {"engine": self.name, "model": self.model, "image_size": self.image_size}
+        return compute_content_hash(json.dumps({**keyed, **request}, sort_keys=True))
+
+    def _get_cassette_path(self, fingerprint: str) -> Path:
+        """Get the path to a fingerprint's cassette file."""
+        return self.base_path / f"{fingerprint}.json"
+
+    async def _play(
+        self,
+        request: dict[str, Any],
+        call: Callable[[], Awaitable[list[bytes]]],
+    ) -> list[bytes]:
+        """Record or replay a single engine call."""
+        fingerprint = self._fingerprint(request)
+        if self.mode == "replay":
+            return await self._replay(fingerprint, request)
+        return await self._record(fingerprint, request, call)
+
+    async def _load(self, fingerprint: str) -> dict[str, Any] | None:
+        """Load a cassette file."""
+        path = self._get_cassette_path(fingerprint)
+        if not await file_exists(path):
+            return None
+        cassette: dict[str, Any] = json.loads(await read_file(path))
+        return cassette
+
+    async def _record(
+        self,
+        fingerprint: str,
+        request: dict[str, Any],
+        call: Callable[[], Awaitable[list[bytes]]],
+    ) -> list[bytes]:
+        """Call the wrapped engine and append the outcome to the cassette."""
+        started = time.perf_counter()
+        images: list[bytes] = []
+        error: Exception | None = None
+        try:
+            images = await call()
+        except Exception as e:
+            error = e
+        latency = time.perf_counter() - started
+
+        lock = self._locks.setdefault(fingerprint, asyncio.Lock())
+        async with lock:
+            cassette = await self._load(fingerprint) or {"request": request, "takes": []}
+            take_index = len(cassette["takes"])
+            payloads = []
+            for i, image in enumerate(images):
+                payload = f"{fingerprint}-{take_index}-{i}.jpg"
+                await write_bytes(self.base_path / payload, image)
+                payloads.append(payload)
+            take: dict[str, Any] = {
+                "recorded_at": datetime.now().isoformat(),
+                "latency": round(latency, 4),
+                "payloads": payloads,
+            }
+            if error is not None:
+                take["error"] = {
+                    "code": getattr(error, "code", "GENERATION_FAILED"),
+                    "message": str(error),
+                    "status_code": getattr(error, "status_code", 500),
+                }
+            cassette["takes"].append(take)
+            await write_file(self._get_cassette_path(fingerprint), json.dumps(cassette, indent=2))
+
+        logger.info(
+            "Recorded engine call",
+            extra={"engine": self.name, "fingerprint": fingerprint, "latency": latency},
+        )
+        if error is not None:
+            raise error
+        return images
+
+    async def _replay(self, fingerprint: str, request: dict[str, Any]) -> list[bytes]:
+        """Serve a recorded take for the request, cycling through takes."""
+        cassette = await self._load(fingerprint)
+        if cassette is None or not cassette["takes"]:
+            raise AppError(
+                code="CASSETTE_MISS",
+                message=f"No recorded {self.name} response for {request['method']} "
+                f"(fingerprint {fingerprint})",
+                status_code=502,
+            )
+
+        index = self._replay_index.get(fingerprint, 0)
+        self._replay_index[fingerprint] = index + 1
+        take = cassette["takes"][index % len(cassette["takes"])]
+
+        if self.replay_timing:
+            await asyncio.sleep(take["latency"])
+
+        if "error" in take:
+            raise AppError(**take["error"])
+        return [await read_bytes(self.base_path / payload) for payload in take["payloads"]]
@@ -0,0 +1,89 @@
+"""Per-engine FIFO concurrency limiter.
+
+Optionally bounds the number of in-flight requests to each image engine, so a
+large batch does not flood a provider, and gives every waiting request a queue
+position. Unbounded, it only tracks running requests (for progress and ETAs).
+"""
+
+import asyncio
+import time
+from collections import deque
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+
+
+@dataclass
+class _Lane:
+    """Waiting and running tickets for one engine."""
+
+    waiting: deque[str] = field(default_factory=deque)
+    running: dict[str, float] = field(default_factory=dict)  # ticket -> start time
+    condition: asyncio.Condition = field(default_factory=asyncio.Condition)
+
+
+@dataclass
+class QueueStatus:
+    """Where a ticket is in its engine's queue."""
+
+    engine: str
+    position: int  # 0 = running, n = n-th in line
+    running_seconds: float = 0.0  # Time since the ticket got a slot
+
+
+class EngineQueue:
+    """FIFO slots per engine, with at most ``max_concurrency`` running at once.
+
+    ``max_concurrency`` None (or 0) means no limit.
+    """
+
+    def __init__(self, max_concurrency: int | None = None):
+        self.max_concurrency = max_concurrency if max_concurrency and max_concurrency > 0 else None
+        self._lanes: dict[str, _Lane] = {}
+
+    @asynccontextmanager
+    async def slot(self, engine: str, ticket: str) -> AsyncIterator[None]:
+        """Wait for a slot on an engine, in arrival order."""
+        lane = self._lanes.setdefault(engine, _Lane())
+        lane.waiting.append(ticket)
+        try:
+            async with lane.condition:
+                await lane.condition.wait_for(
+                    lambda: lane.waiting[0] == ticket and self._has_room(lane)
+                )
+                lane.waiting.popleft()
+                lane.running[ticket] = time.monotonic()
+                # The next ticket in line may also fit
+                lane.condition.notify_all()
+        except BaseException:
+            if ticket in lane.waiting:
+                lane.waiting.remove(ticket)
+                async with lane.condition:
+                    lane.condition.notify_all()
+            raise
+
+        try:
+            yield
+        finally:
+            lane.running.pop(ticket, None)
+            async with lane.condition:
+                lane.condition.notify_all()
+
+    def _has_room(self, lane: _Lane) -> bool:
+        return self.max_concurrency is None or len(lane.running) < self.max_concurrency
+
+    def status(self, ticket: str) -> QueueStatus | None:
+        """Get a ticket's queue status, or None if it is not queued or running."""
+        for engine, lane in self._lanes.items():
+            if ticket in lane.running:
+                return QueueStatus(engine, 0, time.monotonic() - lane.running[ticket])
+            if ticket in lane.waiting:
+                return QueueStatus(engine, lane.waiting.index(ticket) + 1)
+        return None
+
+    def load(self, engine: str) -> tuple[int, int]:
+        """Get ``(running, waiting)`` counts for an engine."""
+        lane = self._lanes.get(engine)
+        if lane is None:
+            return 0, 0
+        return len(lane.running), len(lane.waiting)
@@ -0,0 +1,43 @@
+"""In-process publish/subscribe for project change events."""
+
+import logging
+from collections.abc import Awaitable, Callable
+
+from app.models import ProjectEvent
+
+logger = logging.getLogger(__name__)
+
+EventHandler = Callable[[ProjectEvent], Awaitable[None]]
+
+
+class EventBus:
+    """Delivers project change events from services to subscribers.
+
+    Services publish after saving; subscribers (the WebSocket broadcaster)
+    turn events into messages. A failing subscriber is logged and does not
+    affect the publisher or the other subscribers.
+    """
+
+    def __init__(self) -> None:
+        self._handlers: list[EventHandler] = []
+
+    def subscribe(self, handler: EventHandler) -> None:
+        """Call ``handler`` for every published event."""
+        if handler not in self._handlers:
+            self._handlers.append(handler)
+
+    def unsubscribe(self, handler: EventHandler) -> None:
+        """Stop calling ``handler``."""
+        if handler in self._handlers:
+            self._handlers.remove(handler)
+
+    async def publish(self, event: ProjectEvent) -> None:
+        """Deliver an event to every subscriber, in subscription order."""
+        for handler in list(self._handlers):
+            try:
+                await handler(event)
+            except Exception:
+                logger.exception(
+                    "Event handler failed",
+                    extra={"slug": event.slug, "event_type": event.type},
+                )
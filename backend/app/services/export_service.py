@@ -1,76 +1,300 @@
-"""Export service for generating ZIP archives of project slides."""
+"""Export service for generating ZIP archives, PDFs and PPTX decks of project slides."""
 
-import io
+import asyncio
+import json
 import logging
-import zipfile
+import time
+from collections.abc import AsyncGenerator, AsyncIterator, Awaitable, Callable
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Literal
 
-from app.repositories import ImageRepository, SlidesRepository
-from app.utils import is_safe_name
+from app.models import ExportDownload, Project
+from app.repositories import (
+    CacheRepository,
+    DownloadRepository,
+    ImageRepository,
+    SlidesRepository,
+)
+from app.utils import (
+    PdfStream,
+    PptxStream,
+    ZipStream,
+    compute_content_hash,
+    is_safe_name,
+    prefetch_ordered,
+)
 
 logger = logging.getLogger(__name__)
 
+ExportFormat = Literal["zip", "pdf", "pptx"]
+
+EXPORT_MEDIA_TYPES: dict[ExportFormat, str] = {
+    "zip": "application/zip",
+    "pdf": "application/pdf",
+    "pptx": "application/vnd.openxmlformats-officedocument.presentationml.presentation",
+}
+
+# Bump when a writer's output changes, so previously cached exports are rebuilt
+EXPORT_FORMAT_VERSION = 1
+
+# Called with (images written, total images) as an export is built
+ExportProgressCallback = Callable[[int, int], Awaitable[None]]
+
+
+@dataclass
+class ExportArtifact:
+    """An export of a deck: either a cached file or a stream being built."""
+
+    etag: str  # Manifest hash; identical for any deck with the same exported content
+    media_type: str
+    filename: str
+    path: Path | None = None  # Cached file, on a cache hit
+    chunks: AsyncGenerator[bytes, None] | None = None  # Streamed build, on a miss
+
 
 class ExportService:
-    """Service for exporting project slides as ZIP with numbered JPG images."""
+    """Service for exporting project slides as ZIP (numbered JPG images), PDF or PPTX."""
 
     def __init__(
         self,
         slides_repository: SlidesRepository,
         image_repository: ImageRepository,
+        prefetch_depth: int = 8,
+        export_cache: CacheRepository | None = None,
+        download_repository: DownloadRepository | None = None,
     ):
         self.slides_repository = slides_repository
         self.image_repository = image_repository
+        self.prefetch_depth = prefetch_depth
+        self.export_cache = export_cache
+        self.download_repository = download_repository
+
+    async def _get_exportable_project(self, slug: str) -> Project:
+        """Validate the slug and load the project to export."""
+        from app.exceptions import InvalidRequestError, ProjectNotFoundError
+
+        if not is_safe_name(slug):
+            raise InvalidRequestError(f"Invalid project slug: {slug}")
+
+        project = await self.slides_repository.get_project(slug)
+        if project is None:
+            raise ProjectNotFoundError(slug)
+        return project
 
-    async def export_zip(self, slug: str) -> bytes:
-        """Export project slides as a ZIP archive with numbered JPG images.
+    async def export(
+        self,
+        slug: str,
+        export_format: ExportFormat,
+        on_progress: ExportProgressCallback | None = None,
+    ) -> ExportArtifact:
+        """Export a deck in any format, reusing a cached build when nothing changed.
 
-        Each slide's selected image (or latest image) is included.
-        Images are named 01.jpg, 02.jpg, 03.jpg, etc.
-        Slides without images are skipped.
+        Exports are cached under the deck's manifest hash (see ``manifest_hash``).
+        On a hit the cached file is returned as-is; on a miss the export is
+        streamed as usual and written to the cache alongside, to be committed
+        once the stream completes.
 
         Args:
             slug: Project slug
+            export_format: "zip", "pdf" or "pptx"
+            on_progress: Called as each image is added to a streamed build
 
         Returns:
-            ZIP file bytes
+            The export, with the manifest hash as its ETag
         """
-        from app.exceptions import InvalidRequestError, ProjectNotFoundError
+        project = await self._get_exportable_project(slug)
+        key = self.manifest_hash(project, export_format)
+        artifact = ExportArtifact(
+            etag=key,
+            media_type=EXPORT_MEDIA_TYPES[export_format],
+            filename=f"{slug}.{export_format}",
+        )
 
-        if not is_safe_name(slug):
-            raise InvalidRequestError(f"Invalid project slug: {slug}")
+        if self.export_cache is not None:
+            artifact.path = await self.export_cache.get_path(key)
+            if artifact.path is not None:
+                logger.info(
+                    "Export served from cache",
+                    extra={"slug": slug, "format": export_format, "key": key},
+                )
+                return artifact
 
-        project = await self.slides_repository.get_project(slug)
-        if project is None:
-            raise ProjectNotFoundError(slug)
+        builders = {"zip": self._stream_zip, "pdf": self._stream_pdf, "pptx": self._stream_pptx}
+        chunks = builders[export_format](project, on_progress)
+        if self.export_cache is not None:
+            artifact.chunks = self.export_cache.put_stream(key, chunks)
+        else:
+            artifact.chunks = chunks
+        return artifact
+
+    def manifest_hash(self, project: Project, export_format: ExportFormat) -> str:
+        """Hash everything an export's content depends on.
+
+        That is the format, slide order and selected images (their data hash
+        too, since a regenerated image keeps its filename); PPTX decks also
+        carry each slide's text in the notes.
+        """
+        slides = []
+        for slide in project.slides:
+            selected = slide.get_selected_image()
+            if selected is None:
+                continue
+            entry = [slide.sid, selected.hash, selected.data_hash]
+            if export_format == "pptx":
+                entry.append(slide.content)
+            slides.append(entry)
+        manifest = {"format": export_format, "version": EXPORT_FORMAT_VERSION, "slides": slides}
+        return compute_content_hash(json.dumps(manifest, ensure_ascii=False))
+
+    async def save_download(self, slug: str, artifact: ExportArtifact) -> ExportDownload:
+        """Write an export out as a download, building it if it was not cached.
+
+        Args:
+            slug: Project slug
+            artifact: Export from ``export``
+
+        Returns:
+            The download, fetchable by token until it expires
+        """
+        from app.exceptions import InvalidRequestError
+
+        if self.download_repository is None:
+            raise InvalidRequestError("Export downloads are not configured")
+        source = artifact.path if artifact.path is not None else artifact.chunks
+        if source is None:
+            raise InvalidRequestError("Export has no content")
+        download = await self.download_repository.create(
+            slug, artifact.filename, artifact.media_type, source
+        )
+        logger.info(
+            "Export download ready",
+            extra={"slug": slug, "token": download.token, "bytes": download.size},
+        )
+        return download
+
+    async def get_download(self, slug: str, token: str) -> tuple[ExportDownload, Path]:
+        """Get an unexpired download of a project and the path of its file."""
+        from app.exceptions import ExportNotFoundError
+
+        found = None
+        if self.download_repository is not None:
+            found = await self.download_repository.get(token)
+        if found is None or found[0].slug != slug:
+            raise ExportNotFoundError(token)
+        return found
+
+    def _selected_images(self, project: Project) -> list[tuple[str, str]]:
+        """Get ``(sid, image_hash)`` of each slide's selected image, in slide order."""
+        selected_images = []
+        for slide in project.slides:
+            # Get the selected image (falls back to latest)
+            selected = slide.get_selected_image()
+            if selected is not None:
+                selected_images.append((slide.sid, selected.hash))
+        return selected_images
+
+    async def _prefetch_images(
+        self, project: Project, on_progress: ExportProgressCallback | None = None
+    ) -> AsyncIterator[tuple[str, bytes]]:
+        """Read the selected images with bounded read-ahead, in slide order.
+
+        Yields ``(sid, image_data)``; images missing on disk are skipped.
+        ``on_progress`` is called after each image has been consumed.
+        """
+        slug = project.slug
+        selected_images = self._selected_images(project)
 
-        buffer = io.BytesIO()
-        with zipfile.ZipFile(buffer, "w", zipfile.ZIP_STORED) as zf:
-            index = 1
-            for slide in project.slides:
-                # Get the selected image (falls back to latest)
-                selected = slide.get_selected_image()
-                if selected is None:
-                    continue
-
-                # Read image data from disk
-                image_data = await self.image_repository.get_image(
-                    slug, slide.sid, selected.hash
+        async def _read(item: tuple[str, str]) -> bytes | None:
+            sid, image_hash = item
+            return await self.image_repository.get_image(slug, sid, image_hash)
+
+        done = 0
+        async for (sid, image_hash), image_data in prefetch_ordered(
+            selected_images, _read, self.prefetch_depth
+        ):
+            if image_data is None:
+                logger.warning(
+                    "Image file not found on disk",
+                    extra={"slug": slug, "sid": sid, "hash": image_hash},
                 )
-                if image_data is None:
-                    logger.warning(
-                        "Image file not found on disk",
-                        extra={"slug": slug, "sid": slide.sid, "hash": selected.hash},
-                    )
-                    continue
-
-                # Write to ZIP with numbered filename
-                filename = f"{index:02d}.jpg"
-                zf.writestr(filename, image_data)
-                index += 1
+            else:
+                yield sid, image_data
+            done += 1
+            if on_progress is not None:
+                await on_progress(done, len(selected_images))
 
+    @staticmethod
+    def _log_export(kind: str, slug: str, image_count: int, size: int, started: float) -> None:
+        """Log an export with its throughput."""
+        elapsed = time.perf_counter() - started
         logger.info(
-            "Exported project as ZIP",
-            extra={"slug": slug, "image_count": index - 1},
+            f"Exported project as {kind}",
+            extra={
+                "slug": slug,
+                "image_count": image_count,
+                "bytes": size,
+                "seconds": round(elapsed, 3),
+                "mb_per_second": round(size / (1024 * 1024) / elapsed, 2) if elapsed else None,
+            },
         )
 
-        return buffer.getvalue()
+    async def _stream_zip(
+        self, project: Project, on_progress: ExportProgressCallback | None = None
+    ) -> AsyncGenerator[bytes, None]:
+        """Yield the ZIP archive for a project as images are read from disk.
+
+        Images are named 01.jpg, 02.jpg, ... in slide order; slides without
+        images are skipped.
+        """
+        started = time.perf_counter()
+        zs = ZipStream()
+        index = 1
+        async for _, image_data in self._prefetch_images(project, on_progress):
+            # Write to ZIP with numbered filename
+            yield zs.add(f"{index:02d}.jpg", image_data)
+            index += 1
+
+        yield zs.finish()
+
+        self._log_export("ZIP", project.slug, index - 1, zs.bytes_written, started)
+
+    async def _stream_pdf(
+        self, project: Project, on_progress: ExportProgressCallback | None = None
+    ) -> AsyncGenerator[bytes, None]:
+        """Yield the PDF for a project, one page per image as images are read.
+
+        JPEGs are embedded as-is (DCTDecode passthrough), never re-encoded.
+        """
+        started = time.perf_counter()
+        ps = PdfStream()
+        yield ps.start()
+        page_count = 0
+        async for _, image_data in self._prefetch_images(project, on_progress):
+            # Parsing the JPEG header is cheap; run it off the event loop anyway
+            # since a non-JPEG image has to be re-encoded
+            yield await asyncio.to_thread(ps.add_page, image_data)
+            page_count += 1
+
+        yield ps.finish()
+
+        self._log_export("PDF", project.slug, page_count, ps.bytes_written, started)
+
+    async def _stream_pptx(
+        self, project: Project, on_progress: ExportProgressCallback | None = None
+    ) -> AsyncGenerator[bytes, None]:
+        """Yield the PPTX deck for a project, one slide per image as images are read.
+
+        Each slide's content goes into the speaker notes of its picture slide.
+        """
+        started = time.perf_counter()
+        notes = {slide.sid: slide.content for slide in project.slides}
+        ps = PptxStream()
+        slide_count = 0
+        async for sid, image_data in self._prefetch_images(project, on_progress):
+            yield ps.add_slide(image_data, notes=notes[sid])
+            slide_count += 1
+
+        yield ps.finish()
+
+        self._log_export("PPTX", project.slug, slide_count, ps.bytes_written, started)
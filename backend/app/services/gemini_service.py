@@ -26,6 +26,10 @@ API_TIMEOUT = 60
 class GeminiService:
     """Service for interacting with Google Gemini API."""
 
+    name = "gemini"
+    model = IMAGE_MODEL
+    image_size = "auto"  # Output size is chosen by the model
+
     def __init__(self, api_key: str):
         self.api_key = api_key
 
@@ -55,12 +59,14 @@ class GeminiService:
         self,
         prompt: str,
         count: int = 2,
+        start_index: int = 0,
     ) -> list[bytes]:
         """Generate candidate style images from a prompt.
 
         Args:
             prompt: Style description prompt
             count: Number of images to generate (default 2)
+            start_index: Index of the first candidate (unused; every call is sampled anew)
 
         Returns:
             List of image bytes in JPEG format
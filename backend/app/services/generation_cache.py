@@ -0,0 +1,68 @@
+"""Content-addressed cache of generated images, shared across projects."""
+
+import json
+import logging
+
+from app.repositories import CacheRepository
+from app.services.image_generation_service import ImageGenerationService
+from app.utils import compute_content_hash
+
+logger = logging.getLogger(__name__)
+
+
+class GenerationCache:
+    """Cache of engine outputs keyed by a hash of the full generation request.
+
+    The key covers everything that determines the output: engine, model, image
+    size, prompt text and the style reference image hash. Identical requests from
+    any project (or from a deleted slide) are then served from disk.
+    """
+
+    def __init__(self, repository: CacheRepository):
+        self.repository = repository
+
+    @staticmethod
+    def _request_key(engine: ImageGenerationService, kind: str, **params: str | int) -> str:
+        """Hash a generation request into a cache key."""
+        request = {
+            "kind": kind,
+            "engine": engine.name,
+            "model": engine.model,
+            "image_size": engine.image_size,
+            **params,
+        }
+        return compute_content_hash(json.dumps(request, sort_keys=True, ensure_ascii=False))
+
+    def slide_key(
+        self,
+        engine: ImageGenerationService,
+        content: str,
+        style_image_hash: str,
+        style_prompt: str,
+    ) -> str:
+        """Get the cache key for a slide image request."""
+        return self._request_key(
+            engine,
+            "slide",
+            content=content,
+            style_image_hash=style_image_hash,
+            style_prompt=style_prompt,
+        )
+
+    def style_key(self, engine: ImageGenerationService, prompt: str, index: int) -> str:
+        """Get the cache key for the index-th candidate of a style request."""
+        return self._request_key(engine, "style", prompt=prompt, index=index)
+
+    async def get(self, key: str) -> bytes | None:
+        """Get a cached image, or None on a miss."""
+        data = await self.repository.get(key)
+        if data is not None:
+            logger.info("Generation cache hit", extra={"key": key})
+        return data
+
+    async def put(self, key: str, image_data: bytes) -> None:
+        """Store a generated image. Cache failures never fail the generation."""
+        try:
+            await self.repository.put(key, image_data)
+        except OSError as e:
+            logger.warning("Failed to write generation cache", extra={"key": key, "error": str(e)})
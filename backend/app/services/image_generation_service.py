@@ -10,16 +10,24 @@ class ImageGenerationService(Protocol):
     GeminiService, VolcEngineService, and NanoBananaService implement this protocol.
     """
 
+    name: str  # Engine identifier, e.g. "gemini" | "volcengine" | "nano_banana"
+    model: str  # Model used for generation
+    image_size: str  # Output size setting, e.g. "2K" or "2560x1440"
+
     async def generate_style_images(
         self,
         prompt: str,
         count: int = 2,
+        start_index: int = 0,
     ) -> list[bytes]:
         """Generate candidate style images from a prompt.
 
         Args:
             prompt: Style description prompt
             count: Number of images to generate (default 2)
+            start_index: Index of the first candidate in the set being generated, so
+                deterministic engines (mock, cassettes) vary candidates generated
+                one at a time
 
         Returns:
             List of image bytes in JPEG format
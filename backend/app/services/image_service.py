@@ -1,19 +1,35 @@
 """Image generation service."""
 
+import asyncio
+import contextlib
 import io
 import logging
+import math
+import time
+import uuid
+from contextlib import AbstractAsyncContextManager
 from datetime import datetime
 
 from PIL import Image
 
-from app.exceptions import ImageNotFoundError, SlideNotFoundError, StyleNotSetError
+from app.exceptions import (
+    ImageNotFoundError,
+    ProjectNotFoundError,
+    SlideNotFoundError,
+    StyleNotSetError,
+)
 from app.models import Project, SlideImage
 from app.repositories import ImageRepository, SlidesRepository, StyleRepository
-from app.services.gemini_service import GeminiService
+from app.services.engine_queue import EngineQueue
+from app.services.generation_cache import GenerationCache
 from app.services.image_generation_service import ImageGenerationService
-from app.services.nano_banana_service import NanoBananaService
-from app.services.volcengine_service import VolcEngineService
-from app.utils import compute_content_hash
+from app.services.latency_stats import (
+    DEFAULT_LATENCY_SECONDS,
+    DeckEstimate,
+    GenerationEstimate,
+    LatencyStats,
+)
+from app.utils import compute_bytes_hash, compute_content_hash
 
 logger = logging.getLogger(__name__)
 
@@ -26,9 +42,13 @@ class ImageService:
         slides_repository: SlidesRepository,
         style_repository: StyleRepository,
         image_repository: ImageRepository,
-        gemini_service: GeminiService,
-        volcengine_service: VolcEngineService,
-        nano_banana_service: NanoBananaService,
+        gemini_service: ImageGenerationService,
+        volcengine_service: ImageGenerationService,
+        nano_banana_service: ImageGenerationService,
+        mock_service: ImageGenerationService | None = None,
+        generation_cache: GenerationCache | None = None,
+        latency_stats: LatencyStats | None = None,
+        engine_queue: EngineQueue | None = None,
     ):
         self.slides_repository = slides_repository
         self.style_repository = style_repository
@@ -36,15 +56,143 @@ class ImageService:
         self.gemini_service = gemini_service
         self.volcengine_service = volcengine_service
         self.nano_banana_service = nano_banana_service
+        self.mock_service = mock_service
+        self.generation_cache = generation_cache
+        self.latency_stats = latency_stats
+        self.engine_queue = engine_queue
 
     def _get_engine(self, project: Project) -> ImageGenerationService:
         """Select image generation engine based on project configuration."""
-        if project.image_engine == "gemini":
+        return self._get_engine_by_name(project.image_engine)
+
+    def _get_engine_by_name(self, engine: str) -> ImageGenerationService:
+        """Select image generation engine by name."""
+        if engine == "gemini":
             return self.gemini_service
-        if project.image_engine == "nano_banana":
+        if engine == "nano_banana":
             return self.nano_banana_service
+        if engine == "mock" and self.mock_service is not None:
+            return self.mock_service
         return self.volcengine_service  # Default to VolcEngine
 
+    def _get_project_engines(self, project: Project) -> list[ImageGenerationService]:
+        """Get the engines a project may generate with: primary, then hedge engine."""
+        engines = [self._get_engine(project)]
+        if project.hedge_engine and project.hedge_engine != engines[0].name:
+            engines.append(self._get_engine_by_name(project.hedge_engine))
+        return engines
+
+    async def _generate_with_hedge(
+        self,
+        project: Project,
+        content: str,
+        style_image: bytes,
+        style_prompt: str,
+        ticket: str | None = None,
+    ) -> tuple[bytes, str, float]:
+        """Generate a slide image, hedging to a secondary engine if configured.
+
+        If the project has a hedge engine and the primary engine has not answered
+        (or has failed) within ``hedge_after_seconds``, the same request is sent to
+        the hedge engine and whichever returns first wins. The loser is cancelled.
+        The caller holds the primary engine's slot; the hedged request waits for
+        a slot on the hedge engine (as ``<ticket>:hedge``) like any other request.
+
+        Returns:
+            Tuple of (image bytes, name of the engine that produced them, seconds
+            that engine took, from its own request rather than the hedge wait)
+        """
+        primary = self._get_engine(project)
+        started: dict[asyncio.Task[bytes], float] = {}
+
+        def _start(engine: ImageGenerationService) -> asyncio.Task[bytes]:
+            task = asyncio.create_task(
+                engine.generate_slide_image(
+                    content=content,
+                    style_image=style_image,
+                    style_prompt=style_prompt,
+                )
+            )
+            started[task] = time.perf_counter()
+            return task
+
+        def _start_hedge(engine: ImageGenerationService) -> asyncio.Task[bytes]:
+            async def _run() -> bytes:
+                hedge_ticket = f"{ticket}:hedge" if ticket else str(uuid.uuid4())
+                async with self._engine_slot(engine.name, hedge_ticket):
+                    # Timed from the slot, like requests timed by generate_image
+                    started[task] = time.perf_counter()
+                    return await engine.generate_slide_image(
+                        content=content,
+                        style_image=style_image,
+                        style_prompt=style_prompt,
+                    )
+
+            task = asyncio.create_task(_run())
+            return task
+
+        def _elapsed(task: asyncio.Task[bytes]) -> float:
+            return time.perf_counter() - started[task]
+
+        if not project.hedge_engine or project.hedge_engine == primary.name:
+            begin = time.perf_counter()
+            image_data = await primary.generate_slide_image(
+                content=content,
+                style_image=style_image,
+                style_prompt=style_prompt,
+            )
+            return image_data, primary.name, time.perf_counter() - begin
+
+        secondary = self._get_engine_by_name(project.hedge_engine)
+        engines: dict[asyncio.Task[bytes], str] = {}
+        primary_task = _start(primary)
+        engines[primary_task] = primary.name
+
+        try:
+            await asyncio.wait({primary_task}, timeout=project.hedge_after_seconds)
+            if primary_task.done() and primary_task.exception() is None:
+                return primary_task.result(), primary.name, _elapsed(primary_task)
+
+            # Primary is slow or failed: fire the hedged request
+            logger.info(
+                f"Hedging image generation to {secondary.name}",
+                extra={
+                    "slug": project.slug,
+                    "primary": primary.name,
+                    "secondary": secondary.name,
+                    "primary_failed": primary_task.done(),
+                },
+            )
+            engines[_start_hedge(secondary)] = secondary.name
+
+            pending = {task for task in engines if not task.done()}
+            last_error = primary_task.exception() if primary_task.done() else None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    error = task.exception()
+                    if error is None:
+                        return task.result(), engines[task], _elapsed(task)
+                    last_error = error
+                    logger.warning(
+                        f"Hedged generation attempt on {engines[task]} failed",
+                        extra={"slug": project.slug, "error": str(error)},
+                    )
+
+            assert last_error is not None
+            raise last_error
+        finally:
+            # Cancel whichever request lost the race (or all, if we were cancelled)
+            for task in engines:
+                if not task.done():
+                    task.cancel()
+
+    def _engine_slot(self, engine: str, ticket: str) -> AbstractAsyncContextManager[None]:
+        """Wait for a slot on the engine's queue (no-op without a queue)."""
+        if self.engine_queue is None:
+            return contextlib.nullcontext()
+        return self.engine_queue.slot(engine, ticket)
+
     async def get_images(self, slug: str, sid: str) -> list[SlideImage]:
         """Get all images for a slide."""
         project = await self.slides_repository.get_or_create_project(slug)
@@ -55,13 +203,17 @@ class ImageService:
 
         return slide.images
 
-    async def generate_image(self, slug: str, sid: str, force: bool = False) -> SlideImage:
+    async def generate_image(
+        self, slug: str, sid: str, force: bool = False, task_id: str | None = None
+    ) -> SlideImage:
         """Generate an image for a slide.
 
         Args:
             slug: Project slug
             sid: Slide ID
-            force: Force regeneration even if matching image exists
+            force: Force regeneration even if a matching image exists in the slide
+                or in the generation cache
+            task_id: Ticket for the engine queue, used to look up progress
 
         Returns:
             The generated SlideImage
@@ -91,19 +243,50 @@ class ImageService:
         if style_image is None:
             raise StyleNotSetError()
 
-        # Select image generation engine based on project configuration
-        engine = self._get_engine(project)
-
-        # Generate new image (this is the slow part)
-        logger.info(
-            f"Generating image using {project.image_engine}",
-            extra={"slug": slug, "sid": sid, "engine": project.image_engine},
-        )
-        image_data = await engine.generate_slide_image(
-            content=slide.content,
-            style_image=style_image,
-            style_prompt=project.style.prompt,
-        )
+        # Identical requests (from any project) are served from the generation cache
+        image_data: bytes | None = None
+        engine_name = project.image_engine
+        cache_keys: dict[str, str] = {}
+        if self.generation_cache is not None:
+            style_image_hash = compute_bytes_hash(style_image)
+            for engine in self._get_project_engines(project):
+                cache_keys[engine.name] = self.generation_cache.slide_key(
+                    engine, slide.content, style_image_hash, project.style.prompt
+                )
+            if not force:
+                for name, key in cache_keys.items():
+                    image_data = await self.generation_cache.get(key)
+                    if image_data is not None:
+                        engine_name = name
+                        break
+        from_cache = image_data is not None
+
+        if image_data is None:
+            # Generate new image (this is the slow part); the engine is selected from
+            # the project configuration, with an optional hedge to a secondary engine
+            logger.info(
+                f"Generating image using {project.image_engine}",
+                extra={
+                    "slug": slug,
+                    "sid": sid,
+                    "engine": project.image_engine,
+                    "hedge_engine": project.hedge_engine,
+                },
+            )
+            ticket = task_id or str(uuid.uuid4())
+            async with self._engine_slot(project.image_engine, ticket):
+                image_data, engine_name, elapsed = await self._generate_with_hedge(
+                    project,
+                    content=slide.content,
+                    style_image=style_image,
+                    style_prompt=project.style.prompt,
+                    ticket=ticket,
+                )
+            if self.latency_stats is not None:
+                winner = self._get_engine_by_name(engine_name)
+                await self.latency_stats.record(winner.name, winner.image_size, elapsed)
+            if self.generation_cache is not None and engine_name in cache_keys:
+                await self.generation_cache.put(cache_keys[engine_name], image_data)
 
         # Create thumbnail
         thumbnail_data = self._create_thumbnail(image_data)
@@ -117,6 +300,8 @@ class ImageService:
             hash=content_hash,
             path=path,
             created_at=datetime.now(),
+            engine=engine_name,
+            data_hash=compute_bytes_hash(image_data),
         )
 
         # Re-read project data and update atomically to avoid race conditions
@@ -124,33 +309,124 @@ class ImageService:
         updated_project = await self.slides_repository.get_or_create_project(slug)
         updated_slide = updated_project.get_slide(sid)
         if updated_slide is not None:
-            # Check if image already exists (another request might have added it)
-            if not any(img.hash == content_hash for img in updated_slide.images):
-                updated_slide.images.append(slide_image)
-            # Auto-select the newly generated image
-            updated_slide.selected_image_hash = content_hash
-            updated_project.cost.slide_generations += 1
-            updated_project.cost.total_images += 1
-            updated_project.cost.estimated_cost = (
-                updated_project.cost.style_generations * 0.02
-                + updated_project.cost.slide_generations * 0.02
-            )
+            # A regeneration overwrites the file under the same content hash, so
+            # replace its record (and data hash) rather than adding a duplicate;
+            # it moves to the end to keep the history in creation order
+            updated_slide.images = [img for img in updated_slide.images if img.hash != content_hash]
+            updated_slide.images.append(slide_image)
+            # Auto-select the newly generated image, unless the slide was edited
+            # meanwhile and the image no longer matches its content
+            if compute_content_hash(updated_slide.content) == content_hash:
+                updated_slide.selected_image_hash = content_hash
+            # Cache hits did not call an engine, so they cost nothing
+            if not from_cache:
+                updated_project.cost.slide_generations += 1
+                updated_project.cost.total_images += 1
+                updated_project.cost.estimated_cost = (
+                    updated_project.cost.style_generations * 0.02
+                    + updated_project.cost.slide_generations * 0.02
+                )
             updated_project.updated_at = datetime.now()
             await self.slides_repository.save_project(updated_project)
 
         return slide_image
 
+    async def estimate_task(self, task_id: str) -> GenerationEstimate | None:
+        """Estimate the remaining time of a queued or running generation.
+
+        Returns None if the task is not waiting on or running against an engine.
+        """
+        if self.engine_queue is None or self.latency_stats is None:
+            return None
+        status = self.engine_queue.status(task_id)
+        if status is None:
+            return None
+
+        engine = self._get_engine_by_name(status.engine)
+        histogram = await self.latency_stats.get(engine.name, engine.image_size)
+        p50 = histogram.quantile(0.5)
+        if status.position == 0:
+            # Running: expect the median, then fall back to slower quantiles once exceeded
+            elapsed = status.running_seconds
+            expected = next(
+                (v for v in (p50, histogram.quantile(0.9), histogram.maximum) if v > elapsed),
+                elapsed * 1.5,
+            )
+            remaining = expected - elapsed
+        else:
+            # Queued: wait for the generations ahead to drain in waves, then run
+            elapsed = 0.0
+            # Only a bounded queue has anyone waiting
+            waves = math.ceil(status.position / (self.engine_queue.max_concurrency or 1))
+            remaining = (waves + 1) * p50
+
+        return GenerationEstimate(
+            engine=engine.name,
+            image_size=engine.image_size,
+            queue_position=status.position,
+            elapsed_seconds=elapsed,
+            remaining_seconds=remaining,
+            samples=histogram.samples,
+        )
+
+    async def estimate_stale_slides(self, slug: str) -> DeckEstimate:
+        """Estimate how long generating every stale slide of a deck would take.
+
+        A slide is stale if none of its images matches its current content.
+        """
+        project = await self.slides_repository.get_project(slug)
+        if project is None:
+            raise ProjectNotFoundError(slug)
+
+        stale_sids = [
+            slide.sid
+            for slide in project.slides
+            if not any(img.hash == compute_content_hash(slide.content) for img in slide.images)
+        ]
+
+        engine = self._get_engine(project)
+        histogram = (
+            await self.latency_stats.get(engine.name, engine.image_size)
+            if self.latency_stats is not None
+            else None
+        )
+        p50 = histogram.quantile(0.5) if histogram else DEFAULT_LATENCY_SECONDS
+        p90 = histogram.quantile(0.9) if histogram else DEFAULT_LATENCY_SECONDS
+
+        # Stale slides queue behind whatever is already running or waiting
+        queued_ahead = 0
+        concurrency = max(len(stale_sids), 1)
+        if self.engine_queue is not None:
+            running, waiting = self.engine_queue.load(engine.name)
+            queued_ahead = running + waiting
+            concurrency = self.engine_queue.max_concurrency or max(
+                queued_ahead + len(stale_sids), 1
+            )
+        waves = math.ceil((queued_ahead + len(stale_sids)) / concurrency) if stale_sids else 0
+
+        return DeckEstimate(
+            engine=engine.name,
+            image_size=engine.image_size,
+            stale_sids=stale_sids,
+            per_slide_p50=p50,
+            per_slide_p90=p90,
+            queued_ahead=queued_ahead,
+            estimated_seconds=waves * p50,
+            estimated_seconds_p90=waves * p90,
+            samples=histogram.samples if histogram else 0,
+        )
+
     def get_content_hash(self, content: str) -> str:
         """Get the hash of slide content."""
         return compute_content_hash(content)
 
-    def get_image_url(self, slug: str, sid: str, hash: str) -> str:
+    def get_image_url(self, slug: str, sid: str, hash: str, version: str | None = None) -> str:
         """Get the URL for an image."""
-        return self.image_repository.get_image_url(slug, sid, hash)
+        return self.image_repository.get_image_url(slug, sid, hash, version)
 
-    def get_thumbnail_url(self, slug: str, sid: str, hash: str) -> str:
+    def get_thumbnail_url(self, slug: str, sid: str, hash: str, version: str | None = None) -> str:
         """Get the URL for a thumbnail."""
-        return self.image_repository.get_thumbnail_url(slug, sid, hash)
+        return self.image_repository.get_thumbnail_url(slug, sid, hash, version)
 
     def _create_thumbnail(self, image_data: bytes, size: tuple[int, int] = (320, 180)) -> bytes:
         """Create a thumbnail from image data."""
@@ -0,0 +1,157 @@
+"""Latency histograms for image generation engines.
+
+Completed generations are bucketed per ``(engine, image_size)`` so progress
+events and batch estimates can be based on how long an engine actually takes,
+rather than a fixed guess.
+"""
+
+import asyncio
+import json
+import logging
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from app.utils import file_exists, read_file, write_file
+
+logger = logging.getLogger(__name__)
+
+# Histogram bucket upper bounds in seconds (the last bucket is open-ended)
+LATENCY_BUCKETS = (1, 2, 5, 10, 15, 20, 30, 45, 60, 90, 120, 180, 300, 600)
+
+# Assumed latency when an engine has no recorded samples yet
+DEFAULT_LATENCY_SECONDS = 30.0
+
+
+@dataclass
+class LatencyHistogram:
+    """Bucketed latency samples for one engine and image size."""
+
+    counts: list[int] = field(default_factory=lambda: [0] * (len(LATENCY_BUCKETS) + 1))
+    total: float = 0.0
+    maximum: float = 0.0
+
+    @property
+    def samples(self) -> int:
+        """Number of recorded samples."""
+        return sum(self.counts)
+
+    def record(self, seconds: float) -> None:
+        """Add a sample."""
+        index = next(
+            (i for i, bound in enumerate(LATENCY_BUCKETS) if seconds <= bound),
+            len(LATENCY_BUCKETS),
+        )
+        self.counts[index] += 1
+        self.total += seconds
+        self.maximum = max(self.maximum, seconds)
+
+    def quantile(self, q: float) -> float:
+        """Estimate a quantile by interpolating within its bucket."""
+        samples = self.samples
+        if samples == 0:
+            return DEFAULT_LATENCY_SECONDS
+        target = q * samples
+        seen = 0
+        for index, count in enumerate(self.counts):
+            if count and seen + count >= target:
+                lower = LATENCY_BUCKETS[index - 1] if index > 0 else 0.0
+                upper = LATENCY_BUCKETS[index] if index < len(LATENCY_BUCKETS) else self.maximum
+                return min(lower + (upper - lower) * (target - seen) / count, self.maximum)
+            seen += count
+        return self.maximum
+
+    @property
+    def mean(self) -> float:
+        """Mean latency."""
+        samples = self.samples
+        return self.total / samples if samples else DEFAULT_LATENCY_SECONDS
+
+
+class LatencyStats:
+    """Per-engine, per-image-size latency histograms, optionally persisted to disk."""
+
+    def __init__(self, path: str | None = None):
+        self.path = Path(path) if path else None
+        self._histograms: dict[str, LatencyHistogram] = {}
+        self._loaded = self.path is None
+        self._lock = asyncio.Lock()
+
+    @staticmethod
+    def _key(engine: str, image_size: str) -> str:
+        return f"{engine}/{image_size}"
+
+    async def _load(self) -> None:
+        """Load persisted histograms on first use."""
+        if self._loaded:
+            return
+        self._loaded = True
+        if self.path is None or not await file_exists(self.path):
+            return
+        try:
+            data = json.loads(await read_file(self.path))
+            for key, value in data.items():
+                histogram = LatencyHistogram(
+                    total=value["total"],
+                    maximum=value["maximum"],
+                )
+                # Tolerate bucket layout changes by dropping mismatched histograms
+                if len(value["counts"]) == len(histogram.counts):
+                    histogram.counts = value["counts"]
+                    self._histograms[key] = histogram
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"Failed to load latency stats: {e}")
+
+    async def record(self, engine: str, image_size: str, seconds: float) -> None:
+        """Record the latency of a completed generation."""
+        async with self._lock:
+            await self._load()
+            key = self._key(engine, image_size)
+            self._histograms.setdefault(key, LatencyHistogram()).record(seconds)
+            if self.path is not None:
+                data = {
+                    key: {"counts": h.counts, "total": h.total, "maximum": h.maximum}
+                    for key, h in self._histograms.items()
+                }
+                try:
+                    await write_file(self.path, json.dumps(data))
+                except OSError as e:
+                    logger.warning(f"Failed to save latency stats: {e}")
+
+    async def get(self, engine: str, image_size: str) -> LatencyHistogram:
+        """Get the histogram for an engine and image size (empty if unknown)."""
+        async with self._lock:
+            await self._load()
+        return self._histograms.get(self._key(engine, image_size), LatencyHistogram())
+
+    async def snapshot(self) -> dict[str, LatencyHistogram]:
+        """Get all histograms keyed by ``engine/image_size``."""
+        async with self._lock:
+            await self._load()
+        return dict(self._histograms)
+
+
+@dataclass
+class GenerationEstimate:
+    """Progress estimate for one in-flight generation."""
+
+    engine: str
+    image_size: str
+    queue_position: int  # 0 = running, n = n-th in line
+    elapsed_seconds: float  # Time spent running (excludes queueing)
+    remaining_seconds: float
+    samples: int  # Histogram samples the estimate is based on
+
+
+@dataclass
+class DeckEstimate:
+    """Estimated time to generate all stale slides of a deck."""
+
+    engine: str
+    image_size: str
+    stale_sids: list[str]
+    per_slide_p50: float
+    per_slide_p90: float
+    queued_ahead: int  # Generations already running or waiting on the engine
+    estimated_seconds: float
+    estimated_seconds_p90: float
+    samples: int
@@ -0,0 +1,153 @@
+"""Mock image generation service for load tests and offline development.
+
+Renders deterministic 16:9 images locally (seeded by a hash of the request) and
+simulates provider latency and failures, so queueing, WebSocket fan-out and
+storage can be exercised without API keys or network access.
+"""
+
+import asyncio
+import io
+import math
+import random
+import textwrap
+
+from PIL import Image, ImageDraw, ImageFont
+
+from app.exceptions import GenerationFailedError
+from app.utils import compute_bytes_hash, compute_content_hash
+
+# Supported latency distributions
+LATENCY_DISTRIBUTIONS = ("fixed", "uniform", "exponential", "lognormal")
+
+
+class MockImageService:
+    """Deterministic local image engine implementing ImageGenerationService."""
+
+    name = "mock"
+    model = "mock-renderer-1"
+
+    def __init__(
+        self,
+        latency_distribution: str = "lognormal",
+        latency_mean: float = 2.0,
+        latency_stddev: float = 1.0,
+        failure_rate: float = 0.0,
+        image_width: int = 1920,
+        seed: int | None = None,
+    ):
+        if latency_distribution not in LATENCY_DISTRIBUTIONS:
+            raise ValueError(
+                f"Unknown latency distribution '{latency_distribution}', "
+                f"expected one of {', '.join(LATENCY_DISTRIBUTIONS)}"
+            )
+        self.latency_distribution = latency_distribution
+        self.latency_mean = max(latency_mean, 0.0)
+        self.latency_stddev = max(latency_stddev, 0.0)
+        self.failure_rate = min(max(failure_rate, 0.0), 1.0)
+        self.width = image_width
+        self.height = image_width * 9 // 16
+        self.image_size = f"{self.width}x{self.height}"
+        # Latency and failures are random; image content is seeded per request
+        self._random = random.Random(seed)
+
+    async def generate_style_images(
+        self,
+        prompt: str,
+        count: int = 2,
+        start_index: int = 0,
+    ) -> list[bytes]:
+        """Generate candidate style images from a prompt.
+
+        Args:
+            prompt: Style description prompt
+            count: Number of images to generate (default 2)
+            start_index: Index of the first candidate; each index gets its own image
+
+        Returns:
+            List of image bytes in JPEG format
+        """
+        tasks = [
+            self._generate(f"style\0{prompt}\0{index}", text="")
+            for index in range(start_index, start_index + count)
+        ]
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+
+        images = [result for result in results if isinstance(result, bytes)]
+        if not images:
+            raise GenerationFailedError("Failed to generate any style images")
+        return images
+
+    async def generate_slide_image(
+        self,
+        content: str,
+        style_image: bytes,
+        style_prompt: str,
+    ) -> bytes:
+        """Generate a slide image based on content and style reference.
+
+        Args:
+            content: Slide text content
+            style_image: Reference style image bytes (only its hash seeds the palette)
+            style_prompt: Style description prompt
+
+        Returns:
+            Generated image bytes in JPEG format
+        """
+        seed_text = f"slide\0{content}\0{style_prompt}\0{compute_bytes_hash(style_image)}"
+        return await self._generate(seed_text, text=content)
+
+    async def _generate(self, seed_text: str, text: str) -> bytes:
+        """Simulate a provider call: wait, maybe fail, then render."""
+        await asyncio.sleep(self._sample_latency())
+
+        if self._random.random() < self.failure_rate:
+            raise GenerationFailedError("Mock engine simulated failure")
+
+        return await asyncio.to_thread(self._render, seed_text, text)
+
+    def _sample_latency(self) -> float:
+        """Sample a simulated latency in seconds from the configured distribution."""
+        mean, stddev = self.latency_mean, self.latency_stddev
+        if mean == 0:
+            return 0.0
+        if self.latency_distribution == "fixed":
+            return mean
+        if self.latency_distribution == "uniform":
+            return self._random.uniform(max(mean - stddev, 0.0), mean + stddev)
+        if self.latency_distribution == "exponential":
+            return self._random.expovariate(1 / mean)
+        # lognormal with the requested mean/stddev of the latency itself
+        sigma = math.sqrt(math.log(1 + (stddev / mean) ** 2))
+        mu = math.log(mean) - sigma**2 / 2
+        return self._random.lognormvariate(mu, sigma)
+
+    def _render(self, seed_text: str, text: str) -> bytes:
+        """Render a deterministic image for a request (runs in a worker thread)."""
+        rng = random.Random(int(compute_content_hash(seed_text), 16))
+
+        # Smooth background: upscale a tiny random grid
+        grid = Image.new("RGB", (4, 3))
+        grid.putdata([tuple(rng.randrange(40, 230) for _ in range(3)) for _ in range(12)])
+        image = grid.resize((self.width, self.height), Image.Resampling.BICUBIC)
+
+        draw = ImageDraw.Draw(image)
+        for _ in range(rng.randrange(4, 9)):
+            x, y = rng.randrange(self.width), rng.randrange(self.height)
+            radius = rng.randrange(self.height // 12, self.height // 3)
+            color = tuple(rng.randrange(256) for _ in range(3))
+            draw.ellipse((x - radius, y - radius, x + radius, y + radius), outline=color, width=6)
+
+        if text:
+            font = ImageFont.load_default(size=max(self.height // 18, 10))
+            lines = textwrap.wrap(text, width=40)[:8]
+            draw.multiline_text(
+                (self.width // 12, self.height // 8),
+                "\n".join(lines),
+                fill=(20, 20, 20),
+                font=font,
+                spacing=self.height // 60,
+            )
+
+        buffer = io.BytesIO()
+        image.save(buffer, format="JPEG", quality=85)
+        return buffer.getvalue()
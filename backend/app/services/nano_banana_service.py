@@ -26,6 +26,8 @@ API_TIMEOUT = 300
 class NanoBananaService:
     """Service for interacting with Nano Banana image generation API."""
 
+    name = "nano_banana"
+
     def __init__(
         self,
         api_key: str,
@@ -83,12 +85,14 @@ class NanoBananaService:
         self,
         prompt: str,
         count: int = 2,
+        start_index: int = 0,
     ) -> list[bytes]:
         """Generate candidate style images from a prompt.
 
         Args:
             prompt: Style description prompt
             count: Number of images to generate (default 2)
+            start_index: Index of the first candidate (unused; every call is sampled anew)
 
         Returns:
             List of image bytes in JPEG format
@@ -1,18 +1,57 @@
 """Slides business logic service."""
 
+import codecs
+from collections.abc import AsyncIterable
 from datetime import datetime
+from typing import Any
 
-from app.exceptions import InvalidRequestError, ProjectNotFoundError, SlideNotFoundError
-from app.models import Project, Slide
+from app.exceptions import (
+    AppError,
+    BatchOperationError,
+    ImageNotFoundError,
+    InvalidRequestError,
+    ProjectNotFoundError,
+    SlideNotFoundError,
+)
+from app.models import BatchResult, Project, ProjectEvent, Slide, SlideOperation
 from app.repositories import SlidesRepository
-from app.utils import compute_content_hash, is_safe_name
+from app.services.event_bus import EventBus
+from app.services.task_registry import TaskRegistry
+from app.utils import OutlineSplitter, compute_content_hash, is_safe_name
+
+MAX_SLIDE_CONTENT_LENGTH = 20000  # Same limit as CreateSlideRequest.content
 
 
 class SlidesService:
-    """Service for managing slides and projects."""
+    """Service for managing slides and projects.
+
+    With an ``event_bus``, every saved slide edit is published as a
+    ``ProjectEvent`` stamped with the project's new version.
+    """
 
-    def __init__(self, repository: SlidesRepository):
+    def __init__(
+        self,
+        repository: SlidesRepository,
+        task_registry: TaskRegistry | None = None,
+        event_bus: EventBus | None = None,
+    ):
         self.repository = repository
+        self.task_registry = task_registry
+        self.event_bus = event_bus
+
+    async def _publish(self, slug: str, event_type: str, version: str, **data: Any) -> None:
+        """Publish a change that has been saved as ``version``."""
+        if self.event_bus is None:
+            return
+        await self.event_bus.publish(
+            ProjectEvent(slug=slug, type=event_type, version=version, data=data)
+        )
+
+    def _cancel_generation(self, slug: str, sid: str, reason: str) -> list[str]:
+        """Cancel in-flight image generation for a slide. Returns cancelled task IDs."""
+        if self.task_registry is None:
+            return []
+        return self.task_registry.cancel_slide(slug, sid, reason)
 
     async def list_projects(self) -> list[Project]:
         """List all existing projects."""
@@ -38,7 +77,8 @@ class SlidesService:
         project = await self.get_project(slug)
         project.title = title
         project.updated_at = datetime.now()
-        await self.repository.save_project(project)
+        version = await self.repository.save_project(project)
+        await self._publish(slug, "title_updated", version, title=title)
         return project
 
     async def update_engine(self, slug: str, engine: str) -> Project:
@@ -49,6 +89,27 @@ class SlidesService:
         await self.repository.save_project(project)
         return project
 
+    async def update_engine_policy(
+        self,
+        slug: str,
+        hedge_engine: str | None,
+        hedge_after_seconds: float | None = None,
+    ) -> Project:
+        """Update the hedged-request policy for a project.
+
+        Args:
+            slug: Project slug
+            hedge_engine: Secondary engine to hedge to, or None to disable hedging
+            hedge_after_seconds: Latency budget before the hedged request is fired
+        """
+        project = await self.get_project(slug)
+        project.hedge_engine = hedge_engine
+        if hedge_after_seconds is not None:
+            project.hedge_after_seconds = hedge_after_seconds
+        project.updated_at = datetime.now()
+        await self.repository.save_project(project)
+        return project
+
     async def create_slide(self, slug: str, content: str, after_sid: str | None = None) -> Slide:
         """Create a new slide."""
         project = await self.get_project(slug)
@@ -60,43 +121,160 @@ class SlidesService:
             updated_at=datetime.now(),
         )
 
+        index = len(project.slides)
         if after_sid:
             index = project.get_slide_index(after_sid)
             if index == -1:
                 raise SlideNotFoundError(after_sid)
-            project.slides.insert(index + 1, slide)
-        else:
-            project.slides.append(slide)
+            index += 1
+        project.slides.insert(index, slide)
 
         project.updated_at = datetime.now()
-        await self.repository.save_project(project)
+        version = await self.repository.save_project(project)
+        await self._publish(slug, "slide_created", version, slide=slide, index=index)
         return slide
 
-    async def update_slide(self, slug: str, sid: str, content: str) -> Slide:
-        """Update slide content."""
+    async def import_outline(
+        self,
+        slug: str,
+        chunks: AsyncIterable[bytes],
+        after_sid: str | None = None,
+        heading_level: int = 2,
+        max_slides: int = 1000,
+        max_bytes: int = 5 * 1024 * 1024,
+    ) -> list[Slide]:
+        """Split a UTF-8 Markdown/text document into slides and add them in one save.
+
+        The document is split as it is read (see ``OutlineSplitter``), so only
+        the slides, not the raw document, are held in memory. The project is
+        loaded and saved only once the whole document has arrived, so edits
+        made while a large document uploads are kept.
+
+        Args:
+            slug: Project slug
+            chunks: The document's bytes, as they arrive
+            after_sid: Insert the new slides after this slide (default: at the end)
+            heading_level: Deepest heading level that starts a new slide
+            max_slides: Most slides one document may create
+            max_bytes: Largest document accepted
+
+        Returns:
+            The new slides, in order
+
+        Raises:
+            InvalidRequestError: The document is not UTF-8, too large, or has no slides
+        """
+        # Fail early on a missing project or slide, before reading the document
+        self._get_insert_index(await self.get_project(slug), after_sid)
+
+        decoder = codecs.getincrementaldecoder("utf-8")()
+        splitter = OutlineSplitter(heading_level)
+        contents: list[str] = []
+        received = 0
+
+        def _add(new_contents: list[str]) -> None:
+            for content in new_contents:
+                if len(content) > MAX_SLIDE_CONTENT_LENGTH:
+                    raise InvalidRequestError(
+                        f"Slide {len(contents) + 1} is longer than "
+                        f"{MAX_SLIDE_CONTENT_LENGTH} characters"
+                    )
+                contents.append(content)
+            if len(contents) > max_slides:
+                raise InvalidRequestError(f"Document has more than {max_slides} slides")
+
+        try:
+            async for chunk in chunks:
+                received += len(chunk)
+                if received > max_bytes:
+                    raise InvalidRequestError(f"Document is larger than {max_bytes} bytes")
+                _add(splitter.feed(decoder.decode(chunk)))
+            _add(splitter.feed(decoder.decode(b"", final=True)))
+        except UnicodeDecodeError as e:
+            raise InvalidRequestError("Document must be UTF-8 text") from e
+        _add(splitter.finish())
+        if not contents:
+            raise InvalidRequestError("Document has no slide content")
+
+        project = await self.get_project(slug)
+        index = self._get_insert_index(project, after_sid)
+        now = datetime.now()
+        slides = [
+            Slide(
+                sid=self.repository.generate_sid(),
+                content=content,
+                created_at=now,
+                updated_at=now,
+            )
+            for content in contents
+        ]
+        project.slides[index:index] = slides
+        project.updated_at = now
+        version = await self.repository.save_project(project)
+        await self._publish(
+            slug,
+            "slides_updated",
+            version,
+            slides=slides,
+            deleted=[],
+            order=[slide.sid for slide in project.slides],
+            title=None,
+        )
+        return slides
+
+    @staticmethod
+    def _get_insert_index(project: Project, after_sid: str | None) -> int:
+        """Get the index new slides go to: after ``after_sid``, or at the end."""
+        if not after_sid:
+            return len(project.slides)
+        index = project.get_slide_index(after_sid)
+        if index == -1:
+            raise SlideNotFoundError(after_sid)
+        return index + 1
+
+    async def update_slide(
+        self, slug: str, sid: str, content: str, cancel_generation: bool = True
+    ) -> Slide:
+        """Update slide content.
+
+        Args:
+            slug: Project slug
+            sid: Slide ID
+            content: New slide content
+            cancel_generation: Cancel in-flight generation if the content changed,
+                since its result would be stale
+        """
         project = await self.get_project(slug)
         slide = project.get_slide(sid)
 
         if slide is None:
             raise SlideNotFoundError(sid)
 
+        if cancel_generation and slide.content != content:
+            self._cancel_generation(slug, sid, "content_changed")
+
         slide.content = content
         slide.updated_at = datetime.now()
         project.updated_at = datetime.now()
-        await self.repository.save_project(project)
+        version = await self.repository.save_project(project)
+        await self._publish(slug, "slide_updated", version, slide=slide)
         return slide
 
-    async def delete_slide(self, slug: str, sid: str) -> None:
-        """Delete a slide."""
+    async def delete_slide(self, slug: str, sid: str, cancel_generation: bool = True) -> None:
+        """Delete a slide, optionally cancelling its in-flight generation."""
         project = await self.get_project(slug)
         index = project.get_slide_index(sid)
 
         if index == -1:
             raise SlideNotFoundError(sid)
 
+        if cancel_generation:
+            self._cancel_generation(slug, sid, "slide_deleted")
+
         project.slides.pop(index)
         project.updated_at = datetime.now()
-        await self.repository.save_project(project)
+        version = await self.repository.save_project(project)
+        await self._publish(slug, "slide_deleted", version, sid=sid)
 
     async def reorder_slides(self, slug: str, order: list[str]) -> list[Slide]:
         """Reorder slides according to the given order."""
@@ -112,7 +290,10 @@ class SlidesService:
         slide_map = {slide.sid: slide for slide in project.slides}
         project.slides = [slide_map[sid] for sid in order]
         project.updated_at = datetime.now()
-        await self.repository.save_project(project)
+        version = await self.repository.save_project(project)
+        await self._publish(
+            slug, "slides_reordered", version, order=[slide.sid for slide in project.slides]
+        )
         return project.slides
 
     async def select_image(self, slug: str, sid: str, image_hash: str) -> Slide:
@@ -125,15 +306,149 @@ class SlidesService:
 
         # Verify the image exists
         if not any(img.hash == image_hash for img in slide.images):
-            from app.exceptions import ImageNotFoundError
-
             raise ImageNotFoundError(image_hash)
 
         slide.selected_image_hash = image_hash
         project.updated_at = datetime.now()
-        await self.repository.save_project(project)
+        version = await self.repository.save_project(project)
+        await self._publish(slug, "selection_changed", version, sid=sid, image_hash=image_hash)
         return slide
 
+    async def apply_batch(self, slug: str, operations: list[SlideOperation]) -> BatchResult:
+        """Apply a list of edits in order, then save the project once.
+
+        The operations run against one in-memory copy of the project, so if any
+        of them fails nothing is saved (and no generation is cancelled).
+
+        Args:
+            slug: Project slug
+            operations: Edits to apply, in order
+
+        Returns:
+            The saved project and what the batch changed
+
+        Raises:
+            BatchOperationError: An operation failed; carries its index
+        """
+        project = await self.get_project(slug)
+        result = BatchResult(project=project)
+        cancellations: dict[str, str] = {}  # sid -> reason
+        now = datetime.now()
+
+        for index, operation in enumerate(operations):
+            try:
+                self._apply_operation(project, operation, result, cancellations, now)
+            except AppError as e:
+                raise BatchOperationError(index, e) from e
+
+        if operations:
+            project.updated_at = now
+            version = await self.repository.save_project(project)
+            changed = set(result.created) | set(result.updated)
+            await self._publish(
+                slug,
+                "slides_updated",
+                version,
+                slides=[slide for slide in project.slides if slide.sid in changed],
+                deleted=result.deleted,
+                order=[slide.sid for slide in project.slides],
+                title=project.title if result.title_changed else None,
+            )
+        for sid, reason in cancellations.items():
+            self._cancel_generation(slug, sid, reason)
+        return result
+
+    def _apply_operation(
+        self,
+        project: Project,
+        operation: SlideOperation,
+        result: BatchResult,
+        cancellations: dict[str, str],
+        now: datetime,
+    ) -> None:
+        """Apply one batch operation to the in-memory project."""
+
+        def _resolve(name: str | None) -> str:
+            if not name:
+                raise InvalidRequestError(f"'{operation.op}' needs a slide")
+            return result.refs.get(name, name)
+
+        def _get_slide(name: str | None) -> Slide:
+            sid = _resolve(name)
+            slide = project.get_slide(sid)
+            if slide is None:
+                raise SlideNotFoundError(sid)
+            return slide
+
+        def _mark_updated(sid: str) -> None:
+            if sid not in result.created and sid not in result.updated:
+                result.updated.append(sid)
+
+        if operation.op == "create":
+            slide = Slide(
+                sid=self.repository.generate_sid(),
+                content=operation.content or "",
+                created_at=now,
+                updated_at=now,
+            )
+            if operation.after_sid:
+                index = project.get_slide_index(_resolve(operation.after_sid))
+                if index == -1:
+                    raise SlideNotFoundError(operation.after_sid)
+                project.slides.insert(index + 1, slide)
+            else:
+                project.slides.append(slide)
+            if operation.ref:
+                if operation.ref in result.refs:
+                    raise InvalidRequestError(f"Duplicate ref: {operation.ref}")
+                result.refs[operation.ref] = slide.sid
+            result.created.append(slide.sid)
+
+        elif operation.op == "update":
+            slide = _get_slide(operation.sid)
+            content = operation.content or ""
+            if operation.cancel_generation and slide.content != content:
+                cancellations[slide.sid] = "content_changed"
+            slide.content = content
+            slide.updated_at = now
+            _mark_updated(slide.sid)
+
+        elif operation.op == "delete":
+            slide = _get_slide(operation.sid)
+            project.slides.remove(slide)
+            if operation.cancel_generation:
+                cancellations[slide.sid] = "slide_deleted"
+            if slide.sid in result.created:
+                result.created.remove(slide.sid)
+            else:
+                result.deleted.append(slide.sid)
+            if slide.sid in result.updated:
+                result.updated.remove(slide.sid)
+
+        elif operation.op == "reorder":
+            order = [_get_slide(name).sid for name in operation.order or []]
+            if sorted(order) != sorted(slide.sid for slide in project.slides):
+                raise InvalidRequestError("Order must list every slide exactly once")
+            slide_map = {slide.sid: slide for slide in project.slides}
+            project.slides = [slide_map[sid] for sid in order]
+            result.reordered = True
+
+        elif operation.op == "select_image":
+            slide = _get_slide(operation.sid)
+            if not any(img.hash == operation.image_hash for img in slide.images):
+                raise ImageNotFoundError(operation.image_hash or "")
+            slide.selected_image_hash = operation.image_hash
+            _mark_updated(slide.sid)
+
+        elif operation.op == "title":
+            if not operation.title:
+                raise InvalidRequestError("Title must not be empty")
+            project.title = operation.title
+            result.title_changed = True
+
+        else:
+            raise InvalidRequestError(f"Unknown operation: {operation.op}")
+
     def get_content_hash(self, content: str) -> str:
         """Get the hash of slide content."""
         return compute_content_hash(content)
@@ -1,21 +1,29 @@
 """Style business logic service."""
 
+import asyncio
+import logging
+from collections.abc import Awaitable, Callable
 from datetime import datetime
 
-from app.exceptions import InvalidRequestError
+from app.exceptions import GenerationFailedError, InvalidRequestError
 from app.models import (
     STYLE_TEMPLATES,
     Project,
+    ProjectEvent,
     Style,
     StyleCandidate,
     StyleTemplate,
     StyleType,
 )
 from app.repositories import SlidesRepository, StyleRepository
-from app.services.gemini_service import GeminiService
+from app.services.event_bus import EventBus
+from app.services.generation_cache import GenerationCache
 from app.services.image_generation_service import ImageGenerationService
-from app.services.nano_banana_service import NanoBananaService
-from app.services.volcengine_service import VolcEngineService
+
+logger = logging.getLogger(__name__)
+
+# Number of style candidates generated per request unless specified
+DEFAULT_CANDIDATE_COUNT = 2
 
 
 class StyleService:
@@ -25,15 +33,21 @@ class StyleService:
         self,
         slides_repository: SlidesRepository,
         style_repository: StyleRepository,
-        gemini_service: GeminiService,
-        volcengine_service: VolcEngineService,
-        nano_banana_service: NanoBananaService,
+        gemini_service: ImageGenerationService,
+        volcengine_service: ImageGenerationService,
+        nano_banana_service: ImageGenerationService,
+        mock_service: ImageGenerationService | None = None,
+        generation_cache: GenerationCache | None = None,
+        event_bus: EventBus | None = None,
     ):
         self.slides_repository = slides_repository
         self.style_repository = style_repository
         self.gemini_service = gemini_service
         self.volcengine_service = volcengine_service
         self.nano_banana_service = nano_banana_service
+        self.mock_service = mock_service
+        self.generation_cache = generation_cache
+        self.event_bus = event_bus  # Receives a style_saved event when a style is saved
 
     def _get_engine(self, project: Project) -> ImageGenerationService:
         """Select image generation engine based on project configuration."""
@@ -41,6 +55,8 @@ class StyleService:
             return self.gemini_service
         if project.image_engine == "nano_banana":
             return self.nano_banana_service
+        if project.image_engine == "mock" and self.mock_service is not None:
+            return self.mock_service
         return self.volcengine_service  # Default to VolcEngine
 
     @staticmethod
@@ -62,43 +78,101 @@ class StyleService:
         project = await self.slides_repository.get_or_create_project(slug)
         return project.style
 
-    async def generate_candidates(self, slug: str, prompt: str) -> list[StyleCandidate]:
-        """Generate candidate style images."""
+    async def generate_candidates(
+        self,
+        slug: str,
+        prompt: str,
+        force: bool = False,
+        count: int = DEFAULT_CANDIDATE_COUNT,
+        on_candidate: Callable[[StyleCandidate], Awaitable[None]] | None = None,
+        on_failed: Callable[[Exception], Awaitable[None]] | None = None,
+    ) -> list[StyleCandidate]:
+        """Generate candidate style images.
+
+        Candidates are generated independently and each one is saved (and
+        reported through ``on_candidate``) as soon as it is ready, instead of
+        waiting for the slowest. Cancelling the caller cancels the remaining
+        candidates; cost is recorded for those already generated.
+
+        Args:
+            slug: Project slug
+            prompt: Style description prompt
+            force: Bypass the generation cache and always call the engine
+            count: Number of candidates to generate
+            on_candidate: Optional callback invoked with each saved candidate
+            on_failed: Optional callback invoked with the error of each failed candidate
+        """
         # Ensure project exists
         project = await self.slides_repository.get_or_create_project(slug)
 
         # Select image generation engine based on project configuration
         engine = self._get_engine(project)
 
-        # Generate images using selected engine
-        images = await engine.generate_style_images(prompt, count=2)
+        generated_count = 0
+
+        async def _generate_one(index: int) -> StyleCandidate:
+            nonlocal generated_count
+            # Serve candidates of identical requests from the generation cache
+            key = None
+            image_data = None
+            if self.generation_cache is not None:
+                key = self.generation_cache.style_key(engine, prompt, index)
+                if not force:
+                    image_data = await self.generation_cache.get(key)
+            if image_data is None:
+                images = await engine.generate_style_images(prompt, count=1, start_index=index)
+                image_data = images[0]
+                generated_count += 1
+                if key is not None and self.generation_cache is not None:
+                    await self.generation_cache.put(key, image_data)
 
-        # Save candidates
-        candidates = []
-        for image_data in images:
             candidate_id = await self.style_repository.save_candidate(slug, image_data)
-            candidates.append(
-                StyleCandidate(
-                    id=candidate_id,
-                    path=f"style/candidates/{candidate_id}.jpg",
-                )
-            )
+            return StyleCandidate(id=candidate_id, path=f"style/candidates/{candidate_id}.jpg")
 
-        # Update cost tracking
-        project.cost.style_generations += len(images)
-        project.cost.total_images += len(images)
+        tasks = [asyncio.create_task(_generate_one(index)) for index in range(count)]
+        candidates: list[StyleCandidate] = []
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                try:
+                    candidate = await next_done
+                except Exception as e:
+                    logger.exception("Style candidate generation failed", extra={"slug": slug})
+                    if on_failed is not None:
+                        await on_failed(e)
+                    continue
+                candidates.append(candidate)
+                if on_candidate is not None:
+                    await on_candidate(candidate)
+        finally:
+            for task in tasks:
+                task.cancel()
+            if generated_count:
+                await self._record_style_cost(slug, generated_count)
+
+        if not candidates:
+            raise GenerationFailedError("Failed to generate any style images")
+        return candidates
+
+    async def _record_style_cost(self, slug: str, generated_count: int) -> None:
+        """Add generated style images to the project cost (cache hits cost nothing)."""
+        # Re-read project data so concurrent edits are not overwritten
+        project = await self.slides_repository.get_or_create_project(slug)
+        project.cost.style_generations += generated_count
+        project.cost.total_images += generated_count
         project.cost.estimated_cost = (
             project.cost.style_generations * 0.02 + project.cost.slide_generations * 0.02
         )
         await self.slides_repository.save_project(project)
 
-        return candidates
-
     async def generate_candidates_from_template(
         self,
         slug: str,
         style_type: str,
         custom_prompt: str | None = None,
+        force: bool = False,
+        count: int = DEFAULT_CANDIDATE_COUNT,
+        on_candidate: Callable[[StyleCandidate], Awaitable[None]] | None = None,
+        on_failed: Callable[[Exception], Awaitable[None]] | None = None,
     ) -> tuple[list[StyleCandidate], StyleTemplate]:
         """
         基于预设模板生成风格候选
@@ -107,6 +181,10 @@ class StyleService:
             slug: 项目 slug
             style_type: 风格类型
             custom_prompt: 自定义提示词（可选，优先级高于模板默认）
+            force: 跳过生成缓存，强制重新生成
+            count: 候选数量
+            on_candidate: 每个候选就绪时的回调（可选）
+            on_failed: 每个候选失败时的回调（可选）
 
         Returns:
             (候选列表, 使用的模板)
@@ -119,7 +197,9 @@ class StyleService:
         prompt = custom_prompt or template.preview_prompt
 
         # 调用现有生成逻辑
-        candidates = await self.generate_candidates(slug, prompt)
+        candidates = await self.generate_candidates(
+            slug, prompt, force=force, count=count, on_candidate=on_candidate, on_failed=on_failed
+        )
 
         return candidates, template
 
@@ -135,8 +215,8 @@ class StyleService:
         project = await self.slides_repository.get_or_create_project(slug)
 
         # Promote candidate to main style
-        result = await self.style_repository.promote_candidate(slug, candidate_id)
-        if result is None:
+        image_hash = await self.style_repository.promote_candidate(slug, candidate_id)
+        if image_hash is None:
             raise InvalidRequestError(f"Candidate '{candidate_id}' not found")
 
         # 解析风格类型
@@ -154,19 +234,25 @@ class StyleService:
             created_at=datetime.now(),
             style_type=parsed_style_type,
             style_name=style_name,
+            image_hash=image_hash,
         )
         project.style = style
         project.updated_at = datetime.now()
-        await self.slides_repository.save_project(project)
+        version = await self.slides_repository.save_project(project)
 
         # Clear candidates
         await self.style_repository.clear_candidates(slug)
 
+        if self.event_bus is not None:
+            await self.event_bus.publish(
+                ProjectEvent(slug=slug, type="style_saved", version=version, data={"style": style})
+            )
+
         return style
 
-    def get_style_url(self, slug: str) -> str:
-        """Get the URL for the style image."""
-        return self.style_repository.get_style_url(slug)
+    def get_style_url(self, slug: str, style: Style | None = None) -> str:
+        """Get the URL for the style image, versioned by its data hash when known."""
+        return self.style_repository.get_style_url(slug, style.image_hash if style else None)
 
     def get_candidate_url(self, slug: str, candidate_id: str) -> str:
         """Get the URL for a candidate image."""
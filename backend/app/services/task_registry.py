@@ -0,0 +1,83 @@
+"""Registry of cancellable background tasks."""
+
+import asyncio
+import logging
+import uuid
+from collections.abc import Coroutine
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class BackgroundTask:
+    """A background task tracked by the registry."""
+
+    task_id: str
+    slug: str
+    kind: str  # "generation" | ...
+    task: asyncio.Task[Any]
+    sid: str | None = None
+    created_at: datetime = field(default_factory=datetime.now)
+
+
+class TaskRegistry:
+    """Tracks background tasks so they can be looked up and cancelled.
+
+    Tasks are indexed by task_id and can also be cancelled by ``(slug, sid)``.
+    Finished tasks remove themselves from the registry.
+    """
+
+    def __init__(self) -> None:
+        self._tasks: dict[str, BackgroundTask] = {}
+
+    def spawn(
+        self,
+        slug: str,
+        coro: Coroutine[Any, Any, Any],
+        *,
+        kind: str = "generation",
+        sid: str | None = None,
+        task_id: str | None = None,
+    ) -> str:
+        """Run a coroutine as a tracked background task and return its task_id."""
+        task_id = task_id or str(uuid.uuid4())
+        task = asyncio.create_task(coro, name=f"{kind}:{slug}:{sid or ''}:{task_id}")
+        self._tasks[task_id] = BackgroundTask(
+            task_id=task_id,
+            slug=slug,
+            kind=kind,
+            task=task,
+            sid=sid,
+        )
+        task.add_done_callback(lambda _: self._tasks.pop(task_id, None))
+        return task_id
+
+    def get(self, task_id: str) -> BackgroundTask | None:
+        """Get a running task by ID."""
+        return self._tasks.get(task_id)
+
+    def list_tasks(self, slug: str, kind: str | None = None) -> list[BackgroundTask]:
+        """List running tasks for a project, oldest first."""
+        return [
+            t for t in self._tasks.values() if t.slug == slug and (kind is None or t.kind == kind)
+        ]
+
+    def cancel(self, task_id: str, reason: str = "cancelled") -> bool:
+        """Cancel a task by ID. Returns True if a running task was cancelled."""
+        entry = self._tasks.get(task_id)
+        if entry is None or entry.task.done():
+            return False
+        entry.task.cancel(msg=reason)
+        logger.info(
+            "Background task cancelled",
+            extra={"task_id": task_id, "slug": entry.slug, "sid": entry.sid, "reason": reason},
+        )
+        return True
+
+    def cancel_slide(self, slug: str, sid: str, reason: str = "cancelled") -> list[str]:
+        """Cancel all running tasks for a slide. Returns the cancelled task IDs."""
+        task_ids = [t.task_id for t in self._tasks.values() if t.slug == slug and t.sid == sid]
+        return [task_id for task_id in task_ids if self.cancel(task_id, reason)]
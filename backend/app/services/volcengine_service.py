@@ -18,6 +18,9 @@ logger = logging.getLogger(__name__)
 # VolcEngine Seedream model
 IMAGE_MODEL = "doubao-seedream-4-5-251128"
 
+# Output size: 16:9 aspect ratio, min 3686400 pixels required
+IMAGE_SIZE = "2560x1440"
+
 # API timeout in seconds
 API_TIMEOUT = 60
 
@@ -25,6 +28,10 @@ API_TIMEOUT = 60
 class VolcEngineService:
     """Service for interacting with VolcEngine Ark API."""
 
+    name = "volcengine"
+    model = IMAGE_MODEL
+    image_size = IMAGE_SIZE
+
     def __init__(self, api_key: str):
         self.api_key = api_key
 
@@ -50,12 +57,14 @@ class VolcEngineService:
         self,
         prompt: str,
         count: int = 2,
+        start_index: int = 0,
     ) -> list[bytes]:
         """Generate candidate style images from a prompt.
 
         Args:
             prompt: Style description prompt
             count: Number of images to generate (default 2)
+            start_index: Index of the first candidate (unused; every call is sampled anew)
 
         Returns:
             List of image bytes in JPEG format
@@ -147,7 +156,7 @@ INSTRUCTIONS:
                 response = client.images.generate(
                     model=IMAGE_MODEL,
                     prompt=prompt,
-                    size="2560x1440",  # 16:9 aspect ratio, min 3686400 pixels required
+                    size=IMAGE_SIZE,
                     response_format="b64_json",  # Request base64 encoded response
                     watermark=False,  # Disable watermark
                 )
@@ -203,7 +212,7 @@ INSTRUCTIONS:
                     model=IMAGE_MODEL,
                     prompt=prompt,
                     image=reference_image,  # Data URL or HTTP URL
-                    size="2560x1440",  # 16:9 aspect ratio, min 3686400 pixels required
+                    size=IMAGE_SIZE,
                     response_format="b64_json",  # Request base64 encoded response
                     watermark=False,  # Disable watermark
                 )
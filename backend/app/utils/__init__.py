@@ -12,17 +12,37 @@ from .file import (
     write_file,
 )
 from .hash import compute_bytes_hash, compute_content_hash
+from .http import etag_matches, versioned_url
+from .outline import OutlineSplitter
+from .pagination import decode_cursor, encode_cursor, paginate
+from .pdfstream import PdfStream
+from .pptxstream import PptxStream
+from .prefetch import prefetch_ordered
+from .static_files import IMMUTABLE_CACHE_CONTROL, VersionedStaticFiles
+from .zipstream import ZipStream
 
 __all__ = [
+    "IMMUTABLE_CACHE_CONTROL",
+    "OutlineSplitter",
+    "PdfStream",
+    "PptxStream",
+    "VersionedStaticFiles",
+    "ZipStream",
     "compute_bytes_hash",
     "compute_content_hash",
+    "decode_cursor",
     "delete_file",
+    "encode_cursor",
     "ensure_directory",
+    "etag_matches",
     "file_exists",
     "is_safe_name",
     "list_files",
+    "paginate",
+    "prefetch_ordered",
     "read_bytes",
     "read_file",
+    "versioned_url",
     "write_bytes",
     "write_file",
 ]
@@ -0,0 +1,14 @@
+"""HTTP helpers."""
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """Check an ``If-None-Match`` header against an ETag (weak comparison)."""
+    if if_none_match.strip() == "*":
+        return True
+    tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return etag.removeprefix("W/") in tags
+
+
+def versioned_url(url: str, version: str | None) -> str:
+    """Pin a static URL to one version of the file (served as immutable)."""
+    return f"{url}?v={version}" if version else url
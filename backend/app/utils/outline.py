@@ -0,0 +1,78 @@
+"""Incremental splitting of a Markdown/text outline into slide contents."""
+
+import re
+
+_HEADING_PATTERN = re.compile(r"^(#{1,6})(?:\s|$)")
+_BREAK_PATTERN = re.compile(r"^ {0,3}([-*_])(?:[ \t]*\1){2,}[ \t]*$")
+_FENCE_PATTERN = re.compile(r"^ {0,3}(`{3,}|~{3,})")
+
+
+class OutlineSplitter:
+    """Split a document into slides as its text arrives, line by line.
+
+    A heading of ``heading_level`` or above (``#`` .. ``##`` by default)
+    starts a new slide and stays in it; a thematic break (``---``, ``***``,
+    ``___``) ends the current slide and is dropped. Nothing inside a fenced
+    code block splits. Slides that are only whitespace are skipped.
+
+    Usage::
+
+        splitter = OutlineSplitter()
+        for text in chunks:
+            slides.extend(splitter.feed(text))
+        slides.extend(splitter.finish())
+    """
+
+    def __init__(self, heading_level: int = 2):
+        self.heading_level = heading_level
+        self._pending = ""  # Partial last line of the text fed so far
+        self._lines: list[str] = []  # Lines of the current slide
+        self._fence: str | None = None  # Opening fence of the code block we are in
+
+    def feed(self, text: str) -> list[str]:
+        """Add text; returns the slides it completed."""
+        lines = (self._pending + text).split("\n")
+        self._pending = lines.pop()
+        slides: list[str] = []
+        for line in lines:
+            self._add_line(line.rstrip("\r"), slides)
+        return slides
+
+    def finish(self) -> list[str]:
+        """End of document; returns the remaining slide, if any."""
+        slides: list[str] = []
+        if self._pending:
+            self._add_line(self._pending.rstrip("\r"), slides)
+            self._pending = ""
+        self._flush(slides)
+        return slides
+
+    def _add_line(self, line: str, slides: list[str]) -> None:
+        fence = _FENCE_PATTERN.match(line)
+        if self._fence is not None:
+            if (
+                fence
+                and fence.group(1)[0] == self._fence[0]
+                and len(fence.group(1)) >= len(self._fence)
+            ):
+                self._fence = None
+            self._lines.append(line)
+            return
+        if fence:
+            self._fence = fence.group(1)
+            self._lines.append(line)
+            return
+
+        if _BREAK_PATTERN.match(line):
+            self._flush(slides)
+            return
+        heading = _HEADING_PATTERN.match(line)
+        if heading and len(heading.group(1)) <= self.heading_level:
+            self._flush(slides)
+        self._lines.append(line)
+
+    def _flush(self, slides: list[str]) -> None:
+        content = "\n".join(self._lines).strip()
+        self._lines = []
+        if content:
+            slides.append(content)
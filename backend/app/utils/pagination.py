@@ -0,0 +1,61 @@
+"""Cursor pagination over sorted lists."""
+
+import base64
+import binascii
+import json
+from collections.abc import Callable, Sequence
+
+
+def encode_cursor(key: Sequence[str]) -> str:
+    """Encode the sort key of the last item on a page as an opaque cursor."""
+    return base64.urlsafe_b64encode(json.dumps(list(key)).encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[str, ...]:
+    """Decode a cursor from ``encode_cursor``. Raises ValueError if malformed."""
+    try:
+        key = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    except (binascii.Error, UnicodeDecodeError, json.JSONDecodeError) as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+    if not isinstance(key, list) or not all(isinstance(part, str) for part in key):
+        raise ValueError(f"Invalid cursor: {cursor}")
+    return tuple(key)
+
+
+def paginate[T](
+    items: Sequence[T],
+    key: Callable[[T], tuple[str, ...]],
+    limit: int | None,
+    cursor: str | None = None,
+    reverse: bool = False,
+) -> tuple[list[T], str | None]:
+    """Get the page of ``items`` following ``cursor``.
+
+    The cursor holds the sort key of the last item already returned rather than
+    an offset, so pages stay consistent while items are added or removed.
+
+    Args:
+        items: Items sorted by ``key`` (descending if ``reverse``)
+        key: Unique sort key of an item
+        limit: Page size; None returns every remaining item
+        cursor: ``next_cursor`` of the previous page, or None for the first page
+        reverse: Whether the items are sorted in descending order
+
+    Returns:
+        The page, and the cursor of the next page (None on the last page)
+    """
+    start = 0
+    if cursor is not None:
+        after = decode_cursor(cursor)
+        start = next(
+            (
+                i
+                for i, item in enumerate(items)
+                if (key(item) < after if reverse else key(item) > after)
+            ),
+            len(items),
+        )
+    end = len(items) if limit is None else min(start + limit, len(items))
+    page = list(items[start:end])
+    next_cursor = encode_cursor(key(page[-1])) if page and end < len(items) else None
+    return page, next_cursor
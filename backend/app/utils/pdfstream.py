@@ -0,0 +1,125 @@
+"""Streaming PDF writer for image-only documents.
+
+Each page shows one JPEG, embedded as an image XObject with ``/DCTDecode`` so
+the compressed bytes are copied through without decoding or re-encoding.
+Pages are emitted as soon as they are added; only the object offsets are kept
+until the cross-reference table is written at the end.
+"""
+
+import io
+
+from PIL import Image
+
+# Page width in points; page height follows each image's aspect ratio
+PAGE_WIDTH = 960.0
+
+_COLOR_SPACES = {"L": "/DeviceGray", "RGB": "/DeviceRGB", "CMYK": "/DeviceCMYK"}
+
+# Object numbers of the document catalog and page tree (written in finish())
+_CATALOG = 1
+_PAGES = 2
+
+
+def _to_jpeg(image_data: bytes) -> tuple[bytes, Image.Image]:
+    """Return JPEG bytes for an image, re-encoding only if it is not already a JPEG."""
+    image = Image.open(io.BytesIO(image_data))  # Lazy: reads the header only
+    if image.format == "JPEG" and image.mode in _COLOR_SPACES:
+        return image_data, image
+    buffer = io.BytesIO()
+    image.convert("RGB").save(buffer, format="JPEG", quality=95)
+    return buffer.getvalue(), Image.open(io.BytesIO(buffer.getvalue()))
+
+
+class PdfStream:
+    """Incremental writer for a PDF with one full-page JPEG per page.
+
+    Usage::
+
+        ps = PdfStream()
+        yield ps.start()
+        yield ps.add_page(jpeg_bytes)
+        yield ps.finish()
+    """
+
+    def __init__(self, page_width: float = PAGE_WIDTH) -> None:
+        self.page_width = page_width
+        self._offsets: dict[int, int] = {}
+        self._pages: list[int] = []
+        self._next_object = _PAGES + 1
+        self._offset = 0
+
+    @property
+    def bytes_written(self) -> int:
+        """Total number of bytes produced so far."""
+        return self._offset
+
+    def _emit(self, data: bytes) -> bytes:
+        self._offset += len(data)
+        return data
+
+    def _object(self, number: int, body: bytes) -> bytes:
+        """Serialize an indirect object, recording its offset."""
+        self._offsets[number] = self._offset
+        return self._emit(b"%d 0 obj\n" % number + body + b"\nendobj\n")
+
+    def _allocate(self) -> int:
+        number = self._next_object
+        self._next_object += 1
+        return number
+
+    def start(self) -> bytes:
+        """Return the file header."""
+        # The binary comment marks the file as binary for transfer tools
+        return self._emit(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+
+    def add_page(self, image_data: bytes) -> bytes:
+        """Add a page showing an image scaled to the page, and return its objects."""
+        jpeg, image = _to_jpeg(image_data)
+        width, height = image.size
+        page_height = self.page_width * height / width
+
+        image_ref, content_ref, page_ref = self._allocate(), self._allocate(), self._allocate()
+        self._pages.append(page_ref)
+
+        decode = b""
+        if image.mode == "CMYK" and "adobe" in image.info:
+            # Adobe CMYK JPEGs store inverted values
+            decode = b" /Decode [1 0 1 0 1 0 1 0]"
+        image_object = (
+            b"<< /Type /XObject /Subtype /Image /Width %d /Height %d"
+            b" /ColorSpace %s /BitsPerComponent 8 /Filter /DCTDecode%s /Length %d >>\nstream\n"
+            % (width, height, _COLOR_SPACES[image.mode].encode(), decode, len(jpeg))
+            + jpeg
+            + b"\nendstream"
+        )
+        content = b"q %.2f 0 0 %.2f 0 0 cm /Im0 Do Q" % (self.page_width, page_height)
+        content_object = b"<< /Length %d >>\nstream\n" % len(content) + content + b"\nendstream"
+        page_object = (
+            b"<< /Type /Page /Parent %d 0 R /MediaBox [0 0 %.2f %.2f]"
+            b" /Resources << /XObject << /Im0 %d 0 R >> >> /Contents %d 0 R >>"
+            % (_PAGES, self.page_width, page_height, image_ref, content_ref)
+        )
+        return (
+            self._object(image_ref, image_object)
+            + self._object(content_ref, content_object)
+            + self._object(page_ref, page_object)
+        )
+
+    def finish(self) -> bytes:
+        """Return the page tree, catalog, cross-reference table and trailer."""
+        kids = b" ".join(b"%d 0 R" % ref for ref in self._pages)
+        data = self._object(
+            _PAGES, b"<< /Type /Pages /Kids [%s] /Count %d >>" % (kids, len(self._pages))
+        )
+        data += self._object(_CATALOG, b"<< /Type /Catalog /Pages %d 0 R >>" % _PAGES)
+
+        xref_offset = self._offset
+        count = self._next_object
+        xref = b"xref\n0 %d\n0000000000 65535 f \n" % count
+        xref += b"".join(b"%010d 00000 n \n" % self._offsets[n] for n in range(1, count))
+        xref += b"trailer\n<< /Size %d /Root %d 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (
+            count,
+            _CATALOG,
+            xref_offset,
+        )
+        return data + self._emit(xref)
@@ -0,0 +1,306 @@
+"""Streaming PPTX writer for image-only decks.
+
+Writes a minimal OOXML presentation package through ``ZipStream``: each slide is
+a full-bleed picture, with the slide text in its speaker notes. Slide parts are
+emitted as they are added; the parts that list every slide (presentation,
+content types) are written at the end, so memory does not grow with the deck.
+"""
+
+from xml.sax.saxutils import escape
+
+from .zipstream import ZipStream
+
+# 16:9 slide size in EMU (13.333in x 7.5in)
+SLIDE_WIDTH = 12192000
+SLIDE_HEIGHT = 6858000
+
+_XML = '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+_NS = (
+    'xmlns:a="http://schemas.openxmlformats.org/drawingml/2006/main" '
+    'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships" '
+    'xmlns:p="http://schemas.openxmlformats.org/presentationml/2006/main"'
+)
+_REL = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+_CT = "application/vnd.openxmlformats-officedocument"
+
+_GROUP = (
+    '<p:nvGrpSpPr><p:cNvPr id="1" name=""/><p:cNvGrpSpPr/><p:nvPr/></p:nvGrpSpPr>'
+    '<p:grpSpPr><a:xfrm><a:off x="0" y="0"/><a:ext cx="0" cy="0"/>'
+    '<a:chOff x="0" y="0"/><a:chExt cx="0" cy="0"/></a:xfrm></p:grpSpPr>'
+)
+_CLR_MAP = (
+    '<p:clrMap bg1="lt1" tx1="dk1" bg2="lt2" tx2="dk2" accent1="accent1" accent2="accent2" '
+    'accent3="accent3" accent4="accent4" accent5="accent5" accent6="accent6" '
+    'hlink="hlink" folHlink="folHlink"/>'
+)
+_BACKGROUND = '<p:bg><p:bgRef idx="1001"><a:schemeClr val="bg1"/></p:bgRef></p:bg>'
+
+
+def _rels(*relationships: tuple[str, str, str]) -> str:
+    """Build a relationships part from ``(id, type, target)`` triples."""
+    items = "".join(
+        f'<Relationship Id="{rid}" Type="{_REL}/{kind}" Target="{target}"/>'
+        for rid, kind, target in relationships
+    )
+    return (
+        f"{_XML}<Relationships "
+        f'xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        f"{items}</Relationships>"
+    )
+
+
+def _placeholder(shape_id: int, name: str, ph: str, sp_pr: str = "", body: str = "") -> str:
+    """Build a placeholder shape for notes pages."""
+    return (
+        f'<p:sp><p:nvSpPr><p:cNvPr id="{shape_id}" name="{name}"/>'
+        f'<p:cNvSpPr><a:spLocks noGrp="1"/></p:cNvSpPr><p:nvPr>{ph}</p:nvPr></p:nvSpPr>'
+        f"<p:spPr>{sp_pr}</p:spPr>{body}</p:sp>"
+    )
+
+
+def _rect(x: int, y: int, cx: int, cy: int) -> str:
+    return (
+        f'<a:xfrm><a:off x="{x}" y="{y}"/><a:ext cx="{cx}" cy="{cy}"/></a:xfrm>'
+        '<a:prstGeom prst="rect"><a:avLst/></a:prstGeom>'
+    )
+
+
+def _text_body(text: str) -> str:
+    """Build a text body with one paragraph per line."""
+    paragraphs = "".join(
+        f'<a:p><a:r><a:rPr lang="en-US" dirty="0"/><a:t>{escape(line)}</a:t></a:r></a:p>'
+        if line
+        else "<a:p/>"
+        for line in text.splitlines()
+    )
+    return f"<p:txBody><a:bodyPr/><a:lstStyle/>{paragraphs or '<a:p/>'}</p:txBody>"
+
+
+def _theme() -> str:
+    """A minimal Office-like theme (colors, fonts and plain format styles)."""
+    colors = "".join(
+        f'<a:{name}><a:srgbClr val="{value}"/></a:{name}>'
+        for name, value in (
+            ("dk2", "44546A"),
+            ("lt2", "E7E6E6"),
+            ("accent1", "4472C4"),
+            ("accent2", "ED7D31"),
+            ("accent3", "A5A5A5"),
+            ("accent4", "FFC000"),
+            ("accent5", "5B9BD5"),
+            ("accent6", "70AD47"),
+            ("hlink", "0563C1"),
+            ("folHlink", "954F72"),
+        )
+    )
+    fill = '<a:solidFill><a:schemeClr val="phClr"/></a:solidFill>'
+    line = f'<a:ln w="6350">{fill}</a:ln>'
+    effect = "<a:effectStyle><a:effectLst/></a:effectStyle>"
+    font = '<a:latin typeface="{}"/><a:ea typeface=""/><a:cs typeface=""/>'
+    return (
+        f'{_XML}<a:theme xmlns:a="http://schemas.openxmlformats.org/drawingml/2006/main" '
+        'name="Office Theme"><a:themeElements><a:clrScheme name="Office">'
+        '<a:dk1><a:sysClr val="windowText" lastClr="000000"/></a:dk1>'
+        '<a:lt1><a:sysClr val="window" lastClr="FFFFFF"/></a:lt1>'
+        f'{colors}</a:clrScheme><a:fontScheme name="Office">'
+        f"<a:majorFont>{font.format('Calibri Light')}</a:majorFont>"
+        f"<a:minorFont>{font.format('Calibri')}</a:minorFont></a:fontScheme>"
+        f'<a:fmtScheme name="Office"><a:fillStyleLst>{fill * 3}</a:fillStyleLst>'
+        f"<a:lnStyleLst>{line * 3}</a:lnStyleLst>"
+        f"<a:effectStyleLst>{effect * 3}</a:effectStyleLst>"
+        f"<a:bgFillStyleLst>{fill * 3}</a:bgFillStyleLst></a:fmtScheme>"
+        "</a:themeElements></a:theme>"
+    )
+
+
+def _slide_master() -> str:
+    return (
+        f"{_XML}<p:sldMaster {_NS}><p:cSld>{_BACKGROUND}<p:spTree>{_GROUP}</p:spTree></p:cSld>"
+        f'{_CLR_MAP}<p:sldLayoutIdLst><p:sldLayoutId id="2147483649" r:id="rId1"/>'
+        "</p:sldLayoutIdLst><p:txStyles><p:titleStyle/><p:bodyStyle/><p:otherStyle/>"
+        "</p:txStyles></p:sldMaster>"
+    )
+
+
+def _slide_layout() -> str:
+    return (
+        f'{_XML}<p:sldLayout {_NS} type="blank" preserve="1"><p:cSld name="Blank">'
+        f"<p:spTree>{_GROUP}</p:spTree></p:cSld>"
+        "<p:clrMapOvr><a:masterClrMapping/></p:clrMapOvr></p:sldLayout>"
+    )
+
+
+def _notes_master() -> str:
+    image = _placeholder(
+        2,
+        "Slide Image Placeholder",
+        '<p:ph type="sldImg"/>',
+        _rect(685800, 1143000, 5486400, 3086100),
+    )
+    body = _placeholder(
+        3,
+        "Notes Placeholder",
+        '<p:ph type="body" idx="1"/>',
+        _rect(685800, 4400550, 5486400, 3600450),
+        _text_body(""),
+    )
+    return (
+        f"{_XML}<p:notesMaster {_NS}><p:cSld>{_BACKGROUND}<p:spTree>{_GROUP}{image}{body}"
+        f"</p:spTree></p:cSld>{_CLR_MAP}</p:notesMaster>"
+    )
+
+
+def _slide(number: int) -> str:
+    return (
+        f"{_XML}<p:sld {_NS}><p:cSld><p:spTree>{_GROUP}"
+        f'<p:pic><p:nvPicPr><p:cNvPr id="2" name="Slide {number}"/>'
+        '<p:cNvPicPr><a:picLocks noChangeAspect="1"/></p:cNvPicPr><p:nvPr/></p:nvPicPr>'
+        '<p:blipFill><a:blip r:embed="rId2"/><a:stretch><a:fillRect/></a:stretch></p:blipFill>'
+        f"<p:spPr>{_rect(0, 0, SLIDE_WIDTH, SLIDE_HEIGHT)}</p:spPr></p:pic>"
+        "</p:spTree></p:cSld><p:clrMapOvr><a:masterClrMapping/></p:clrMapOvr></p:sld>"
+    )
+
+
+def _notes_slide(notes: str) -> str:
+    image = _placeholder(2, "Slide Image Placeholder 1", '<p:ph type="sldImg"/>')
+    body = _placeholder(
+        3, "Notes Placeholder 2", '<p:ph type="body" idx="1"/>', body=_text_body(notes)
+    )
+    return (
+        f"{_XML}<p:notes {_NS}><p:cSld><p:spTree>{_GROUP}{image}{body}</p:spTree></p:cSld>"
+        "<p:clrMapOvr><a:masterClrMapping/></p:clrMapOvr></p:notes>"
+    )
+
+
+class PptxStream:
+    """Incremental writer for a PPTX deck with one full-bleed picture per slide.
+
+    Usage::
+
+        ps = PptxStream()
+        yield ps.add_slide(jpeg_bytes, notes="Slide text")
+        yield ps.finish()
+    """
+
+    def __init__(self) -> None:
+        self._zip = ZipStream()
+        self._slide_count = 0
+        self._media_types: set[str] = set()
+
+    @property
+    def bytes_written(self) -> int:
+        """Total number of bytes produced so far."""
+        return self._zip.bytes_written
+
+    def add_slide(self, image_data: bytes, notes: str = "") -> bytes:
+        """Add a slide showing an image, with notes, and return its parts."""
+        self._slide_count += 1
+        n = self._slide_count
+        extension = "jpg" if image_data[:3] == b"\xff\xd8\xff" else "png"
+        self._media_types.add(extension)
+
+        zs = self._zip
+        return b"".join(
+            [
+                zs.add(f"ppt/media/image{n}.{extension}", image_data),
+                zs.add(f"ppt/slides/slide{n}.xml", _slide(n).encode()),
+                zs.add(
+                    f"ppt/slides/_rels/slide{n}.xml.rels",
+                    _rels(
+                        ("rId1", "slideLayout", "../slideLayouts/slideLayout1.xml"),
+                        ("rId2", "image", f"../media/image{n}.{extension}"),
+                        ("rId3", "notesSlide", f"../notesSlides/notesSlide{n}.xml"),
+                    ).encode(),
+                ),
+                zs.add(f"ppt/notesSlides/notesSlide{n}.xml", _notes_slide(notes).encode()),
+                zs.add(
+                    f"ppt/notesSlides/_rels/notesSlide{n}.xml.rels",
+                    _rels(
+                        ("rId1", "notesMaster", "../notesMasters/notesMaster1.xml"),
+                        ("rId2", "slide", f"../slides/slide{n}.xml"),
+                    ).encode(),
+                ),
+            ]
+        )
+
+    def finish(self) -> bytes:
+        """Return the shared parts, presentation and content types, completing the deck."""
+        count = self._slide_count
+        slide_ids = "".join(
+            f'<p:sldId id="{255 + n}" r:id="rId{100 + n}"/>' for n in range(1, count + 1)
+        )
+        presentation = (
+            f'{_XML}<p:presentation {_NS} saveSubsetFonts="1">'
+            '<p:sldMasterIdLst><p:sldMasterId id="2147483648" r:id="rId1"/></p:sldMasterIdLst>'
+            '<p:notesMasterIdLst><p:notesMasterId r:id="rId2"/></p:notesMasterIdLst>'
+            f"<p:sldIdLst>{slide_ids}</p:sldIdLst>"
+            f'<p:sldSz cx="{SLIDE_WIDTH}" cy="{SLIDE_HEIGHT}"/>'
+            '<p:notesSz cx="6858000" cy="9144000"/></p:presentation>'
+        )
+        presentation_rels = _rels(
+            ("rId1", "slideMaster", "slideMasters/slideMaster1.xml"),
+            ("rId2", "notesMaster", "notesMasters/notesMaster1.xml"),
+            ("rId3", "theme", "theme/theme1.xml"),
+            ("rId4", "presProps", "presProps.xml"),
+            ("rId5", "tableStyles", "tableStyles.xml"),
+            *((f"rId{100 + n}", "slide", f"slides/slide{n}.xml") for n in range(1, count + 1)),
+        )
+
+        overrides = {
+            "/ppt/presentation.xml": "presentationml.presentation.main+xml",
+            "/ppt/slideMasters/slideMaster1.xml": "presentationml.slideMaster+xml",
+            "/ppt/slideLayouts/slideLayout1.xml": "presentationml.slideLayout+xml",
+            "/ppt/notesMasters/notesMaster1.xml": "presentationml.notesMaster+xml",
+            "/ppt/theme/theme1.xml": "theme+xml",
+            "/ppt/theme/theme2.xml": "theme+xml",
+            "/ppt/presProps.xml": "presentationml.presProps+xml",
+            "/ppt/tableStyles.xml": "presentationml.tableStyles+xml",
+        }
+        for n in range(1, count + 1):
+            overrides[f"/ppt/slides/slide{n}.xml"] = "presentationml.slide+xml"
+            overrides[f"/ppt/notesSlides/notesSlide{n}.xml"] = "presentationml.notesSlide+xml"
+        media_defaults = "".join(
+            f'<Default Extension="{ext}" ContentType="image/{"jpeg" if ext == "jpg" else ext}"/>'
+            for ext in sorted(self._media_types)
+        )
+        content_types = (
+            f'{_XML}<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+            '<Default Extension="rels" '
+            'ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+            f'<Default Extension="xml" ContentType="application/xml"/>{media_defaults}'
+            + "".join(
+                f'<Override PartName="{part}" ContentType="{_CT}.{kind}"/>'
+                for part, kind in overrides.items()
+            )
+            + "</Types>"
+        )
+
+        parts = {
+            "ppt/slideLayouts/slideLayout1.xml": _slide_layout(),
+            "ppt/slideLayouts/_rels/slideLayout1.xml.rels": _rels(
+                ("rId1", "slideMaster", "../slideMasters/slideMaster1.xml")
+            ),
+            "ppt/slideMasters/slideMaster1.xml": _slide_master(),
+            "ppt/slideMasters/_rels/slideMaster1.xml.rels": _rels(
+                ("rId1", "slideLayout", "../slideLayouts/slideLayout1.xml"),
+                ("rId2", "theme", "../theme/theme1.xml"),
+            ),
+            "ppt/notesMasters/notesMaster1.xml": _notes_master(),
+            "ppt/notesMasters/_rels/notesMaster1.xml.rels": _rels(
+                ("rId1", "theme", "../theme/theme2.xml")
+            ),
+            "ppt/theme/theme1.xml": _theme(),
+            "ppt/theme/theme2.xml": _theme(),
+            "ppt/presProps.xml": f"{_XML}<p:presentationPr {_NS}/>",
+            "ppt/tableStyles.xml": (
+                f"{_XML}<a:tblStyleLst "
+                'xmlns:a="http://schemas.openxmlformats.org/drawingml/2006/main" '
+                'def="{5C22544A-7EE6-4342-B048-85BDC9FD1C3A}"/>'
+            ),
+            "ppt/presentation.xml": presentation,
+            "ppt/_rels/presentation.xml.rels": presentation_rels,
+            "_rels/.rels": _rels(("rId1", "officeDocument", "ppt/presentation.xml")),
+            "[Content_Types].xml": content_types,
+        }
+        zs = self._zip
+        return b"".join(zs.add(name, data.encode()) for name, data in parts.items()) + zs.finish()
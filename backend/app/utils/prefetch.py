@@ -0,0 +1,47 @@
+"""Ordered, bounded read-ahead for async fetches."""
+
+import asyncio
+from collections import deque
+from collections.abc import AsyncIterator, Awaitable, Callable, Iterable
+
+
+async def prefetch_ordered[T, R](
+    items: Iterable[T],
+    fetch: Callable[[T], Awaitable[R]],
+    depth: int = 8,
+) -> AsyncIterator[tuple[T, R]]:
+    """Fetch items concurrently, up to ``depth`` ahead, yielding results in input order.
+
+    At most ``depth`` fetches are in flight (and buffered) at any time, so memory
+    stays bounded however many items there are. If the consumer stops early or
+    is cancelled, outstanding fetches are cancelled.
+
+    Args:
+        items: Items to fetch, in output order
+        fetch: Coroutine function fetching one item
+        depth: Maximum number of fetches in flight
+
+    Yields:
+        ``(item, result)`` pairs in the order of ``items``
+    """
+    iterator = iter(items)
+    pending: deque[tuple[T, asyncio.Task[R]]] = deque()
+
+    def _fill() -> None:
+        while len(pending) < max(depth, 1):
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+            pending.append((item, asyncio.ensure_future(fetch(item))))
+
+    try:
+        _fill()
+        while pending:
+            item, task = pending.popleft()
+            result = await task
+            _fill()
+            yield item, result
+    finally:
+        for _, task in pending:
+            task.cancel()
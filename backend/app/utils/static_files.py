@@ -0,0 +1,67 @@
+"""Static files with immutable caching for versioned URLs."""
+
+import os
+import re
+from mimetypes import guess_type
+from typing import Any
+from urllib.parse import quote
+
+from starlette.datastructures import Headers, QueryParams
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import NotModifiedResponse, StaticFiles
+from starlette.types import Scope
+
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+_VERSION_PATTERN = re.compile(r"^[0-9a-f]{16,64}$")
+
+
+class VersionedStaticFiles(StaticFiles):
+    """StaticFiles that lets browsers and proxies cache versioned URLs forever.
+
+    A ``?v=<hash of the file bytes>`` query (see ``versioned_url``) pins a URL
+    to one file content, so those responses are marked immutable with the hash
+    as a strong ETag. Unversioned URLs keep the default revalidation headers.
+
+    With ``accel_redirect_prefix`` set, files are not sent from Python: the
+    path is resolved and checked as usual, then handed to nginx in an
+    ``X-Accel-Redirect`` header under that (``internal``) location, and nginx
+    sends the file itself, handling Range and revalidation.
+    """
+
+    def __init__(self, *, accel_redirect_prefix: str = "", **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        self.accel_redirect_prefix = accel_redirect_prefix
+
+    def file_response(
+        self,
+        full_path: str | os.PathLike[str],
+        stat_result: os.stat_result,
+        scope: Scope,
+        status_code: int = 200,
+    ) -> Response:
+        version = QueryParams(scope["query_string"]).get("v")
+        if version is None or not _VERSION_PATTERN.match(version):
+            if self.accel_redirect_prefix:
+                return self._accel_redirect(full_path, scope, {})
+            return super().file_response(full_path, stat_result, scope, status_code)
+
+        headers = {"ETag": f'"{version}"', "Cache-Control": IMMUTABLE_CACHE_CONTROL}
+        response: Response
+        if self.accel_redirect_prefix:
+            response = self._accel_redirect(full_path, scope, headers)
+        else:
+            response = FileResponse(
+                full_path, status_code=status_code, stat_result=stat_result, headers=headers
+            )
+        if self.is_not_modified(response.headers, Headers(scope=scope)):
+            return NotModifiedResponse(response.headers)
+        return response
+
+    def _accel_redirect(
+        self, full_path: str | os.PathLike[str], scope: Scope, headers: dict[str, str]
+    ) -> Response:
+        """Hand the file to nginx; it keeps our Cache-Control and sets the body."""
+        path = quote(self.get_path(scope).replace(os.sep, "/"))
+        headers["X-Accel-Redirect"] = f"{self.accel_redirect_prefix.rstrip('/')}/{path}"
+        return Response(headers=headers, media_type=guess_type(full_path)[0])
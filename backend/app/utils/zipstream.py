@@ -0,0 +1,244 @@
+"""Streaming ZIP writer.
+
+Builds a ZIP archive incrementally: each call returns the bytes to send next,
+so an archive of any size can be streamed with constant memory. Entries are
+stored uncompressed (slide images are already compressed JPEGs) and use data
+descriptors, so the CRC does not need to be known before the data is read.
+ZIP64 records are written when sizes, offsets or the entry count exceed the
+classic format's limits.
+"""
+
+import struct
+import time
+import zlib
+from dataclasses import dataclass
+
+ZIP64_LIMIT = 0xFFFFFFFF
+ZIP_FILECOUNT_LIMIT = 0xFFFF
+
+_FLAG_DATA_DESCRIPTOR = 0x0008
+_FLAG_UTF8 = 0x0800
+_METHOD_STORED = 0
+_VERSION_DEFAULT = 20
+_VERSION_ZIP64 = 45
+_ZIP64_EXTRA_ID = 0x0001
+
+
+@dataclass
+class _Entry:
+    """Bookkeeping for one archive member, used to write the central directory."""
+
+    name: bytes
+    dos_time: int
+    dos_date: int
+    offset: int
+    zip64: bool
+    crc: int = 0
+    size: int = 0
+
+
+def _dos_datetime(timestamp: float) -> tuple[int, int]:
+    """Convert a Unix timestamp to DOS (time, date) fields."""
+    t = time.localtime(timestamp)
+    year = max(t.tm_year, 1980)
+    dos_time = (t.tm_hour << 11) | (t.tm_min << 5) | (t.tm_sec // 2)
+    dos_date = ((year - 1980) << 9) | (t.tm_mon << 5) | t.tm_mday
+    return dos_time, dos_date
+
+
+class ZipStream:
+    """Incremental writer for a stored (uncompressed) ZIP archive.
+
+    Usage::
+
+        zs = ZipStream()
+        yield zs.start_entry("01.jpg", size_hint=len(data))
+        yield zs.write(data)
+        yield zs.end_entry()
+        yield zs.finish()
+    """
+
+    def __init__(self) -> None:
+        self._entries: list[_Entry] = []
+        self._current: _Entry | None = None
+        self._offset = 0
+        self._finished = False
+
+    @property
+    def bytes_written(self) -> int:
+        """Total number of bytes produced so far."""
+        return self._offset
+
+    def _emit(self, data: bytes) -> bytes:
+        self._offset += len(data)
+        return data
+
+    def start_entry(
+        self, name: str, size_hint: int | None = None, mtime: float | None = None
+    ) -> bytes:
+        """Start a new entry and return its local file header.
+
+        Args:
+            name: Path of the entry inside the archive
+            size_hint: Expected size in bytes; entries of unknown size, or larger
+                than 4 GiB, are written as ZIP64 entries
+            mtime: Modification time (defaults to now)
+        """
+        if self._current is not None:
+            raise RuntimeError("Previous ZIP entry was not ended")
+        if self._finished:
+            raise RuntimeError("ZIP archive is already finished")
+
+        dos_time, dos_date = _dos_datetime(time.time() if mtime is None else mtime)
+        entry = _Entry(
+            name=name.encode("utf-8"),
+            dos_time=dos_time,
+            dos_date=dos_date,
+            offset=self._offset,
+            zip64=size_hint is None or size_hint >= ZIP64_LIMIT,
+        )
+        self._current = entry
+
+        extra = b""
+        header_size = 0
+        if entry.zip64:
+            # Sizes follow in the data descriptor; the extra field marks the entry as ZIP64
+            extra = struct.pack("<HHQQ", _ZIP64_EXTRA_ID, 16, 0, 0)
+            header_size = ZIP64_LIMIT
+
+        header = struct.pack(
+            "<IHHHHHIIIHH",
+            0x04034B50,
+            _VERSION_ZIP64 if entry.zip64 else _VERSION_DEFAULT,
+            _FLAG_DATA_DESCRIPTOR | _FLAG_UTF8,
+            _METHOD_STORED,
+            entry.dos_time,
+            entry.dos_date,
+            0,  # CRC-32, in the data descriptor
+            header_size,
+            header_size,
+            len(entry.name),
+            len(extra),
+        )
+        return self._emit(header + entry.name + extra)
+
+    def write(self, data: bytes) -> bytes:
+        """Add data to the current entry and return it for sending."""
+        entry = self._current
+        if entry is None:
+            raise RuntimeError("No ZIP entry started")
+        entry.crc = zlib.crc32(data, entry.crc)
+        entry.size += len(data)
+        if entry.size >= ZIP64_LIMIT and not entry.zip64:
+            raise ValueError("ZIP entry exceeded its size hint; pass size_hint=None for ZIP64")
+        return self._emit(data)
+
+    def end_entry(self) -> bytes:
+        """End the current entry and return its data descriptor."""
+        entry = self._current
+        if entry is None:
+            raise RuntimeError("No ZIP entry started")
+        self._current = None
+        self._entries.append(entry)
+
+        if entry.zip64:
+            descriptor = struct.pack("<IIQQ", 0x08074B50, entry.crc, entry.size, entry.size)
+        else:
+            descriptor = struct.pack("<IIII", 0x08074B50, entry.crc, entry.size, entry.size)
+        return self._emit(descriptor)
+
+    def add(self, name: str, data: bytes, mtime: float | None = None) -> bytes:
+        """Add a complete in-memory entry and return all of its bytes."""
+        return (
+            self.start_entry(name, size_hint=len(data), mtime=mtime)
+            + self.write(data)
+            + self.end_entry()
+        )
+
+    def finish(self) -> bytes:
+        """Return the central directory and end records, completing the archive."""
+        if self._current is not None:
+            raise RuntimeError("Last ZIP entry was not ended")
+        if self._finished:
+            raise RuntimeError("ZIP archive is already finished")
+        self._finished = True
+
+        cd_offset = self._offset
+        directory = bytearray()
+        for entry in self._entries:
+            directory += self._central_header(entry)
+        cd_size = len(directory)
+
+        end = bytearray()
+        count = len(self._entries)
+        if count >= ZIP_FILECOUNT_LIMIT or cd_offset >= ZIP64_LIMIT or cd_size >= ZIP64_LIMIT:
+            zip64_end_offset = cd_offset + cd_size
+            end += struct.pack(
+                "<IQHHIIQQQQ",
+                0x06064B50,
+                44,  # size of the remaining record
+                _VERSION_ZIP64,
+                _VERSION_ZIP64,
+                0,
+                0,
+                count,
+                count,
+                cd_size,
+                cd_offset,
+            )
+            end += struct.pack("<IIQI", 0x07064B50, 0, zip64_end_offset, 1)
+        end += struct.pack(
+            "<IHHHHIIH",
+            0x06054B50,
+            0,
+            0,
+            min(count, ZIP_FILECOUNT_LIMIT),
+            min(count, ZIP_FILECOUNT_LIMIT),
+            min(cd_size, ZIP64_LIMIT),
+            min(cd_offset, ZIP64_LIMIT),
+            0,
+        )
+        return self._emit(bytes(directory + end))
+
+    @staticmethod
+    def _central_header(entry: _Entry) -> bytes:
+        """Build the central directory record for an entry."""
+        # Values that overflow 32 bits move into the ZIP64 extra field, in this order
+        overflow: list[int] = []
+        size = entry.size
+        if size >= ZIP64_LIMIT:
+            overflow += [size, size]
+            size = ZIP64_LIMIT
+        offset = entry.offset
+        if offset >= ZIP64_LIMIT:
+            overflow.append(offset)
+            offset = ZIP64_LIMIT
+
+        extra = b""
+        if overflow:
+            extra = struct.pack(
+                f"<HH{len(overflow)}Q", _ZIP64_EXTRA_ID, 8 * len(overflow), *overflow
+            )
+        version = _VERSION_ZIP64 if overflow or entry.zip64 else _VERSION_DEFAULT
+
+        header = struct.pack(
+            "<IHHHHHHIIIHHHHHII",
+            0x02014B50,
+            version,  # version made by
+            version,  # version needed to extract
+            _FLAG_DATA_DESCRIPTOR | _FLAG_UTF8,
+            _METHOD_STORED,
+            entry.dos_time,
+            entry.dos_date,
+            entry.crc,
+            size,
+            size,
+            len(entry.name),
+            len(extra),
+            0,  # comment length
+            0,  # disk number start
+            0,  # internal attributes
+            0,  # external attributes
+            offset,
+        )
+        return header + entry.name + extra
@@ -0,0 +1,104 @@
+"""Export benchmark: time and peak memory of ZIP / PDF / PPTX exports.
+
+Builds throwaway decks of 10, 100 and 500 slides (1920x1080 noise JPEGs) in a
+temporary directory, streams each export into a byte counter, and reports wall
+time, throughput and the peak Python memory traced while streaming.
+
+Usage::
+
+    cd backend
+    uv run python -m benchmarks.export_benchmark
+    uv run python -m benchmarks.export_benchmark --slides 10 100 --formats pptx
+"""
+
+import argparse
+import asyncio
+import io
+import random
+import tempfile
+import time
+import tracemalloc
+
+from PIL import Image
+
+from app.models import Slide, SlideImage
+from app.repositories import ImageRepository, SlidesRepository
+from app.services import ExportService
+
+DEFAULT_SLIDE_COUNTS = (10, 100, 500)
+FORMATS = ("zip", "pdf", "pptx")
+
+
+def _noise_jpeg(seed: int) -> bytes:
+    """A 1920x1080 JPEG of random noise, so it does not compress unrealistically well."""
+    noise = random.Random(seed).randbytes(480 * 270 * 3)
+    tile = Image.frombytes("RGB", (480, 270), noise)
+    image = tile.resize((1920, 1080))
+    buffer = io.BytesIO()
+    image.save(buffer, format="JPEG", quality=85)
+    return buffer.getvalue()
+
+
+async def _build_deck(base: str, slide_count: int) -> str:
+    """Create a project of ``slide_count`` slides, each with one selected image."""
+    slug = f"bench-{slide_count}"
+    slides_repository = SlidesRepository(base)
+    image_repository = ImageRepository(base)
+    # A handful of distinct images is enough; reads still hit separate files
+    images = [_noise_jpeg(i) for i in range(8)]
+
+    project = await slides_repository.create_project(slug)
+    for i in range(slide_count):
+        sid = f"s{i:04d}"
+        image_hash = f"h{i:04d}"
+        await image_repository.save_image(slug, sid, image_hash, images[i % len(images)])
+        project.slides.append(
+            Slide(
+                sid=sid,
+                content=f"Slide {i + 1}\nSpeaker notes for slide {i + 1}.",
+                images=[SlideImage(hash=image_hash, path=f"images/{sid}/{image_hash}.jpg")],
+            )
+        )
+    await slides_repository.save_project(project)
+    return slug
+
+
+async def _run_export(
+    service: ExportService, slug: str, export_format: str
+) -> tuple[int, float, int]:
+    """Stream one export, returning ``(bytes, seconds, peak traced bytes)``."""
+    export = getattr(service, f"export_{export_format}")
+    tracemalloc.start()
+    started = time.perf_counter()
+    size = 0
+    async for chunk in await export(slug):
+        size += len(chunk)
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return size, elapsed, peak
+
+
+async def main(slide_counts: list[int], formats: list[str]) -> None:
+    with tempfile.TemporaryDirectory() as base:
+        service = ExportService(SlidesRepository(base), ImageRepository(base))
+        print(
+            f"{'format':<6} {'slides':>6} {'size MB':>9} {'seconds':>8} {'MB/s':>8} {'peak MB':>8}"
+        )
+        for slide_count in slide_counts:
+            slug = await _build_deck(base, slide_count)
+            for export_format in formats:
+                size, elapsed, peak = await _run_export(service, slug, export_format)
+                mb = size / (1024 * 1024)
+                print(
+                    f"{export_format:<6} {slide_count:>6} {mb:>9.1f} {elapsed:>8.2f} "
+                    f"{mb / elapsed:>8.1f} {peak / (1024 * 1024):>8.1f}"
+                )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--slides", type=int, nargs="+", default=list(DEFAULT_SLIDE_COUNTS))
+    parser.add_argument("--formats", nargs="+", choices=FORMATS, default=list(FORMATS))
+    args = parser.parse_args()
+    asyncio.run(main(args.slides, args.formats))
@@ -0,0 +1,116 @@
+"""Project view benchmark: ``GET /api/slides/{slug}`` for 10, 100 and 1000 slides.
+
+Builds throwaway decks (each slide with a few regenerations in its image
+history) in a temporary directory and reports, per deck size:
+
+- ``validate``: ms to validate the encoded project against ``ProjectResponse``
+  and dump it to JSON, the work ``response_model`` did on every request
+- ``encode``: ms to encode the project directly, as the route does now
+- ``GET``: ms per request through the whole app, full and with
+  ``?include=style`` (selected images only, no cost)
+
+Usage::
+
+    cd backend
+    uv run python -m benchmarks.project_benchmark
+    uv run python -m benchmarks.project_benchmark --slides 100 --repeat 50
+"""
+
+import argparse
+import asyncio
+import logging
+import tempfile
+import time
+from collections.abc import Callable
+from typing import Any
+
+import httpx
+
+from app.api.dependencies import get_slides_repository, get_slides_service
+from app.api.responses import FastJSONResponse
+from app.api.schemas import ProjectResponse
+from app.api.serializers import project_to_dict
+from app.main import app
+from app.models import Project, Slide, SlideImage
+from app.repositories import SlidesRepository
+from app.services import SlidesService
+
+DEFAULT_SLIDE_COUNTS = (10, 100, 1000)
+IMAGES_PER_SLIDE = 4
+BREAKDOWN = {"style_cost": 0.02, "slides_cost": 0.0}
+
+
+async def _build_deck(repository: SlidesRepository, slide_count: int) -> Project:
+    """Create a project of ``slide_count`` slides, each with an image history."""
+    project = await repository.create_project(f"bench-{slide_count}")
+    for i in range(slide_count):
+        sid = f"s{i:04d}"
+        images = [
+            SlideImage(
+                hash=f"{i:04d}{j:012d}",
+                path=f"images/{sid}/{i:04d}{j:012d}.jpg",
+                engine="mock",
+                data_hash=f"{j:04d}{i:012d}",
+            )
+            for j in range(IMAGES_PER_SLIDE)
+        ]
+        project.slides.append(
+            Slide(sid=sid, content=f"# Slide {i + 1}\n\n" + "Some content. " * 20, images=images)
+        )
+    await repository.save_project(project)
+    return project
+
+
+def _time_ms(fn: Callable[[], Any], repeat: int) -> float:
+    started = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - started) * 1000 / repeat
+
+
+async def _time_get_ms(client: httpx.AsyncClient, url: str, repeat: int) -> float:
+    started = time.perf_counter()
+    for _ in range(repeat):
+        response = await client.get(url)
+        response.raise_for_status()
+    return (time.perf_counter() - started) * 1000 / repeat
+
+
+async def main(slide_counts: list[int], repeat: int) -> None:
+    with tempfile.TemporaryDirectory() as base:
+        repository = SlidesRepository(base)
+        app.dependency_overrides[get_slides_repository] = lambda: repository
+        app.dependency_overrides[get_slides_service] = lambda: SlidesService(repository)
+        transport = httpx.ASGITransport(app=app)
+        print(
+            f"{'slides':>6} {'JSON KB':>8} {'validate ms':>12} {'encode ms':>10} "
+            f"{'GET ms':>8} {'GET ?include ms':>16}"
+        )
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            for slide_count in slide_counts:
+                project = await _build_deck(repository, slide_count)
+                encoded = FastJSONResponse(project_to_dict(project, BREAKDOWN))
+                body = encoded.body
+                validate = _time_ms(
+                    lambda: ProjectResponse.model_validate_json(body).model_dump_json(), repeat
+                )
+                encode = _time_ms(
+                    lambda: encoded.render(project_to_dict(project, BREAKDOWN)), repeat
+                )
+                url = f"/api/slides/{project.slug}"
+                get = await _time_get_ms(client, url, repeat)
+                get_trimmed = await _time_get_ms(client, f"{url}?include=style", repeat)
+                print(
+                    f"{slide_count:>6} {len(body) / 1024:>8.0f} {validate:>12.2f} {encode:>10.2f} "
+                    f"{get:>8.2f} {get_trimmed:>16.2f}"
+                )
+        app.dependency_overrides.clear()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--slides", type=int, nargs="+", default=list(DEFAULT_SLIDE_COUNTS))
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    asyncio.run(main(args.slides, args.repeat))
@@ -0,0 +1,93 @@
+"""Static image benchmark: requests per second with and without X-Accel-Redirect.
+
+Serves a directory of slide-sized JPEGs through the slides static mount, once
+streaming the files from Python and once answering with ``X-Accel-Redirect``
+as it does behind nginx, and reports requests per second and throughput for
+each. Requests go straight to the ASGI app, so this measures the backend's
+own work per image; with X-Accel-Redirect nginx then sends the file with
+sendfile, outside the Python process.
+
+To compare the whole path through nginx, point ``--url`` at a deployed image
+(e.g. ``http://localhost:5173/static/slides/<slug>/images/<sid>/<hash>.jpg``)
+and run it with ``STATIC_ACCEL_REDIRECT_PREFIX`` set and unset on the backend.
+
+Usage::
+
+    cd backend
+    uv run python -m benchmarks.static_benchmark
+    uv run python -m benchmarks.static_benchmark --requests 5000 --concurrency 64
+    uv run python -m benchmarks.static_benchmark --url http://localhost:5173/static/...
+"""
+
+import argparse
+import asyncio
+import tempfile
+import time
+from pathlib import Path
+
+import httpx
+from starlette.applications import Starlette
+from starlette.routing import Mount
+
+from app.utils import VersionedStaticFiles
+from benchmarks.export_benchmark import _noise_jpeg
+
+IMAGE_COUNT = 16
+
+
+async def _run(
+    client: httpx.AsyncClient, urls: list[str], requests: int, concurrency: int
+) -> tuple[float, int]:
+    """Fetch ``requests`` URLs round-robin, returning ``(seconds, body bytes)``."""
+    queue: asyncio.Queue[str] = asyncio.Queue()
+    for i in range(requests):
+        queue.put_nowait(urls[i % len(urls)])
+    received = 0
+
+    async def _worker() -> None:
+        nonlocal received
+        while not queue.empty():
+            response = await client.get(queue.get_nowait())
+            response.raise_for_status()
+            received += len(response.content)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(_worker() for _ in range(concurrency)))
+    return time.perf_counter() - started, received
+
+
+def _report(mode: str, requests: int, elapsed: float, received: int) -> None:
+    mb = received / (1024 * 1024)
+    print(f"{mode:<16} {requests:>8} {requests / elapsed:>10.0f} {mb / elapsed:>10.1f}")
+
+
+async def main(requests: int, concurrency: int, url: str | None) -> None:
+    print(f"{'mode':<16} {'requests':>8} {'req/s':>10} {'MB/s':>10}")
+    if url is not None:
+        async with httpx.AsyncClient() as client:
+            elapsed, received = await _run(client, [url], requests, concurrency)
+        _report("url", requests, elapsed, received)
+        return
+
+    with tempfile.TemporaryDirectory() as base:
+        urls = []
+        for i in range(IMAGE_COUNT):
+            (Path(base) / f"{i:02d}.jpg").write_bytes(_noise_jpeg(i))
+            urls.append(f"/static/{i:02d}.jpg")
+
+        for mode, prefix in (("python", ""), ("x-accel-redirect", "/_slides/")):
+            static = VersionedStaticFiles(directory=base, accel_redirect_prefix=prefix)
+            app = Starlette(routes=[Mount("/static", static)])
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+                elapsed, received = await _run(client, urls, requests, concurrency)
+            _report(mode, requests, elapsed, received)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--url", help="Benchmark a deployed image URL instead")
+    args = parser.parse_args()
+    asyncio.run(main(args.requests, args.concurrency, args.url))
@@ -0,0 +1,90 @@
+"""WebSocket fan-out benchmark: broadcast latency as viewers per deck grow.
+
+Registers ``N`` in-process clients on one deck, each taking ``--send-ms`` per
+message (a network write), with one of them stalled (its sends never
+complete), then broadcasts ``--messages`` events and reports, per viewer
+count:
+
+- ``broadcast``: ms per ``broadcast`` call, i.e. how long the publisher
+  (a request or a generation task) is held up
+- ``delivered``: ms from a broadcast until every healthy client has it
+- ``dropped``: whether the stalled client was disconnected
+
+Usage::
+
+    cd backend
+    uv run python -m benchmarks.ws_benchmark
+    uv run python -m benchmarks.ws_benchmark --viewers 10 100 --messages 200
+"""
+
+import argparse
+import asyncio
+import time
+
+from app.api.routes.websocket import ConnectionManager
+
+DEFAULT_VIEWER_COUNTS = (1, 10, 100, 1000)
+
+
+class _Client:
+    """Stands in for a WebSocket; counts what it receives."""
+
+    def __init__(self, send_seconds: float, stalled: bool = False) -> None:
+        self.send_seconds = send_seconds
+        self.stalled = stalled
+        self.received = 0
+        self.closed = False
+
+    async def accept(self) -> None:
+        pass
+
+    async def send_json(self, message: object) -> None:
+        pass
+
+    async def send_text(self, text: str) -> None:
+        if self.stalled:
+            await asyncio.Event().wait()
+        await asyncio.sleep(self.send_seconds)
+        self.received += 1
+
+    async def close(self, code: int = 1000, reason: str | None = None) -> None:
+        self.closed = True
+
+
+async def _run(viewers: int, messages: int, send_seconds: float) -> tuple[float, float, bool]:
+    """Returns ``(ms per broadcast, ms per delivery, stalled client dropped)``."""
+    manager = ConnectionManager()
+    stalled = _Client(send_seconds, stalled=True)
+    clients = [_Client(send_seconds) for _ in range(viewers)]
+    for client in [stalled, *clients]:
+        await manager.connect("bench", client)  # type: ignore[arg-type]
+
+    broadcast_total = 0.0
+    delivered_total = 0.0
+    for i in range(messages):
+        started = time.perf_counter()
+        await manager.broadcast("bench", {"type": "slide_deleted", "data": {"sid": f"s{i}"}})
+        broadcast_total += time.perf_counter() - started
+        while any(client.received <= i for client in clients):
+            await asyncio.sleep(0)
+        delivered_total += time.perf_counter() - started
+
+    for connection in list(manager.active_connections.get("bench", [])):
+        manager.disconnect("bench", connection.websocket)
+    return broadcast_total * 1000 / messages, delivered_total * 1000 / messages, stalled.closed
+
+
+async def main(viewer_counts: list[int], messages: int, send_ms: float) -> None:
+    print(f"{'viewers':>7} {'broadcast ms':>13} {'delivered ms':>13} {'dropped':>8}")
+    for viewers in viewer_counts:
+        broadcast, delivered, dropped = await _run(viewers, messages, send_ms / 1000)
+        print(f"{viewers:>7} {broadcast:>13.3f} {delivered:>13.2f} {str(dropped):>8}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--viewers", type=int, nargs="+", default=list(DEFAULT_VIEWER_COUNTS))
+    parser.add_argument("--messages", type=int, default=100)
+    parser.add_argument("--send-ms", type=float, default=1.0)
+    args = parser.parse_args()
+    asyncio.run(main(args.viewers, args.messages, args.send_ms))
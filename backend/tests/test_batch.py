@@ -0,0 +1,122 @@
+"""Tests for batched slide edits."""
+
+from collections.abc import AsyncGenerator
+from typing import Any
+
+import pytest
+from httpx import AsyncClient
+
+from app.api.routes.websocket import manager
+from app.repositories import SlidesRepository
+
+
+@pytest.fixture(autouse=True)
+async def _cleanup(client: AsyncClient) -> AsyncGenerator[None, None]:
+    """Delete the project the tests write to."""
+    yield
+    await client.delete("/api/slides/test-batch")
+
+
+@pytest.fixture
+def events(monkeypatch: pytest.MonkeyPatch) -> list[dict[str, Any]]:
+    """Capture WebSocket broadcasts."""
+    captured: list[dict[str, Any]] = []
+
+    async def _broadcast(slug: str, message: dict[str, Any], replay: bool = True) -> None:
+        captured.append(message)
+
+    monkeypatch.setattr(manager, "broadcast", _broadcast)
+    return captured
+
+
+@pytest.mark.asyncio
+async def test_batch_applies_operations_in_one_write(
+    client: AsyncClient, events: list[dict[str, Any]], monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """All operations are saved with a single write and announced with one event."""
+    first = (await client.post("/api/slides/test-batch", json={"content": "First"})).json()
+    second = (await client.post("/api/slides/test-batch", json={"content": "Second"})).json()
+
+    saves = 0
+    save_project = SlidesRepository.save_project
+
+    async def _counting_save(self: SlidesRepository, project: Any) -> str:
+        nonlocal saves
+        saves += 1
+        return await save_project(self, project)
+
+    monkeypatch.setattr(SlidesRepository, "save_project", _counting_save)
+    events.clear()
+
+    response = await client.post(
+        "/api/slides/test-batch/batch",
+        json={
+            "operations": [
+                {"op": "title", "title": "Outline"},
+                {"op": "create", "content": "Intro", "ref": "intro"},
+                {"op": "create", "content": "Details", "after_sid": "intro", "ref": "details"},
+                {"op": "update", "sid": first["sid"], "content": "First, edited"},
+                {"op": "update", "sid": "intro", "content": "Introduction"},
+                {"op": "delete", "sid": second["sid"]},
+                {"op": "reorder", "order": ["intro", "details", first["sid"]]},
+            ]
+        },
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert saves == 1
+
+    intro, details = data["refs"]["intro"], data["refs"]["details"]
+    assert data["title"] == "Outline"
+    assert [(s["sid"], s["content"]) for s in data["slides"]] == [
+        (intro, "Introduction"),
+        (details, "Details"),
+        (first["sid"], "First, edited"),
+    ]
+
+    assert [e["type"] for e in events] == ["slides_updated"]
+    event = events[0]["data"]
+    assert [(s["sid"], s["content"]) for s in event["slides"]] == [
+        (intro, "Introduction"),
+        (details, "Details"),
+        (first["sid"], "First, edited"),
+    ]
+    assert event["deleted"] == [second["sid"]]
+    assert event["order"] == [intro, details, first["sid"]]
+    assert event["title"] == "Outline"
+
+
+@pytest.mark.asyncio
+async def test_failed_batch_changes_nothing(
+    client: AsyncClient, events: list[dict[str, Any]]
+) -> None:
+    """A failing operation rejects the whole batch and reports its index."""
+    slide = (await client.post("/api/slides/test-batch", json={"content": "Keep"})).json()
+    before = (await client.get("/api/slides/test-batch")).json()
+    events.clear()
+
+    response = await client.post(
+        "/api/slides/test-batch/batch",
+        json={
+            "operations": [
+                {"op": "update", "sid": slide["sid"], "content": "Changed"},
+                {"op": "create", "content": "New"},
+                {"op": "delete", "sid": "missing"},
+            ]
+        },
+    )
+    assert response.status_code == 404
+    assert response.json()["error"]["message"] == "Operation 2: Slide 'missing' not found"
+    assert (await client.get("/api/slides/test-batch")).json() == before
+    assert events == []
+
+    partial_order = await client.post(
+        "/api/slides/test-batch/batch",
+        json={"operations": [{"op": "reorder", "order": []}]},
+    )
+    assert partial_order.status_code == 400
+
+    unknown = await client.post(
+        "/api/slides/test-batch/batch", json={"operations": [{"op": "explode"}]}
+    )
+    assert unknown.status_code == 422
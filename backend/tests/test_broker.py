@@ -0,0 +1,113 @@
+"""Tests for the brokers that connect WebSocket managers across workers."""
+
+import asyncio
+import json
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from app.api.routes.websocket import ConnectionManager
+from app.services import InMemoryBroker, SqliteBroker
+
+
+class _FakeSocket:
+    """Records the messages the manager sends."""
+
+    def __init__(self) -> None:
+        self.received: list[dict[str, Any]] = []
+
+    async def accept(self) -> None:
+        pass
+
+    async def send_json(self, message: dict[str, Any]) -> None:
+        self.received.append(message)
+
+    async def send_text(self, text: str) -> None:
+        self.received.append(json.loads(text))
+
+
+async def _wait_for(condition: Any, timeout: float = 2.0) -> None:
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not condition():
+        assert asyncio.get_running_loop().time() < deadline, "timed out"
+        await asyncio.sleep(0.01)
+
+
+@pytest.mark.asyncio
+async def test_sqlite_broker_fans_out_across_workers(temp_slides_dir: Path) -> None:
+    """A message broadcast by one worker reaches clients of another, numbered once."""
+    path = str(temp_slides_dir / "broker.db")
+    workers = [
+        ConnectionManager(SqliteBroker(path, poll_interval=0.01)),
+        ConnectionManager(SqliteBroker(path, poll_interval=0.01)),
+    ]
+    for worker in workers:
+        await worker.start()
+    assert workers[0].epoch == workers[1].epoch
+    sockets = [_FakeSocket(), _FakeSocket()]
+    try:
+        for worker, socket in zip(workers, sockets, strict=True):
+            await worker.connect("deck", socket)  # type: ignore[arg-type]
+
+        await workers[0].broadcast("deck", {"type": "slide_deleted", "data": {"sid": "a"}})
+        await workers[1].broadcast("deck", {"type": "slide_deleted", "data": {"sid": "b"}})
+        await workers[1].broadcast("deck", {"type": "generation_progress"}, replay=False)
+        await _wait_for(lambda: all(len(s.received) == 4 for s in sockets))
+
+        for socket in sockets:
+            assert [(m.get("seq"), m["type"]) for m in socket.received[1:]] == [
+                (1, "slide_deleted"),
+                (2, "slide_deleted"),
+                (None, "generation_progress"),
+            ]
+
+        # Generating tasks registered by one worker are synced by the other
+        await workers[0].add_generating_task("deck", "s1", "task-1")
+        assert await workers[1].get_generating_sids("deck") == ["s1"]
+        await workers[1].remove_generating_task("deck", "s1", "stale-task")
+        assert await workers[1].get_generating_sids("deck") == ["s1"]
+
+        # A worker started later replays retained messages to reconnecting clients
+        late = ConnectionManager(SqliteBroker(path, poll_interval=0.01))
+        await late.start()
+        resumed = _FakeSocket()
+        await late.connect("deck", resumed, last_seq=1, epoch=late.epoch)  # type: ignore[arg-type]
+        assert [m.get("seq") for m in resumed.received] == [None, None, 2]
+        assert resumed.received[1]["type"] == "sync_generating_tasks"
+        await late.close()
+    finally:
+        await workers[0].close()
+        # The closing worker's tasks are forgotten
+        assert await workers[1].get_generating_sids("deck") == []
+        await workers[1].close()
+
+
+@pytest.mark.asyncio
+async def test_sqlite_broker_drops_tasks_of_a_silent_worker(temp_slides_dir: Path) -> None:
+    """Tasks of a worker that died without closing the broker do not stay forever."""
+    path = str(temp_slides_dir / "broker.db")
+    crashed = SqliteBroker(path, poll_interval=0.01, worker_timeout=0.1)
+    await crashed.add_generating_task("deck", "s1", "t1")
+    crashed._db.close()  # Never polls again, never cleans up
+
+    live = SqliteBroker(path, poll_interval=0.01, worker_timeout=0.1)
+    await live.add_generating_task("deck", "s2", "t2")
+    await live.start()
+    try:
+        await asyncio.sleep(0.3)
+        assert await live.get_generating_sids("deck") == ["s2"]
+    finally:
+        await live.close()
+
+
+@pytest.mark.asyncio
+async def test_in_memory_broker_tracks_tasks() -> None:
+    """A stale task cannot untrack a newer generation of the same slide."""
+    broker = InMemoryBroker()
+    await broker.add_generating_task("deck", "s1", "old")
+    await broker.add_generating_task("deck", "s1", "new")
+    await broker.remove_generating_task("deck", "s1", "old")
+    assert await broker.get_generating_sids("deck") == ["s1"]
+    await broker.remove_generating_task("deck", "s1", "new")
+    assert await broker.get_generating_sids("deck") == []
@@ -0,0 +1,40 @@
+"""Tests for the on-disk cache repository."""
+
+import os
+import time
+from pathlib import Path
+
+import pytest
+
+from app.repositories import CacheRepository
+
+
+@pytest.mark.asyncio
+async def test_evicts_least_recently_used_over_size_cap(tmp_path: Path) -> None:
+    """When over the size cap, the least recently used entries are evicted first."""
+    cache = CacheRepository(str(tmp_path), max_bytes=250, max_age_seconds=3600)
+    await cache.put("aa01", b"x" * 100)
+    await cache.put("bb02", b"x" * 100)
+
+    # Make "aa01" the most recently used entry
+    old = time.time() - 60
+    os.utime(tmp_path / "bb" / "bb02.jpg", (old, old))
+    assert await cache.get("aa01") is not None
+
+    await cache.put("cc03", b"x" * 100)
+
+    assert await cache.get("bb02") is None
+    assert await cache.get("aa01") is not None
+    assert await cache.get("cc03") is not None
+
+
+@pytest.mark.asyncio
+async def test_expired_entries_are_misses(tmp_path: Path) -> None:
+    """Entries idle for longer than max_age_seconds are treated as misses."""
+    cache = CacheRepository(str(tmp_path), max_bytes=1 << 20, max_age_seconds=30)
+    path = await cache.put("aa01", b"data")
+    old = time.time() - 60
+    os.utime(path, (old, old))
+
+    assert await cache.get("aa01") is None
+    assert not path.exists()
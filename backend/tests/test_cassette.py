@@ -0,0 +1,85 @@
+"""Tests for the engine record/replay cassette."""
+
+import asyncio
+import json
+from collections.abc import Generator
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from app.api import dependencies
+from app.config import Settings
+from app.exceptions import AppError
+from app.services import CassetteImageService, MockImageService, VolcEngineService
+
+
+@pytest.mark.asyncio
+async def test_replay_serves_recorded_responses(tmp_path: Path) -> None:
+    """Recorded payloads are replayed without calling the wrapped engine."""
+    recorder = CassetteImageService(
+        MockImageService(latency_mean=0, image_width=160), str(tmp_path), mode="record"
+    )
+    recorded = await recorder.generate_slide_image("Hello", b"style", "prompt")
+    styles = await recorder.generate_style_images("minimal", count=2)
+
+    failing = MockImageService(latency_mean=0, failure_rate=1.0, image_width=160)
+    player = CassetteImageService(failing, str(tmp_path), mode="replay", replay_timing=False)
+
+    assert await player.generate_slide_image("Hello", b"style", "prompt") == recorded
+    assert await player.generate_style_images("minimal", count=2) == styles
+
+
+@pytest.mark.asyncio
+async def test_replay_miss_and_recorded_errors(tmp_path: Path) -> None:
+    """Unrecorded requests miss; recorded failures are replayed as errors."""
+    failing = MockImageService(latency_mean=0, failure_rate=1.0, image_width=160)
+    recorder = CassetteImageService(failing, str(tmp_path), mode="record")
+    with pytest.raises(AppError):
+        await recorder.generate_slide_image("Hello", b"style", "prompt")
+
+    player = CassetteImageService(failing, str(tmp_path), mode="replay", replay_timing=False)
+    with pytest.raises(AppError) as exc_info:
+        await player.generate_slide_image("Hello", b"style", "prompt")
+    assert exc_info.value.code == "GENERATION_FAILED"
+
+    with pytest.raises(AppError) as exc_info:
+        await player.generate_slide_image("Other", b"style", "prompt")
+    assert exc_info.value.code == "CASSETTE_MISS"
+
+
+@pytest.fixture
+def recording_settings(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> Generator[Settings, None, None]:
+    """Record engine calls into tmp_path; engine getters are rebuilt around the test."""
+    settings = Settings(engine_cassette_mode="record", engine_cassette_path=str(tmp_path))
+    monkeypatch.setattr(dependencies, "get_settings", lambda: settings)
+    dependencies.get_volcengine_service.cache_clear()
+    yield settings
+    dependencies.get_volcengine_service.cache_clear()
+
+
+@pytest.mark.asyncio
+async def test_concurrent_requests_record_every_take(
+    recording_settings: Settings, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Requests recording at once through the engine dependency each keep their take."""
+
+    async def _generate(self: VolcEngineService, **kwargs: Any) -> bytes:
+        await asyncio.sleep(0.01)
+        return b"image"
+
+    monkeypatch.setattr(VolcEngineService, "generate_slide_image", _generate)
+
+    async def _request() -> bytes:
+        engine = dependencies.get_volcengine_service()  # As each request resolves it
+        return await engine.generate_slide_image("Hello", b"style", "prompt")
+
+    await asyncio.gather(*(_request() for _ in range(3)))
+
+    (cassette_path,) = (tmp_path / "volcengine").glob("*.json")
+    cassette = json.loads(cassette_path.read_text())
+    assert [take["payloads"] for take in cassette["takes"]] == [
+        [f"{cassette_path.stem}-{i}-0.jpg"] for i in range(3)
+    ]
@@ -0,0 +1,95 @@
+"""Tests for project change events sent over WebSocket."""
+
+from collections.abc import AsyncGenerator
+from typing import Any
+
+import pytest
+from httpx import AsyncClient
+
+from app.api.routes.websocket import manager
+from app.models import ProjectEvent
+from app.services import EventBus
+
+
+@pytest.fixture(autouse=True)
+async def _cleanup(client: AsyncClient) -> AsyncGenerator[None, None]:
+    """Delete the project the tests write to."""
+    yield
+    await client.delete("/api/slides/test-events")
+
+
+@pytest.fixture
+def events(monkeypatch: pytest.MonkeyPatch) -> list[dict[str, Any]]:
+    """Capture WebSocket broadcasts."""
+    captured: list[dict[str, Any]] = []
+
+    async def _broadcast(slug: str, message: dict[str, Any], replay: bool = True) -> None:
+        captured.append(message)
+
+    monkeypatch.setattr(manager, "broadcast", _broadcast)
+    return captured
+
+
+async def _etag_version(client: AsyncClient) -> str:
+    response = await client.get("/api/slides/test-events")
+    return response.headers["etag"].strip('"')
+
+
+@pytest.mark.asyncio
+async def test_slide_edits_are_published_with_the_project_version(
+    client: AsyncClient, events: list[dict[str, Any]]
+) -> None:
+    """Each edit sends one delta event stamped with the version a GET then reports."""
+    first = (await client.post("/api/slides/test-events", json={"content": "First"})).json()
+    assert [e["type"] for e in events] == ["slide_created"]
+    assert events[-1]["data"]["index"] == 0
+    assert events[-1]["data"]["slide"]["content"] == "First"
+    assert events[-1]["version"] == await _etag_version(client)
+
+    second = (
+        await client.post(
+            "/api/slides/test-events", json={"content": "Second", "after_sid": first["sid"]}
+        )
+    ).json()
+    assert events[-1]["data"]["index"] == 1
+
+    await client.put(f"/api/slides/test-events/{first['sid']}", json={"content": "Edited"})
+    assert events[-1]["type"] == "slide_updated"
+    assert events[-1]["data"]["slide"]["content"] == "Edited"
+
+    await client.put(
+        "/api/slides/test-events/reorder", json={"order": [second["sid"], first["sid"]]}
+    )
+    assert events[-1]["type"] == "slides_reordered"
+    assert events[-1]["data"] == {"order": [second["sid"], first["sid"]]}
+
+    await client.put("/api/slides/test-events/title", json={"title": "Deck"})
+    assert events[-1]["type"] == "title_updated"
+    assert events[-1]["data"] == {"title": "Deck"}
+
+    await client.delete(f"/api/slides/test-events/{second['sid']}")
+    assert events[-1]["type"] == "slide_deleted"
+    assert events[-1]["data"] == {"sid": second["sid"]}
+    assert events[-1]["version"] == await _etag_version(client)
+
+    assert len(events) == 6
+    assert len({e["version"] for e in events}) == 6
+
+
+@pytest.mark.asyncio
+async def test_failing_subscriber_does_not_break_publishing() -> None:
+    """A subscriber error is logged; the others still get the event."""
+    bus = EventBus()
+    received: list[ProjectEvent] = []
+
+    async def _failing(event: ProjectEvent) -> None:
+        raise RuntimeError("boom")
+
+    async def _recording(event: ProjectEvent) -> None:
+        received.append(event)
+
+    bus.subscribe(_failing)
+    bus.subscribe(_recording)
+    event = ProjectEvent(slug="s", type="slide_deleted", version="v1", data={"sid": "a"})
+    await bus.publish(event)
+    assert received == [event]
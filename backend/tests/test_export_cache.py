@@ -0,0 +1,94 @@
+"""Tests for the export cache, ETags and Range requests on exports."""
+
+from pathlib import Path
+
+import pytest
+from httpx import AsyncClient
+
+from app.api.dependencies import get_export_service
+from app.main import app
+from app.models import Slide, SlideImage
+from app.repositories import CacheRepository, ImageRepository, SlidesRepository
+from app.services import ExportService
+
+
+async def _make_deck(
+    slides_repository: SlidesRepository, image_repository: ImageRepository
+) -> None:
+    project = await slides_repository.create_project("deck")
+    for i, payload in enumerate([b"one", b"two"]):
+        sid = f"s{i}"
+        await image_repository.save_image("deck", sid, f"h{i}", payload)
+        project.slides.append(
+            Slide(
+                sid=sid,
+                content=f"Slide {i}",
+                images=[SlideImage(hash=f"h{i}", path=f"images/{sid}/h{i}.jpg")],
+            )
+        )
+    await slides_repository.save_project(project)
+
+
+@pytest.mark.asyncio
+async def test_export_is_cached_and_revalidated(client: AsyncClient, tmp_path: Path) -> None:
+    """A repeat export is served from the cache, with 304s and Range support."""
+    slides_repository = SlidesRepository(str(tmp_path / "slides"))
+    image_repository = ImageRepository(str(tmp_path / "slides"))
+    cache = CacheRepository(
+        str(tmp_path / "exports"), max_bytes=1 << 20, max_age_seconds=3600, suffix=".export"
+    )
+    service = ExportService(slides_repository, image_repository, export_cache=cache)
+    app.dependency_overrides[get_export_service] = lambda: service
+    await _make_deck(slides_repository, image_repository)
+
+    first = await client.get("/api/slides/deck/export")
+    assert first.status_code == 200
+    etag = first.headers["etag"]
+    assert list((tmp_path / "exports").glob("*/*.export"))
+    assert not list((tmp_path / "exports").glob("*/*.tmp"))
+
+    second = await client.get("/api/slides/deck/export")
+    assert second.content == first.content
+    assert second.headers["etag"] == etag
+    assert second.headers["accept-ranges"] == "bytes"
+
+    partial = await client.get("/api/slides/deck/export", headers={"Range": "bytes=0-3"})
+    assert partial.status_code == 206
+    assert partial.content == first.content[:4]
+
+    unchanged = await client.get("/api/slides/deck/export", headers={"If-None-Match": etag})
+    assert unchanged.status_code == 304
+
+    # Other formats, and a changed slide order, get their own ETag
+    pptx = await client.get("/api/slides/deck/export?format=pptx", headers={"If-None-Match": etag})
+    assert pptx.status_code == 200
+    assert pptx.headers["etag"] != etag
+
+    project = await slides_repository.get_project("deck")
+    assert project is not None
+    project.slides.reverse()
+    await slides_repository.save_project(project)
+    reordered = await client.get("/api/slides/deck/export", headers={"If-None-Match": etag})
+    assert reordered.status_code == 200
+    assert reordered.headers["etag"] != etag
+
+
+@pytest.mark.asyncio
+async def test_partial_stream_is_not_cached(tmp_path: Path) -> None:
+    """A stream that is not read to the end leaves no entry or temporary file."""
+    cache = CacheRepository(str(tmp_path), max_bytes=1 << 20, max_age_seconds=3600)
+
+    async def _chunks():  # type: ignore[no-untyped-def]
+        for chunk in (b"a", b"b", b"c"):
+            yield chunk
+
+    stream = cache.put_stream("aa01", _chunks())
+    assert await anext(stream) == b"a"
+    await stream.aclose()  # type: ignore[attr-defined]
+
+    assert await cache.get("aa01") is None
+    assert not any(tmp_path.rglob("*.tmp"))
+
+    complete = [chunk async for chunk in cache.put_stream("aa01", _chunks())]
+    assert complete == [b"a", b"b", b"c"]
+    assert await cache.get("aa01") == b"abc"
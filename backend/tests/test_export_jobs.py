@@ -0,0 +1,94 @@
+"""Tests for background export jobs and their expiring downloads."""
+
+import io
+import zipfile
+from pathlib import Path
+from typing import Any
+
+import pytest
+from httpx import AsyncClient
+
+from app.api.dependencies import get_export_service, get_task_registry
+from app.api.routes.websocket import manager
+from app.main import app
+from app.models import Slide, SlideImage
+from app.repositories import DownloadRepository, ImageRepository, SlidesRepository
+from app.services import ExportService
+
+
+@pytest.mark.asyncio
+async def test_export_job_reports_progress_and_download(
+    client: AsyncClient, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """A background export broadcasts progress, then a Range-capable download link."""
+    events: list[dict[str, Any]] = []
+
+    async def _broadcast(slug: str, message: dict[str, Any], replay: bool = True) -> None:
+        events.append(message)
+
+    monkeypatch.setattr(manager, "broadcast", _broadcast)
+
+    slides_repository = SlidesRepository(str(tmp_path / "slides"))
+    image_repository = ImageRepository(str(tmp_path / "slides"))
+    downloads = DownloadRepository(str(tmp_path / "downloads"), ttl_seconds=3600)
+    service = ExportService(slides_repository, image_repository, download_repository=downloads)
+    app.dependency_overrides[get_export_service] = lambda: service
+
+    project = await slides_repository.create_project("deck")
+    for i in range(3):
+        sid = f"s{i}"
+        await image_repository.save_image("deck", sid, f"h{i}", b"image %d" % i)
+        project.slides.append(
+            Slide(
+                sid=sid,
+                content=f"Slide {i}",
+                images=[SlideImage(hash=f"h{i}", path=f"images/{sid}/h{i}.jpg")],
+            )
+        )
+    await slides_repository.save_project(project)
+
+    response = await client.post("/api/slides/deck/exports", json={"format": "zip"})
+    assert response.status_code == 200
+    task_id = response.json()["task_id"]
+    entry = get_task_registry().get(task_id)
+    if entry is not None:
+        await entry.task
+
+    progress = [e["data"] for e in events if e["type"] == "export_progress"]
+    assert [(p["done"], p["total"]) for p in progress] == [(1, 3), (2, 3), (3, 3)]
+    completed = next(e["data"] for e in events if e["type"] == "export_completed")
+    assert completed["task_id"] == task_id
+
+    download = await client.get(completed["download_url"])
+    assert download.status_code == 200
+    assert download.headers["content-disposition"] == 'attachment; filename="deck.zip"'
+    with zipfile.ZipFile(io.BytesIO(download.content)) as zf:
+        assert zf.namelist() == ["01.jpg", "02.jpg", "03.jpg"]
+
+    partial = await client.get(completed["download_url"], headers={"Range": "bytes=4-"})
+    assert partial.status_code == 206
+    assert partial.content == download.content[4:]
+
+    other_project = completed["download_url"].replace("/deck/", "/other/")
+    assert (await client.get(other_project)).status_code == 404
+    missing = await client.post("/api/slides/missing/exports", json={"format": "pdf"})
+    assert missing.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_downloads_expire(tmp_path: Path) -> None:
+    """Expired downloads are not served, and their files are removed."""
+    source = tmp_path / "source.zip"
+    source.write_bytes(b"archive")
+    downloads = DownloadRepository(str(tmp_path / "downloads"), ttl_seconds=3600)
+    download = await downloads.create("deck", "deck.zip", "application/zip", source)
+
+    found = await downloads.get(download.token)
+    assert found is not None
+    assert found[1].read_bytes() == b"archive"
+    assert found[0].size == len(b"archive")
+
+    downloads.ttl_seconds = 0
+    assert await downloads.purge_expired() == 1
+    assert await downloads.get(download.token) is None
+    assert not any((tmp_path / "downloads").iterdir())
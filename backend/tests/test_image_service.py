@@ -0,0 +1,184 @@
+"""Tests for image generation service."""
+
+import asyncio
+import io
+from typing import Any
+
+import pytest
+from PIL import Image
+
+from app.models import Project, Slide, Style
+from app.repositories import CacheRepository, ImageRepository, SlidesRepository, StyleRepository
+from app.services import GenerationCache, ImageService
+from app.services.engine_queue import EngineQueue
+
+
+class FakeEngine:
+    """Image engine stub with configurable latency and failure."""
+
+    def __init__(
+        self, name: str, delay: float = 0.0, fail: bool = False, payload: bytes | None = None
+    ):
+        self.name = name
+        self.model = f"{name}-model"
+        self.image_size = "2K"
+        self.payload = payload
+        self.delay = delay
+        self.fail = fail
+        self.calls = 0
+        self.cancelled = False
+
+    async def generate_style_images(
+        self, prompt: str, count: int = 2, start_index: int = 0
+    ) -> list[bytes]:
+        return [await self._generate() for _ in range(count)]
+
+    async def generate_slide_image(
+        self, content: str, style_image: bytes, style_prompt: str
+    ) -> bytes:
+        return await self._generate()
+
+    async def _generate(self) -> bytes:
+        self.calls += 1
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        if self.fail:
+            raise RuntimeError(f"{self.name} failed")
+        return self.payload or self.name.encode()
+
+
+def _make_service(tmp_path: Any, **engines: FakeEngine) -> ImageService:
+    base = str(tmp_path)
+    return ImageService(
+        slides_repository=SlidesRepository(base),
+        style_repository=StyleRepository(base),
+        image_repository=ImageRepository(base),
+        gemini_service=engines.get("gemini", FakeEngine("gemini")),  # type: ignore[arg-type]
+        volcengine_service=engines.get("volcengine", FakeEngine("volcengine")),  # type: ignore[arg-type]
+        nano_banana_service=engines.get("nano_banana", FakeEngine("nano_banana")),  # type: ignore[arg-type]
+    )
+
+
+def _jpeg_bytes() -> bytes:
+    buffer = io.BytesIO()
+    Image.new("RGB", (64, 36), "white").save(buffer, format="JPEG")
+    return buffer.getvalue()
+
+
+async def _hedged(service: ImageService, project: Project) -> tuple[bytes, str]:
+    data, engine, _ = await service._generate_with_hedge(project, "content", b"style", "prompt")
+    return data, engine
+
+
+@pytest.mark.asyncio
+async def test_hedge_not_used_when_primary_is_fast(tmp_path: Any) -> None:
+    """Primary answering within budget never triggers the secondary engine."""
+    secondary = FakeEngine("gemini")
+    service = _make_service(tmp_path, volcengine=FakeEngine("volcengine"), gemini=secondary)
+    project = Project(slug="p", hedge_engine="gemini", hedge_after_seconds=1.0)
+
+    data, engine = await _hedged(service, project)
+
+    assert (data, engine) == (b"volcengine", "volcengine")
+    assert secondary.calls == 0
+
+
+@pytest.mark.asyncio
+async def test_hedge_secondary_wins_and_primary_is_cancelled(tmp_path: Any) -> None:
+    """A slow primary is raced against the secondary and cancelled when it loses."""
+    primary = FakeEngine("volcengine", delay=5.0)
+    service = _make_service(tmp_path, volcengine=primary, gemini=FakeEngine("gemini"))
+    project = Project(slug="p", hedge_engine="gemini", hedge_after_seconds=0.01)
+
+    data, engine = await _hedged(service, project)
+    await asyncio.sleep(0)
+
+    assert engine == "gemini"
+    assert primary.cancelled
+
+
+@pytest.mark.asyncio
+async def test_hedge_winner_latency_excludes_hedge_wait(tmp_path: Any) -> None:
+    """The hedge engine's latency is timed from its own request, not the primary's."""
+    primary = FakeEngine("volcengine", delay=5.0)
+    service = _make_service(tmp_path, volcengine=primary, gemini=FakeEngine("gemini"))
+    project = Project(slug="p", hedge_engine="gemini", hedge_after_seconds=0.2)
+
+    _, engine, elapsed = await service._generate_with_hedge(project, "content", b"style", "prompt")
+
+    assert engine == "gemini"
+    assert elapsed < 0.1
+
+
+@pytest.mark.asyncio
+async def test_hedge_request_waits_for_a_slot_on_the_hedge_engine(tmp_path: Any) -> None:
+    """The hedged request is queued on its engine like any other request."""
+    primary = FakeEngine("volcengine", delay=0.2)
+    secondary = FakeEngine("gemini")
+    service = _make_service(tmp_path, volcengine=primary, gemini=secondary)
+    service.engine_queue = EngineQueue(max_concurrency=1)
+    project = Project(slug="p", hedge_engine="gemini", hedge_after_seconds=0.01)
+
+    release = asyncio.Event()
+
+    async def _busy() -> None:
+        async with service.engine_queue.slot("gemini", "other"):  # type: ignore[union-attr]
+            await release.wait()
+
+    blocker = asyncio.create_task(_busy())
+    await asyncio.sleep(0)
+    job = asyncio.create_task(
+        service._generate_with_hedge(project, "content", b"style", "prompt", ticket="t")
+    )
+    await asyncio.sleep(0.05)
+    status = service.engine_queue.status("t:hedge")
+    assert status is not None and status.position == 1
+
+    _, engine, _ = await job
+    assert engine == "volcengine"
+    assert secondary.calls == 0
+    release.set()
+    await blocker
+
+
+@pytest.mark.asyncio
+async def test_hedge_fails_over_when_primary_errors(tmp_path: Any) -> None:
+    """A failing primary fires the secondary immediately instead of waiting."""
+    primary = FakeEngine("volcengine", fail=True)
+    service = _make_service(tmp_path, volcengine=primary, gemini=FakeEngine("gemini"))
+    project = Project(slug="p", hedge_engine="gemini", hedge_after_seconds=30.0)
+
+    _, engine = await asyncio.wait_for(_hedged(service, project), timeout=1.0)
+
+    assert engine == "gemini"
+
+
+@pytest.mark.asyncio
+async def test_generation_cache_is_shared_across_projects(tmp_path: Any) -> None:
+    """An identical request from another project is served from the cache."""
+    engine = FakeEngine("volcengine", payload=_jpeg_bytes())
+    service = _make_service(tmp_path / "slides", volcengine=engine)
+    service.generation_cache = GenerationCache(
+        CacheRepository(str(tmp_path / "cache"), max_bytes=1 << 20, max_age_seconds=3600)
+    )
+    style_image = _jpeg_bytes()
+
+    for slug in ("deck-a", "deck-b"):
+        project = await service.slides_repository.create_project(slug)
+        project.style = Style(prompt="style", image="style/style.jpg")
+        project.slides.append(Slide(sid="slide-1", content="Same content"))
+        await service.slides_repository.save_project(project)
+        await service.style_repository.save_style_image(slug, style_image)
+        await service.generate_image(slug, "slide-1")
+
+    assert engine.calls == 1
+    project_b = await service.slides_repository.get_project("deck-b")
+    assert project_b is not None
+    assert project_b.cost.slide_generations == 0
+
+    # force bypasses the cache
+    await service.generate_image("deck-b", "slide-1", force=True)
+    assert engine.calls == 2
@@ -0,0 +1,83 @@
+"""Tests for latency histograms, the engine queue and generation estimates."""
+
+import asyncio
+from pathlib import Path
+
+import pytest
+
+from app.models import Slide
+from app.repositories import ImageRepository, SlidesRepository, StyleRepository
+from app.services import EngineQueue, ImageService, LatencyStats, MockImageService
+
+
+@pytest.mark.asyncio
+async def test_latency_stats_quantiles_and_persistence(tmp_path: Path) -> None:
+    """Quantiles follow recorded samples and survive a reload from disk."""
+    path = str(tmp_path / "latency.json")
+    stats = LatencyStats(path)
+    for seconds in (8, 9, 9, 10, 50):
+        await stats.record("volcengine", "2K", seconds)
+
+    histogram = await LatencyStats(path).get("volcengine", "2K")
+    assert histogram.samples == 5
+    assert 5 <= histogram.quantile(0.5) <= 10
+    assert histogram.quantile(0.99) <= 50
+    assert (await stats.get("gemini", "2K")).samples == 0
+
+
+@pytest.mark.asyncio
+async def test_engine_queue_positions_are_fifo() -> None:
+    """Beyond max_concurrency, tickets wait in arrival order."""
+    queue = EngineQueue(max_concurrency=1)
+    release = asyncio.Event()
+
+    async def hold(ticket: str) -> None:
+        async with queue.slot("mock", ticket):
+            await release.wait()
+
+    tasks = [asyncio.create_task(hold(t)) for t in ("a", "b", "c")]
+    await asyncio.sleep(0.01)
+
+    positions = [queue.status(t).position for t in ("a", "b", "c")]  # type: ignore[union-attr]
+    assert positions == [0, 1, 2]
+    assert queue.load("mock") == (1, 2)
+
+    # A cancelled waiter leaves the line
+    tasks[1].cancel()
+    await asyncio.sleep(0.01)
+    assert queue.status("c").position == 1  # type: ignore[union-attr]
+
+    release.set()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    assert queue.load("mock") == (0, 0)
+
+
+@pytest.mark.asyncio
+async def test_estimate_stale_slides(tmp_path: Path) -> None:
+    """Only slides without a matching image count, in waves of the engine's concurrency."""
+    base = str(tmp_path)
+    mock = MockImageService(latency_mean=0, image_width=160)
+    stats = LatencyStats()
+    for _ in range(10):
+        await stats.record("mock", mock.image_size, 10.0)
+    service = ImageService(
+        slides_repository=SlidesRepository(base, default_engine="mock"),
+        style_repository=StyleRepository(base),
+        image_repository=ImageRepository(base),
+        gemini_service=mock,
+        volcengine_service=mock,
+        nano_banana_service=mock,
+        mock_service=mock,
+        latency_stats=stats,
+        engine_queue=EngineQueue(max_concurrency=2),
+    )
+    project = await service.slides_repository.create_project("deck")
+    project.slides = [Slide(sid=f"s{i}", content=f"Slide {i}") for i in range(3)]
+    await service.slides_repository.save_project(project)
+
+    estimate = await service.estimate_stale_slides("deck")
+
+    assert estimate.engine == "mock"
+    assert estimate.stale_sids == ["s0", "s1", "s2"]
+    assert estimate.samples == 10
+    assert estimate.estimated_seconds == pytest.approx(2 * estimate.per_slide_p50)
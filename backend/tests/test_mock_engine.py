@@ -0,0 +1,41 @@
+"""Tests for the mock image engine."""
+
+import io
+
+import pytest
+from httpx import AsyncClient
+from PIL import Image
+
+from app.exceptions import GenerationFailedError
+from app.services import MockImageService
+
+
+@pytest.mark.asyncio
+async def test_mock_slide_images_are_deterministic() -> None:
+    """The same request renders the same 16:9 image; different content differs."""
+    engine = MockImageService(latency_mean=0, image_width=640)
+
+    first = await engine.generate_slide_image("Hello", b"style", "prompt")
+    second = await engine.generate_slide_image("Hello", b"style", "prompt")
+    other = await engine.generate_slide_image("World", b"style", "prompt")
+
+    assert first == second
+    assert first != other
+    assert Image.open(io.BytesIO(first)).size == (640, 360)
+
+
+@pytest.mark.asyncio
+async def test_mock_failure_rate() -> None:
+    """A failure rate of 1.0 makes every call fail."""
+    engine = MockImageService(latency_mean=0, failure_rate=1.0, image_width=160)
+
+    with pytest.raises(GenerationFailedError):
+        await engine.generate_slide_image("Hello", b"style", "prompt")
+
+
+@pytest.mark.asyncio
+async def test_mock_engine_is_selectable(client: AsyncClient) -> None:
+    """Projects can switch to the mock engine."""
+    response = await client.put("/api/slides/test-project/engine", json={"engine": "mock"})
+    assert response.status_code == 200
+    assert response.json()["engine"] == "mock"
@@ -0,0 +1,153 @@
+"""Tests for importing a Markdown/text outline as slides."""
+
+from collections.abc import AsyncGenerator
+from pathlib import Path
+from typing import Any
+
+import pytest
+from httpx import AsyncClient
+
+from app.repositories import SlidesRepository
+from app.services import SlidesService
+from app.utils import OutlineSplitter, compute_content_hash
+
+OUTLINE = """# Deck title
+
+Intro line
+
+## Second
+
+- point
+
+```python
+# not a heading
+---
+```
+
+---
+
+Plain text slide
+### Sub heading stays
+"""
+
+
+def _split(chunks: list[str], heading_level: int = 2) -> list[str]:
+    splitter = OutlineSplitter(heading_level)
+    slides: list[str] = []
+    for chunk in chunks:
+        slides.extend(splitter.feed(chunk))
+    slides.extend(splitter.finish())
+    return slides
+
+
+def test_splits_at_headings_and_separators() -> None:
+    """Headings start slides, separators end them, code fences never split."""
+    assert _split([OUTLINE]) == [
+        "# Deck title\n\nIntro line",
+        "## Second\n\n- point\n\n```python\n# not a heading\n---\n```",
+        "Plain text slide\n### Sub heading stays",
+    ]
+
+
+def test_chunk_boundaries_do_not_change_the_result() -> None:
+    """Splitting the text anywhere, even one character at a time, gives the same slides."""
+    expected = _split([OUTLINE])
+    assert _split(list(OUTLINE)) == expected
+    assert _split([OUTLINE[:17], OUTLINE[17:60], OUTLINE[60:]]) == expected
+    assert _split([OUTLINE.replace("\n", "\r\n")]) == expected
+
+
+def test_heading_level_and_empty_slides() -> None:
+    """Only headings up to heading_level split; blank slides are skipped."""
+    text = "# A\n## B\n### C\n---\n\n---\n"
+    assert _split([text], heading_level=1) == ["# A\n## B\n### C"]
+    assert _split([text], heading_level=3) == ["# A", "## B", "### C"]
+
+
+@pytest.fixture(autouse=True)
+async def _cleanup(client: AsyncClient) -> AsyncGenerator[None, None]:
+    """Delete the project the tests write to."""
+    yield
+    await client.delete("/api/slides/test-outline")
+
+
+@pytest.mark.asyncio
+async def test_import_creates_slides_in_one_write(
+    client: AsyncClient, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """A streamed document becomes slides, inserted after after_sid with one save."""
+    first = (await client.post("/api/slides/test-outline", json={"content": "First"})).json()
+    await client.post("/api/slides/test-outline", json={"content": "Last"})
+
+    saves = 0
+    save_project = SlidesRepository.save_project
+
+    async def _counting_save(self: SlidesRepository, project: Any) -> str:
+        nonlocal saves
+        saves += 1
+        return await save_project(self, project)
+
+    monkeypatch.setattr(SlidesRepository, "save_project", _counting_save)
+
+    async def _body() -> AsyncGenerator[bytes, None]:
+        data = OUTLINE.encode()
+        for i in range(0, len(data), 7):
+            yield data[i : i + 7]
+
+    response = await client.post(
+        "/api/slides/test-outline/import",
+        params={"after_sid": first["sid"]},
+        content=_body(),
+        headers={"Content-Type": "text/markdown"},
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert saves == 1
+    assert [slide["content"] for slide in data["slides"]] == _split([OUTLINE])
+    assert data["content_hashes"] == {
+        slide["sid"]: compute_content_hash(slide["content"]) for slide in data["slides"]
+    }
+    assert data["task_ids"] == {}
+
+    project = (await client.get("/api/slides/test-outline")).json()
+    contents = [slide["content"] for slide in project["slides"]]
+    assert contents == ["First", *_split([OUTLINE]), "Last"]
+
+
+@pytest.mark.asyncio
+async def test_import_rejects_bad_documents(client: AsyncClient) -> None:
+    """Empty or non-UTF-8 documents are rejected without changing the project."""
+    await client.post("/api/slides/test-outline", json={"content": "Only"})
+
+    empty = await client.post("/api/slides/test-outline/import", content=b"\n---\n  \n")
+    assert empty.status_code == 400
+    binary = await client.post("/api/slides/test-outline/import", content=b"# A\n\xff\xfe")
+    assert binary.status_code == 400
+
+    project = (await client.get("/api/slides/test-outline")).json()
+    assert [slide["content"] for slide in project["slides"]] == ["Only"]
+
+
+@pytest.mark.asyncio
+async def test_import_keeps_edits_made_while_uploading(tmp_path: Path) -> None:
+    """The project is read after the document arrives, so concurrent edits survive."""
+    service = SlidesService(SlidesRepository(str(tmp_path)))
+    await service.repository.create_project("deck")
+    first = await service.create_slide("deck", "First")
+
+    async def _body() -> AsyncGenerator[bytes, None]:
+        yield b"## A\n"
+        await service.create_slide("deck", "Added meanwhile", after_sid=first.sid)
+        await service.update_title("deck", "Renamed")
+        yield b"## B\n"
+
+    await service.import_outline("deck", _body(), after_sid=first.sid)
+
+    project = await service.get_project("deck")
+    assert project.title == "Renamed"
+    assert [slide.content for slide in project.slides] == [
+        "First",
+        "## A",
+        "## B",
+        "Added meanwhile",
+    ]
@@ -0,0 +1,28 @@
+"""Tests for cursor pagination."""
+
+import pytest
+
+from app.utils import decode_cursor, encode_cursor, paginate
+
+
+def test_paginate_follows_cursor() -> None:
+    """Pages follow the last returned key, even after items are removed."""
+    items = [("2024-01-03", "c"), ("2024-01-02", "b"), ("2024-01-01", "a")]
+
+    page, cursor = paginate(items, key=lambda item: item, limit=2, reverse=True)
+    assert page == items[:2]
+    assert cursor is not None and decode_cursor(cursor) == items[1]
+
+    # Removing an already returned item does not shift the next page
+    page, cursor = paginate(items[1:], key=lambda item: item, limit=2, cursor=cursor, reverse=True)
+    assert page == items[2:]
+    assert cursor is None
+
+    assert paginate(items, key=lambda item: item, limit=None) == (items, None)
+
+
+def test_invalid_cursor() -> None:
+    """Malformed cursors raise ValueError."""
+    for cursor in ["not base64!", encode_cursor(["ok"])[:-2] + "$$", "e30"]:
+        with pytest.raises(ValueError):
+            decode_cursor(cursor)
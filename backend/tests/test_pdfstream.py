@@ -0,0 +1,46 @@
+"""Tests for the streaming PDF writer."""
+
+import io
+import re
+
+from PIL import Image
+
+from app.utils import PdfStream
+
+
+def _jpeg(size: tuple[int, int], mode: str = "RGB") -> bytes:
+    buffer = io.BytesIO()
+    Image.new(mode, size, "white").save(buffer, format="JPEG")
+    return buffer.getvalue()
+
+
+def test_pdf_embeds_jpegs_without_reencoding() -> None:
+    """JPEG bytes are passed through with DCTDecode, one page per image."""
+    first, second = _jpeg((320, 180)), _jpeg((100, 100), "L")
+    ps = PdfStream(page_width=960)
+    data = ps.start() + ps.add_page(first) + ps.add_page(second) + ps.finish()
+
+    assert ps.bytes_written == len(data)
+    assert data.startswith(b"%PDF-1.4")
+    assert data.rstrip().endswith(b"%%EOF")
+    assert first in data and second in data
+    assert data.count(b"/Filter /DCTDecode") == 2
+    assert b"/Count 2" in data
+    assert b"/MediaBox [0 0 960.00 540.00]" in data
+    assert b"/ColorSpace /DeviceGray" in data
+
+    # Every xref entry points at the start of its object
+    startxref = int(re.search(rb"startxref\n(\d+)", data).group(1))  # type: ignore[union-attr]
+    entries = re.findall(rb"(\d{10}) 00000 n ", data[startxref:])
+    for number, offset in enumerate(entries, start=1):
+        assert data[int(offset) :].startswith(b"%d 0 obj" % number)
+
+
+def test_pdf_reencodes_non_jpeg_images() -> None:
+    """Images that are not JPEGs are converted so they can still be embedded."""
+    buffer = io.BytesIO()
+    Image.new("RGBA", (64, 36)).save(buffer, format="PNG")
+    ps = PdfStream()
+    data = ps.start() + ps.add_page(buffer.getvalue()) + ps.finish()
+
+    assert b"/Width 64 /Height 36" in data
@@ -0,0 +1,79 @@
+"""Tests for the streaming PPTX writer and PPTX export."""
+
+import io
+import zipfile
+from pathlib import Path
+from xml.etree import ElementTree
+
+import pytest
+
+from app.models import Slide, SlideImage
+from app.repositories import ImageRepository, SlidesRepository
+from app.services import ExportService
+from app.utils import PptxStream
+
+_A = "{http://schemas.openxmlformats.org/drawingml/2006/main}"
+_P = "{http://schemas.openxmlformats.org/presentationml/2006/main}"
+
+
+def _notes_text(zf: zipfile.ZipFile, number: int) -> str:
+    root = ElementTree.fromstring(zf.read(f"ppt/notesSlides/notesSlide{number}.xml"))
+    body = root.findall(f".//{_P}sp")[1]
+    return "\n".join("".join(t.text or "" for t in p.iter(f"{_A}t")) for p in body.iter(f"{_A}p"))
+
+
+def test_pptx_package_is_well_formed() -> None:
+    """Every part parses, and slides reference their image and notes."""
+    ps = PptxStream()
+    data = (
+        ps.add_slide(b"\xff\xd8\xff first", notes="Title & <intro>\n\nMore")
+        + ps.add_slide(b"\x89PNG second")
+        + ps.finish()
+    )
+
+    assert ps.bytes_written == len(data)
+    with zipfile.ZipFile(io.BytesIO(data)) as zf:
+        assert zf.testzip() is None
+        for name in zf.namelist():
+            if name.endswith((".xml", ".rels")):
+                ElementTree.fromstring(zf.read(name))
+
+        assert zf.read("ppt/media/image1.jpg") == b"\xff\xd8\xff first"
+        assert zf.read("ppt/media/image2.png") == b"\x89PNG second"
+        assert _notes_text(zf, 1) == "Title & <intro>\n\nMore"
+        assert _notes_text(zf, 2) == ""
+
+        presentation = ElementTree.fromstring(zf.read("ppt/presentation.xml"))
+        assert len(presentation.findall(f"{_P}sldIdLst/{_P}sldId")) == 2
+        content_types = zf.read("[Content_Types].xml").decode()
+        assert "/ppt/slides/slide2.xml" in content_types
+        assert 'Extension="png"' in content_types
+
+
+@pytest.mark.asyncio
+async def test_export_pptx_puts_content_in_notes(tmp_path: Path) -> None:
+    """Each slide with an image becomes a picture slide noted with its content."""
+    slides_repository = SlidesRepository(str(tmp_path))
+    image_repository = ImageRepository(str(tmp_path))
+    project = await slides_repository.create_project("deck")
+    for i, payload in enumerate([b"one", b"two"]):
+        sid = f"s{i}"
+        await image_repository.save_image("deck", sid, f"h{i}", payload)
+        project.slides.append(
+            Slide(
+                sid=sid,
+                content=f"Slide {i}",
+                images=[SlideImage(hash=f"h{i}", path=f"images/{sid}/h{i}.jpg")],
+            )
+        )
+    project.slides.insert(1, Slide(sid="empty", content="No image"))
+    await slides_repository.save_project(project)
+
+    artifact = await ExportService(slides_repository, image_repository).export("deck", "pptx")
+    assert artifact.chunks is not None
+    data = b"".join([chunk async for chunk in artifact.chunks])
+
+    with zipfile.ZipFile(io.BytesIO(data)) as zf:
+        assert zf.read("ppt/media/image2.png") == b"two"
+        assert [_notes_text(zf, n) for n in (1, 2)] == ["Slide 0", "Slide 1"]
+        assert "ppt/slides/slide3.xml" not in zf.namelist()
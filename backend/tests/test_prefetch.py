@@ -0,0 +1,47 @@
+"""Tests for ordered, bounded prefetching."""
+
+import asyncio
+
+import pytest
+
+from app.utils import prefetch_ordered
+
+
+@pytest.mark.asyncio
+async def test_prefetch_keeps_order_and_bounds_concurrency() -> None:
+    """Results come back in input order with at most ``depth`` fetches in flight."""
+    in_flight = 0
+    peak = 0
+
+    async def fetch(item: int) -> int:
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01 * (5 - item % 5))  # later items finish first
+        in_flight -= 1
+        return item * 10
+
+    results = [pair async for pair in prefetch_ordered(range(10), fetch, depth=3)]
+
+    assert results == [(i, i * 10) for i in range(10)]
+    assert peak == 3
+
+
+@pytest.mark.asyncio
+async def test_prefetch_cancels_outstanding_fetches_on_early_exit() -> None:
+    """Stopping early cancels fetches that were read ahead."""
+    completed: list[int] = []
+
+    async def fetch(item: int) -> int:
+        await asyncio.sleep(0 if item == 0 else 0.05)
+        completed.append(item)
+        return item
+
+    stream = prefetch_ordered(range(5), fetch, depth=3)
+    async for item, _ in stream:
+        assert item == 0
+        break
+    await stream.aclose()  # type: ignore[attr-defined]
+    await asyncio.sleep(0.1)
+
+    assert completed == [0]
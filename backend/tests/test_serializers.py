@@ -0,0 +1,77 @@
+"""Compatibility of the direct encoders with the response schemas."""
+
+import json
+from datetime import datetime
+from typing import Any
+
+import pytest
+
+from app.api import responses
+from app.api.responses import FastJSONResponse
+from app.api.schemas import ProjectResponse, SlideResponse
+from app.api.serializers import SLIDE_FIELDS, project_to_dict, slide_to_dict
+from app.models import CostInfo, Project, Slide, SlideImage, Style, StyleType
+from app.utils import compute_content_hash
+
+
+def _project() -> Project:
+    content = "# Title\n\nBody with ünïcode"
+    images = [
+        SlideImage(hash="aa", path="images/s1/aa.jpg", created_at=datetime(2024, 1, 1, 12)),
+        SlideImage(
+            hash=compute_content_hash(content),
+            path=f"images/s1/{compute_content_hash(content)}.jpg",
+            created_at=datetime(2024, 1, 2, 8, 30, 0, 123456),
+            engine="mock",
+            data_hash="0123456789abcdef",
+        ),
+    ]
+    return Project(
+        slug="deck",
+        title="Deck",
+        style=Style(
+            prompt="Flat",
+            image="style/style.jpg",
+            style_type=StyleType.CUSTOM,
+            style_name="Mine",
+            image_hash="fedcba9876543210",
+        ),
+        slides=[
+            Slide(sid="s1", content=content, images=images, selected_image_hash="aa"),
+            Slide(sid="s2", content=""),
+        ],
+        cost=CostInfo(total_images=2, slide_generations=2, estimated_cost=0.04),
+    )
+
+
+def _encode(content: dict[str, Any]) -> Any:
+    return json.loads(FastJSONResponse(content).body)
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_project_encoding_matches_schema(use_orjson: bool, monkeypatch: pytest.MonkeyPatch) -> None:
+    """The encoded project validates against ProjectResponse without changes."""
+    if not use_orjson:
+        monkeypatch.setattr(responses, "orjson", None)
+    project = _project()
+    encoded = _encode(project_to_dict(project, {"style_cost": 0.0, "slides_cost": 0.04}))
+
+    assert ProjectResponse.model_validate(encoded).model_dump(mode="json") == encoded
+    assert encoded["created_at"] == project.created_at.isoformat()
+    slide = encoded["slides"][0]
+    assert slide["current_image"] == slide["images"][-1]
+    assert slide["images"][1]["matched"] is True
+    assert slide["images"][1]["url"].endswith("?v=0123456789abcdef")
+    assert slide["images"][1]["created_at"] == "2024-01-02T08:30:00.123456"
+    assert encoded["style"]["style_type"] == "custom"
+
+
+def test_slide_projection() -> None:
+    """Projected slides keep only the selected fields; without history, the selected image."""
+    slide = _project().slides[0]
+    full = _encode(slide_to_dict(slide, "deck"))
+    assert SlideResponse.model_validate(full).model_dump(mode="json") == full
+    assert set(full) == SLIDE_FIELDS | {"sid"}
+
+    trimmed = _encode(slide_to_dict(slide, "deck", frozenset({"images"}), history=False))
+    assert trimmed == {"sid": "s1", "images": [full["images"][0]]}
@@ -1,8 +1,15 @@
 """Tests for slides API endpoints."""
 
+import os
+from pathlib import Path
+
 import pytest
 from httpx import AsyncClient
 
+from app.api.dependencies import get_slides_repository
+from app.models import Slide, SlideImage
+from app.repositories import SlidesRepository
+
 
 @pytest.mark.asyncio
 async def test_get_project_creates_new(client: AsyncClient) -> None:
@@ -99,3 +106,129 @@ async def test_invalid_slug(client: AsyncClient) -> None:
     """Test that invalid slugs are rejected."""
     response = await client.get("/api/slides/invalid..slug")
     assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_hedge_budget_requires_a_hedge_engine(client: AsyncClient) -> None:
+    """A latency budget alone is rejected unless the project already hedges."""
+    url = "/api/slides/test-project/engine"
+    response = await client.put(url, json={"engine": "mock", "hedge_after_seconds": 5})
+    assert response.status_code == 400
+
+    await client.put(url, json={"engine": "mock", "hedge_engine": "volcengine"})
+    response = await client.put(url, json={"engine": "mock", "hedge_after_seconds": 5})
+    assert response.status_code == 200
+    assert (response.json()["hedge_engine"], response.json()["hedge_after_seconds"]) == (
+        "volcengine",
+        5,
+    )
+
+
+@pytest.mark.asyncio
+async def test_conditional_get_returns_not_modified(client: AsyncClient) -> None:
+    """Project views share an ETag that changes only when the project does."""
+    await client.get("/api/slides/test-project")
+    response = await client.get("/api/slides/test-project")
+    etag = response.headers["etag"]
+
+    for path in ["", "/cost", "/engine", "/style"]:
+        response = await client.get(
+            f"/api/slides/test-project{path}", headers={"If-None-Match": etag}
+        )
+        assert response.status_code == 304
+        assert response.headers["etag"] == etag
+        assert response.content == b""
+
+    await client.put("/api/slides/test-project/title", json={"title": "Changed"})
+    response = await client.get("/api/slides/test-project", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+    assert response.json()["title"] == "Changed"
+
+
+@pytest.mark.asyncio
+async def test_project_version_tracks_outline(tmp_path: Path) -> None:
+    """The version follows saves and external edits of outline.yml."""
+    repository = SlidesRepository(str(tmp_path))
+    assert await repository.get_version("deck") is None
+
+    project = await repository.create_project("deck")
+    version = await repository.get_version("deck")
+    assert version is not None
+    assert await repository.get_version("deck") == version
+
+    project.title = "Renamed"
+    await repository.save_project(project)
+    saved = await repository.get_version("deck")
+    assert saved != version
+
+    outline = tmp_path / "deck" / "outline.yml"
+    outline.write_text(outline.read_text() + "\n", encoding="utf-8")
+    stat = outline.stat()
+    os.utime(outline, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert await repository.get_version("deck") not in (None, saved)
+
+
+@pytest.mark.asyncio
+async def test_image_urls_are_versioned_by_data_hash(client: AsyncClient) -> None:
+    """Images with a known data hash get ``?v=`` URLs; legacy images keep plain ones."""
+    repository = get_slides_repository()
+    project = await repository.get_or_create_project("test-project")
+    project.slides = [
+        Slide(
+            sid="s1",
+            content="Slide",
+            images=[
+                SlideImage(hash="h0", path="images/s1/h0.jpg"),
+                SlideImage(hash="h1", path="images/s1/h1.jpg", data_hash="0123456789abcdef"),
+            ],
+        )
+    ]
+    await repository.save_project(project)
+
+    response = await client.get("/api/slides/test-project")
+    legacy, current = response.json()["slides"][0]["images"]
+    assert legacy["url"] == "/static/slides/test-project/images/s1/h0.jpg"
+    assert current["url"] == "/static/slides/test-project/images/s1/h1.jpg?v=0123456789abcdef"
+    assert current["thumbnail_url"].endswith("/h1_thumb.jpg?v=0123456789abcdef")
+
+
+@pytest.mark.asyncio
+async def test_project_projection_and_pagination(client: AsyncClient) -> None:
+    """``fields``/``include`` trim the project; image history pages by cursor."""
+    repository = get_slides_repository()
+    project = await repository.get_or_create_project("test-project")
+    images = [SlideImage(hash=f"h{i}", path=f"images/s1/h{i}.jpg") for i in range(5)]
+    project.slides = [Slide(sid="s1", content="Slide", images=images, selected_image_hash="h1")]
+    await repository.save_project(project)
+
+    response = await client.get(
+        "/api/slides/test-project", params={"fields": "images", "include": "style"}
+    )
+    assert response.status_code == 200
+    assert "etag" in response.headers
+    data = response.json()
+    assert "cost" not in data
+    assert data["slides"] == [{"sid": "s1", "images": [data["slides"][0]["images"][0]]}]
+    assert data["slides"][0]["images"][0]["hash"] == "h1"
+
+    full = (await client.get("/api/slides/test-project")).json()
+    assert [img["hash"] for img in full["slides"][0]["images"]] == [f"h{i}" for i in range(5)]
+
+    bad = await client.get("/api/slides/test-project", params={"fields": "secret"})
+    assert bad.status_code == 400
+
+    hashes: list[str] = []
+    params: dict[str, str | int] = {"limit": 2}
+    while True:
+        page = (await client.get("/api/slides/test-project/s1/images", params=params)).json()
+        hashes += [img["hash"] for img in page["images"]]
+        if page["next_cursor"] is None:
+            break
+        params["cursor"] = page["next_cursor"]
+    assert hashes == [f"h{i}" for i in range(5)]
+
+    projects = await client.get("/api/slides", params={"limit": 1})
+    assert len(projects.json()["projects"]) == 1
+    bad_cursor = await client.get("/api/slides", params={"limit": 1, "cursor": "e30"})
+    assert bad_cursor.status_code == 400
@@ -0,0 +1,78 @@
+"""Tests for immutable caching of versioned static URLs."""
+
+from pathlib import Path
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+from starlette.applications import Starlette
+from starlette.routing import Mount
+
+from app.utils import (
+    IMMUTABLE_CACHE_CONTROL,
+    VersionedStaticFiles,
+    compute_bytes_hash,
+    versioned_url,
+)
+
+
+@pytest.mark.asyncio
+async def test_versioned_urls_are_immutable(tmp_path: Path) -> None:
+    """``?v=<hash>`` URLs are cached forever under a strong ETag; others revalidate."""
+    data = b"jpeg bytes"
+    (tmp_path / "image.jpg").write_bytes(data)
+    app = Starlette(routes=[Mount("/static", VersionedStaticFiles(directory=str(tmp_path)))])
+    version = compute_bytes_hash(data)
+    url = versioned_url("/static/image.jpg", version)
+    assert url == f"/static/image.jpg?v={version}"
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        response = await client.get(url)
+        assert response.status_code == 200
+        assert response.content == data
+        assert response.headers["cache-control"] == IMMUTABLE_CACHE_CONTROL
+        assert response.headers["etag"] == f'"{version}"'
+
+        revalidated = await client.get(url, headers={"If-None-Match": f'"{version}"'})
+        assert revalidated.status_code == 304
+
+        unversioned = await client.get("/static/image.jpg")
+        assert unversioned.status_code == 200
+        assert "cache-control" not in unversioned.headers
+        assert unversioned.headers["etag"] != f'"{version}"'
+
+        # Anything that is not a hash is ignored rather than echoed into headers
+        bogus = await client.get("/static/image.jpg?v=latest")
+        assert "cache-control" not in bogus.headers
+
+
+@pytest.mark.asyncio
+async def test_accel_redirect_hands_files_to_nginx(tmp_path: Path) -> None:
+    """With a prefix set, found files are redirected to nginx instead of being sent."""
+    data = b"jpeg bytes"
+    (tmp_path / "deck" / "images").mkdir(parents=True)
+    (tmp_path / "deck" / "images" / "a b.jpg").write_bytes(data)
+    static = VersionedStaticFiles(directory=str(tmp_path), accel_redirect_prefix="/_slides/")
+    app = Starlette(routes=[Mount("/static", static)])
+    version = compute_bytes_hash(data)
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        response = await client.get("/static/deck/images/a%20b.jpg")
+        assert response.status_code == 200
+        assert response.content == b""
+        assert response.headers["x-accel-redirect"] == "/_slides/deck/images/a%20b.jpg"
+        assert response.headers["content-type"] == "image/jpeg"
+
+        versioned = await client.get(f"/static/deck/images/a%20b.jpg?v={version}")
+        assert versioned.headers["x-accel-redirect"] == "/_slides/deck/images/a%20b.jpg"
+        assert versioned.headers["cache-control"] == IMMUTABLE_CACHE_CONTROL
+
+        revalidated = await client.get(
+            f"/static/deck/images/a%20b.jpg?v={version}",
+            headers={"If-None-Match": f'"{version}"'},
+        )
+        assert revalidated.status_code == 304
+        assert "x-accel-redirect" not in revalidated.headers
+
+        missing = await client.get("/static/deck/images/missing.jpg")
+        assert missing.status_code == 404
+        assert "x-accel-redirect" not in missing.headers
@@ -0,0 +1,133 @@
+"""Tests for style service candidate streaming."""
+
+import asyncio
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from app.api.routes import style as style_routes
+from app.api.routes.style import CandidateCallback, FailureCallback
+from app.models import StyleCandidate
+from app.repositories import SlidesRepository, StyleRepository
+from app.services import MockImageService, StyleService, TaskRegistry
+
+
+class StaggeredEngine:
+    """Style engine whose successive calls take increasingly long."""
+
+    name = "staggered"
+    model = "staggered-model"
+    image_size = "2K"
+
+    def __init__(self, delays: list[float]):
+        self.delays = list(delays)
+        self.completed = 0
+
+    async def generate_style_images(
+        self, prompt: str, count: int = 2, start_index: int = 0
+    ) -> list[bytes]:
+        await asyncio.sleep(self.delays.pop(0))
+        self.completed += 1
+        return [b"image"] * count
+
+    async def generate_slide_image(
+        self, content: str, style_image: bytes, style_prompt: str
+    ) -> bytes:
+        raise NotImplementedError
+
+
+def _make_service(tmp_path: Path, engine: StaggeredEngine | MockImageService) -> StyleService:
+    base = str(tmp_path)
+    return StyleService(
+        slides_repository=SlidesRepository(base),
+        style_repository=StyleRepository(base),
+        gemini_service=engine,
+        volcengine_service=engine,
+        nano_banana_service=engine,
+    )
+
+
+@pytest.mark.asyncio
+async def test_candidates_are_reported_as_they_complete(tmp_path: Path) -> None:
+    """The first candidate is reported before the slow one finishes."""
+    engine = StaggeredEngine([0.0, 0.0, 0.5])
+    service = _make_service(tmp_path, engine)
+    first_ready = asyncio.Event()
+    seen: list[StyleCandidate] = []
+
+    async def on_candidate(candidate: StyleCandidate) -> None:
+        seen.append(candidate)
+        first_ready.set()
+
+    job = asyncio.create_task(
+        service.generate_candidates("deck", "prompt", count=3, on_candidate=on_candidate)
+    )
+    await asyncio.wait_for(first_ready.wait(), timeout=0.3)
+    assert engine.completed < 3
+
+    candidates = await job
+    assert [c.id for c in candidates] == [c.id for c in seen]
+    assert len(candidates) == 3
+
+
+@pytest.mark.asyncio
+async def test_cancelling_charges_only_generated_candidates(tmp_path: Path) -> None:
+    """Cancelled stragglers are not charged; finished candidates are."""
+    engine = StaggeredEngine([0.0, 5.0])
+    service = _make_service(tmp_path, engine)
+    first_ready = asyncio.Event()
+
+    async def on_candidate(candidate: StyleCandidate) -> None:
+        first_ready.set()
+
+    job = asyncio.create_task(
+        service.generate_candidates("deck", "prompt", count=2, on_candidate=on_candidate)
+    )
+    await first_ready.wait()
+    job.cancel()
+    await asyncio.gather(job, return_exceptions=True)
+
+    project = await service.slides_repository.get_project("deck")
+    assert project is not None
+    assert project.cost.style_generations == 1
+
+
+@pytest.mark.asyncio
+async def test_candidates_differ_with_deterministic_engine(tmp_path: Path) -> None:
+    """Candidates generated one at a time still get one image per index."""
+    service = _make_service(tmp_path, MockImageService(latency_mean=0, image_width=160))
+    candidates = await service.generate_candidates("deck", "prompt", count=3)
+    images = {
+        await service.style_repository.get_candidate("deck", candidate.id)
+        for candidate in candidates
+    }
+    assert len(images) == 3
+
+
+@pytest.mark.asyncio
+async def test_failed_candidates_are_not_pending(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """The response's pending count leaves out candidates that already failed."""
+
+    async def _broadcast(slug: str, message: dict[str, Any], replay: bool = True) -> None:
+        pass
+
+    monkeypatch.setattr(style_routes.manager, "broadcast", _broadcast)
+    release = asyncio.Event()
+
+    async def _generate(on_candidate: CandidateCallback, on_failed: FailureCallback) -> None:
+        await on_failed(RuntimeError("boom"))
+        await on_candidate(StyleCandidate(id="a", path="style/candidates/a.jpg"))
+        await release.wait()  # The third candidate is still generating
+
+    registry = TaskRegistry()
+    service = _make_service(tmp_path, StaggeredEngine([]))
+    task_id, candidates, pending = await style_routes._start_style_job(
+        "deck", _generate, 3, 1, False, service, registry
+    )
+
+    assert [c.id for c in candidates] == ["a"]
+    assert pending == 1
+    registry.cancel(task_id)
@@ -0,0 +1,48 @@
+"""Tests for the background task registry."""
+
+import asyncio
+
+import pytest
+
+from app.services import TaskRegistry
+
+
+@pytest.mark.asyncio
+async def test_cancel_slide_cancels_only_that_slide() -> None:
+    """Cancelling by (slug, sid) leaves other slides' tasks running."""
+    registry = TaskRegistry()
+    stale = registry.spawn("deck", asyncio.sleep(10), sid="slide-a")
+    other = registry.spawn("deck", asyncio.sleep(10), sid="slide-b")
+    stale_task = registry.get(stale)
+    assert stale_task is not None
+
+    cancelled = registry.cancel_slide("deck", "slide-a", "content_changed")
+    await asyncio.gather(stale_task.task, return_exceptions=True)
+    await asyncio.sleep(0)
+
+    assert cancelled == [stale]
+    assert registry.get(stale) is None
+    assert registry.get(other) is not None
+    assert registry.cancel(other)
+
+
+@pytest.mark.asyncio
+async def test_cancel_reason_reaches_task() -> None:
+    """The cancellation reason is delivered to the task's CancelledError."""
+    registry = TaskRegistry()
+    reasons: list[str] = []
+
+    async def _work() -> None:
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError as e:
+            reasons.append(str(e.args[0]))
+            raise
+
+    task_id = registry.spawn("deck", _work(), sid="slide-a")
+    await asyncio.sleep(0)
+    assert registry.cancel(task_id, "slide_deleted")
+    await asyncio.sleep(0)
+
+    assert reasons == ["slide_deleted"]
+    assert not registry.cancel(task_id)
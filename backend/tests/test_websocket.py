@@ -0,0 +1,246 @@
+"""Tests for WebSocket fan-out, message numbering and replay on reconnect."""
+
+import asyncio
+import json
+from datetime import datetime
+from typing import Any
+
+import pytest
+from fastapi import WebSocketDisconnect
+from fastapi.testclient import TestClient
+from httpx import AsyncClient
+
+from app.api.routes.websocket import ConnectionManager, manager
+from app.main import app
+
+
+class _FakeSocket:
+    """Records what the manager sends, as decoded messages."""
+
+    def __init__(self, stalled: bool = False) -> None:
+        self.received: list[dict[str, Any]] = []
+        self.texts: list[str] = []
+        self.closed_with: int | None = None
+        self.stalled = stalled  # Never completes a send_text, like a stuck client
+
+    async def accept(self) -> None:
+        pass
+
+    async def send_json(self, message: dict[str, Any]) -> None:
+        self.received.append(message)
+
+    async def send_text(self, text: str) -> None:
+        if self.stalled:
+            await asyncio.Event().wait()
+        self.texts.append(text)
+        self.received.append(json.loads(text))
+
+    async def close(self, code: int = 1000, reason: str | None = None) -> None:
+        self.closed_with = code
+
+
+async def _drain() -> None:
+    """Let the writer tasks send what is queued."""
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+async def _broadcast_events(connections: ConnectionManager, count: int) -> None:
+    for i in range(count):
+        await connections.broadcast("deck", {"type": "slide_deleted", "data": {"sid": f"s{i}"}})
+
+
+@pytest.mark.asyncio
+async def test_reconnect_replays_missed_messages_in_order() -> None:
+    """Messages broadcast while nobody listened are replayed after last_seq, then live ones."""
+    connections = ConnectionManager()
+    await _broadcast_events(connections, 3)
+    await connections.broadcast("deck", {"type": "generation_progress"}, replay=False)
+
+    socket = _FakeSocket()
+    await connections.connect("deck", socket, last_seq=1, epoch=connections.epoch)  # type: ignore[arg-type]
+    await _broadcast_events(connections, 1)
+    await _drain()
+
+    assert socket.received[0] == {
+        "type": "connected",
+        "data": {"epoch": connections.epoch, "seq": 3},
+    }
+    assert [m["seq"] for m in socket.received[1:]] == [2, 3, 4]
+    assert socket.received[1]["data"] == {"sid": "s1"}
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("resuming", [False, True])
+async def test_messages_during_connect_are_not_lost(
+    monkeypatch: pytest.MonkeyPatch, resuming: bool
+) -> None:
+    """A message delivered while connect awaits the broker still reaches the client."""
+    connections = ConnectionManager()
+    await _broadcast_events(connections, 1)
+    get_generating_sids = connections.get_generating_sids
+
+    async def _racing(slug: str) -> list[str]:
+        await connections.broadcast(slug, {"type": "slide_deleted", "data": {"sid": "late"}})
+        return await get_generating_sids(slug)
+
+    monkeypatch.setattr(connections, "get_generating_sids", _racing)
+    socket = _FakeSocket()
+    last_seq = 0 if resuming else None
+    await connections.connect("deck", socket, last_seq=last_seq, epoch=connections.epoch)  # type: ignore[arg-type]
+    await _broadcast_events(connections, 1)
+    await _drain()
+
+    expected = [1, 2, 3] if resuming else [2, 3]
+    assert [m["seq"] for m in socket.received[1:]] == expected
+
+
+@pytest.mark.asyncio
+async def test_resync_required_when_messages_are_lost() -> None:
+    """Rolled-over buffers, a different epoch or an unknown seq ask the client to resync."""
+    connections = ConnectionManager(replay_size=2)
+    await _broadcast_events(connections, 5)
+
+    for last_seq, epoch in ((1, connections.epoch), (3, "old-epoch"), (9, connections.epoch)):
+        socket = _FakeSocket()
+        await connections.connect("deck", socket, last_seq=last_seq, epoch=epoch)  # type: ignore[arg-type]
+        assert [m["type"] for m in socket.received] == ["connected", "resync_required"]
+        assert socket.received[1]["data"]["seq"] == 5
+
+    socket = _FakeSocket()
+    await connections.connect("deck", socket, last_seq=3, epoch=connections.epoch)  # type: ignore[arg-type]
+    assert [m.get("seq") for m in socket.received] == [None, 4, 5]
+
+
+@pytest.mark.asyncio
+async def test_history_is_dropped_for_deleted_and_idle_projects() -> None:
+    """Dropped history makes reconnecting clients resync instead of replaying."""
+    connections = ConnectionManager(replay_ttl=0)
+    await _broadcast_events(connections, 2)
+    watched = _FakeSocket()
+    await connections.connect("watched", watched)  # type: ignore[arg-type]
+    await connections.broadcast("watched", {"type": "slide_deleted", "data": {}})
+
+    connections._expire_history()  # Idle with no viewers: dropped; watched: kept
+    assert connections.get_missed("deck", 1, connections.epoch) is None
+    assert connections.get_missed("watched", 0, connections.epoch) is not None
+
+    connections.drop_history("watched")
+    socket = _FakeSocket()
+    await connections.connect("watched", socket, last_seq=1, epoch=connections.epoch)  # type: ignore[arg-type]
+    assert [m["type"] for m in socket.received] == ["connected", "resync_required"]
+
+
+@pytest.mark.asyncio
+async def test_broadcast_encodes_once_for_all_connections() -> None:
+    """Messages holding datetimes are encoded once and sent as the same text."""
+    connections = ConnectionManager()
+    sockets = [_FakeSocket(), _FakeSocket()]
+    for socket in sockets:
+        await connections.connect("deck", socket)  # type: ignore[arg-type]
+    created = datetime(2026, 1, 2, 3, 4, 5)
+    await connections.broadcast("deck", {"type": "slide_created", "data": {"at": created}})
+    await _drain()
+    assert sockets[0].texts == sockets[1].texts
+    assert json.loads(sockets[0].texts[0])["data"]["at"] == created.isoformat()
+
+
+@pytest.mark.asyncio
+async def test_stalled_client_does_not_delay_others_and_is_dropped() -> None:
+    """Broadcasting never waits on a client; one that falls behind is closed with 1013."""
+    connections = ConnectionManager(send_queue_size=4)
+    stalled, healthy = _FakeSocket(stalled=True), _FakeSocket()
+    await connections.connect("deck", stalled)  # type: ignore[arg-type]
+    await connections.connect("deck", healthy)  # type: ignore[arg-type]
+
+    # Transient messages beyond the queue are dropped for the stalled client only
+    for _ in range(10):
+        await connections.broadcast("deck", {"type": "generation_progress"}, replay=False)
+        await _drain()
+    assert len(connections.active_connections["deck"]) == 2
+    assert len(healthy.received) == 1 + 10  # connected + progress
+
+    await asyncio.wait_for(_broadcast_events(connections, 1), timeout=1)
+    await _drain()
+    assert [c.websocket for c in connections.active_connections["deck"]] == [healthy]
+    assert stalled.closed_with == 1013
+    assert healthy.received[-1]["seq"] == 1
+
+
+@pytest.mark.asyncio
+async def test_heartbeats_and_connection_caps() -> None:
+    """Started managers ping every connection; connections beyond the caps are closed."""
+    connections = ConnectionManager(heartbeat_interval=0.01, max_connections_per_slug=1)
+    await connections.start()
+    try:
+        first, second = _FakeSocket(), _FakeSocket()
+        assert await connections.connect("deck", first)  # type: ignore[arg-type]
+        assert not await connections.connect("deck", second)  # type: ignore[arg-type]
+        assert second.closed_with == 1013
+        await asyncio.sleep(0.05)
+        assert {"type": "ping"} in first.received
+    finally:
+        await connections.close()
+
+    metrics = connections.get_metrics()
+    assert metrics["active_connections"] == 1
+    assert metrics["connections_accepted"] == 1
+    assert metrics["connections_rejected"] == 1
+
+
+@pytest.mark.asyncio
+async def test_reaped_and_failed_clients_are_counted() -> None:
+    """Reaping and failed sends unregister the connection and show up in the metrics."""
+    connections = ConnectionManager()
+    idle, broken = _FakeSocket(), _FakeSocket()
+    await connections.connect("deck", idle)  # type: ignore[arg-type]
+    await connections.connect("deck", broken)  # type: ignore[arg-type]
+
+    async def _fail(text: str) -> None:
+        raise ConnectionResetError("gone")
+
+    broken.send_text = _fail  # type: ignore[method-assign]
+    await connections.reap("deck", idle)  # type: ignore[arg-type]
+    await _broadcast_events(connections, 1)
+    await _drain()
+
+    assert idle.closed_with == 1001
+    assert "deck" not in connections.active_connections
+    metrics = connections.get_metrics()
+    assert (metrics["active_connections"], metrics["active_projects"]) == (0, 0)
+    assert (metrics["connections_reaped"], metrics["failed_sends"]) == (1, 1)
+
+
+def test_idle_client_is_reaped(monkeypatch: pytest.MonkeyPatch) -> None:
+    """A client that sends nothing for the idle timeout is closed with 1001."""
+    monkeypatch.setattr(manager, "idle_timeout", 0.1)
+    with TestClient(app) as client:
+        with client.websocket_connect("/ws/slides/test-ws-idle") as websocket:
+            assert websocket.receive_json()["type"] == "connected"
+            with pytest.raises(WebSocketDisconnect) as disconnect:
+                websocket.receive_json()
+            assert disconnect.value.code == 1001
+
+
+@pytest.mark.asyncio
+async def test_metrics_endpoint(client: AsyncClient) -> None:
+    """GET /ws/metrics reports the worker's connection metrics."""
+    response = await client.get("/ws/metrics")
+    assert response.status_code == 200
+    assert set(response.json()) == set(manager.get_metrics())
+
+
+def test_websocket_endpoint_resumes_from_query() -> None:
+    """The endpoint takes last_seq and epoch as query parameters."""
+    slug = "test-ws-resume"
+    for sid in ("a", "b"):
+        asyncio.run(manager.broadcast(slug, {"type": "slide_deleted", "data": {"sid": sid}}))
+
+    with TestClient(app) as client:
+        url = f"/ws/slides/{slug}?last_seq=1&epoch={manager.epoch}"
+        with client.websocket_connect(url) as websocket:
+            assert websocket.receive_json()["type"] == "connected"
+            missed = websocket.receive_json()
+            assert (missed["seq"], missed["data"]) == (2, {"sid": "b"})
+            websocket.send_json({"type": "ping"})
+            assert websocket.receive_json() == {"type": "pong"}
@@ -0,0 +1,67 @@
+"""Tests for the streaming ZIP writer and ZIP export."""
+
+import io
+import zipfile
+from pathlib import Path
+
+import pytest
+
+from app.models import Slide, SlideImage
+from app.repositories import ImageRepository, SlidesRepository
+from app.services import ExportService
+from app.utils import ZipStream
+
+
+def test_zipstream_is_readable_by_zipfile() -> None:
+    """Entries with and without a size hint (ZIP64) round-trip through zipfile."""
+    zs = ZipStream()
+    parts = [zs.add("01.jpg", b"first image")]
+    parts.append(zs.start_entry("dir/02.jpg"))  # unknown size: ZIP64 entry
+    parts += [zs.write(b"x" * 70_000), zs.write(b"y" * 10)]
+    parts.append(zs.end_entry())
+    parts.append(zs.finish())
+    data = b"".join(parts)
+
+    assert zs.bytes_written == len(data)
+    with zipfile.ZipFile(io.BytesIO(data)) as zf:
+        assert zf.testzip() is None
+        assert zf.namelist() == ["01.jpg", "dir/02.jpg"]
+        assert zf.read("01.jpg") == b"first image"
+        assert zf.read("dir/02.jpg") == b"x" * 70_000 + b"y" * 10
+
+
+def test_zipstream_zip64_entry_count() -> None:
+    """More than 65535 entries need the ZIP64 end of central directory."""
+    zs = ZipStream()
+    data = b"".join(zs.add(f"{i}", b"") for i in range(70_000)) + zs.finish()
+
+    with zipfile.ZipFile(io.BytesIO(data)) as zf:
+        assert len(zf.infolist()) == 70_000
+
+
+@pytest.mark.asyncio
+async def test_export_zip_streams_selected_images(tmp_path: Path) -> None:
+    """The export contains the selected image of each slide, numbered in order."""
+    slides_repository = SlidesRepository(str(tmp_path))
+    image_repository = ImageRepository(str(tmp_path))
+    project = await slides_repository.create_project("deck")
+    for i, payload in enumerate([b"one", b"two"]):
+        sid = f"s{i}"
+        await image_repository.save_image("deck", sid, f"h{i}", payload)
+        project.slides.append(
+            Slide(
+                sid=sid,
+                content=f"Slide {i}",
+                images=[SlideImage(hash=f"h{i}", path=f"images/{sid}/h{i}.jpg")],
+            )
+        )
+    project.slides.append(Slide(sid="empty", content="No image"))
+    await slides_repository.save_project(project)
+
+    artifact = await ExportService(slides_repository, image_repository).export("deck", "zip")
+    assert artifact.chunks is not None
+    data = b"".join([chunk async for chunk in artifact.chunks])
+
+    with zipfile.ZipFile(io.BytesIO(data)) as zf:
+        assert zf.namelist() == ["01.jpg", "02.jpg"]
+        assert zf.read("02.jpg") == b"two"
@@ -98,6 +98,15 @@ export const api = {
     });
   },
 
+  /** POST a raw body (text, file) instead of JSON */
+  postBody<T>(
+    endpoint: string,
+    body: BodyInit,
+    options?: RequestOptions
+  ): Promise<T> {
+    return request<T>(endpoint, { ...options, method: "POST", body });
+  },
+
   put<T>(
     endpoint: string,
     data?: unknown,
@@ -4,12 +4,14 @@
 
 import type { SlideImage, GenerateTaskResponse } from "@/types";
 import { api } from "./client";
+import type { PageParams } from "./slides";
 
 export interface GetImagesResponse {
   sid: string;
   content_hash: string;
   images: SlideImage[];
   has_matched_image: boolean;
+  next_cursor?: string | null;
 }
 
 export interface GenerateImageRequest {
@@ -40,12 +42,16 @@ export interface SelectImageResponse {
   selected_image_hash: string;
 }
 
+export type ExportFormat = "zip" | "pdf" | "pptx";
+
 export const imagesApi = {
   /**
-   * Get all images for a slide
+   * Get the images of a slide, oldest first (paginated when a limit is given)
    */
-  getImages(slug: string, sid: string): Promise<GetImagesResponse> {
-    return api.get<GetImagesResponse>(`/slides/${slug}/${sid}/images`);
+  getImages(slug: string, sid: string, params?: PageParams): Promise<GetImagesResponse> {
+    return api.get<GetImagesResponse>(`/slides/${slug}/${sid}/images`, {
+      params: { ...params },
+    });
   },
 
   /**
@@ -108,10 +114,17 @@ export const imagesApi = {
   },
 
   /**
-   * Export project as ZIP file with numbered JPG images
+   * Start a background export; progress and the download link arrive over WebSocket
+   */
+  startExport(slug: string, format: ExportFormat = "zip"): Promise<GenerateTaskResponse> {
+    return api.post<GenerateTaskResponse>(`/slides/${slug}/exports`, { format });
+  },
+
+  /**
+   * Export project as ZIP file with numbered JPG images, or as a PDF or PPTX
    */
-  async exportProject(slug: string): Promise<Blob> {
-    const response = await fetch(`/api/slides/${slug}/export`);
+  async exportProject(slug: string, format: ExportFormat = "zip"): Promise<Blob> {
+    const response = await fetch(`/api/slides/${slug}/export?format=${format}`);
     if (!response.ok) {
       throw new Error(`Export failed: ${response.statusText}`);
     }
@@ -4,7 +4,9 @@
 
 export { api, ApiError } from "./client";
 export { slidesApi } from "./slides";
+export type { BatchOperation, PageParams, ProjectQuery } from "./slides";
 export { styleApi } from "./style";
 export { imagesApi } from "./images";
+export type { ExportFormat } from "./images";
 export { WebSocketClient } from "./websocket";
 export type { WSMessageHandler } from "./websocket";
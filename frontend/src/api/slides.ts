@@ -29,6 +29,36 @@ export interface ReorderSlidesResponse {
   slides: Slide[];
 }
 
+/** One edit in a batch; sid/after_sid/order may name slides created earlier by ref */
+export type BatchOperation =
+  | { op: "create"; content?: string; after_sid?: string; ref?: string }
+  | { op: "update"; sid: string; content: string; cancel_generation?: boolean }
+  | { op: "delete"; sid: string; cancel_generation?: boolean }
+  | { op: "reorder"; order: string[] }
+  | { op: "select_image"; sid: string; image_hash: string }
+  | { op: "title"; title: string };
+
+export interface BatchResponse {
+  success: boolean;
+  title: string;
+  updated_at: string;
+  slides: Slide[];
+  refs: Record<string, string>; // ref -> sid of created slides
+}
+
+export interface ImportOutlineOptions {
+  after_sid?: string;
+  heading_level?: number; // Deepest heading that starts a slide (default 2)
+  generate?: boolean; // Queue image generation for the new slides
+}
+
+export interface ImportOutlineResponse {
+  success: boolean;
+  slides: Slide[];
+  content_hashes: Record<string, string>; // sid -> content hash
+  task_ids: Record<string, string>; // sid -> generation task ID
+}
+
 export interface DeleteSlideResponse {
   success: boolean;
   deleted_sid: string;
@@ -36,6 +66,19 @@ export interface DeleteSlideResponse {
 
 export interface ProjectListResponse {
   projects: ProjectSummary[];
+  next_cursor?: string | null;
+}
+
+export interface PageParams {
+  limit?: number;
+  cursor?: string;
+}
+
+export interface ProjectQuery {
+  /** Comma-separated slide fields to return (sid is always included) */
+  fields?: string;
+  /** Comma-separated optional parts: "style", "cost", "images" (full history) */
+  include?: string;
 }
 
 export interface DeleteProjectResponse {
@@ -45,17 +88,17 @@ export interface DeleteProjectResponse {
 
 export const slidesApi = {
   /**
-   * List all projects
+   * List projects, most recently updated first (paginated when a limit is given)
    */
-  listProjects(): Promise<ProjectListResponse> {
-    return api.get<ProjectListResponse>("/slides");
+  listProjects(params?: PageParams): Promise<ProjectListResponse> {
+    return api.get<ProjectListResponse>("/slides", { params: { ...params } });
   },
 
   /**
-   * Get project information
+   * Get project information, optionally trimmed to the given fields
    */
-  getProject(slug: string): Promise<Project> {
-    return api.get<Project>(`/slides/${slug}`);
+  getProject(slug: string, query?: ProjectQuery): Promise<Project> {
+    return api.get<Project>(`/slides/${slug}`, { params: { ...query } });
   },
 
   /**
@@ -96,6 +139,27 @@ export const slidesApi = {
     return api.put<ReorderSlidesResponse>(`/slides/${slug}/reorder`, { order });
   },
 
+  /**
+   * Apply several edits in order with a single write (all or nothing)
+   */
+  applyBatch(slug: string, operations: BatchOperation[]): Promise<BatchResponse> {
+    return api.post<BatchResponse>(`/slides/${slug}/batch`, { operations });
+  },
+
+  /**
+   * Import a Markdown/text document (string or file) as new slides, split by headings
+   */
+  importOutline(
+    slug: string,
+    document: string | Blob,
+    options: ImportOutlineOptions = {}
+  ): Promise<ImportOutlineResponse> {
+    return api.postBody<ImportOutlineResponse>(`/slides/${slug}/import`, document, {
+      params: { ...options },
+      headers: { "Content-Type": "text/markdown; charset=utf-8" },
+    });
+  },
+
   /**
    * Delete a slide
    */
@@ -12,11 +12,17 @@ export interface GetStyleResponse {
 
 export interface GenerateStyleRequest {
   prompt: string;
+  force?: boolean; // Bypass the backend generation cache
+  count?: number; // Number of candidates (N)
+  min_candidates?: number; // Return once K are ready; the rest arrive over WebSocket
+  cancel_stragglers?: boolean;
 }
 
 export interface GenerateStyleResponse {
   candidates: StyleCandidate[];
   prompt: string;
+  task_id: string;
+  pending: number; // Candidates still streaming in via style_candidate_ready
 }
 
 export interface SaveStyleRequest {
@@ -44,6 +50,8 @@ export interface GenerateStyleFromTemplateRequest {
 export interface GenerateStyleFromTemplateResponse {
   candidates: StyleCandidate[];
   template: StyleTemplate;
+  task_id: string;
+  pending: number;
 }
 
 export const styleApi = {
@@ -66,10 +74,14 @@ export const styleApi = {
    */
   generateStyle(
     slug: string,
-    prompt: string
+    prompt: string,
+    force = false,
+    minCandidates?: number
   ): Promise<GenerateStyleResponse> {
     return api.post<GenerateStyleResponse>(`/slides/${slug}/style/generate`, {
       prompt,
+      force,
+      min_candidates: minCandidates,
     });
   },
 
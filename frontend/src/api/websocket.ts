@@ -2,7 +2,7 @@
  * WebSocket client for real-time updates
  */
 
-import type { WSMessage } from "@/types";
+import type { ConnectedData, WSMessage } from "@/types";
 import { logger } from "@/utils";
 
 export type WSMessageHandler = (message: WSMessage) => void;
@@ -15,6 +15,10 @@ export class WebSocketClient {
   private maxReconnectAttempts = 5;
   private reconnectDelay = 1000;
   private pingInterval: ReturnType<typeof setInterval> | null = null;
+  private closed = false;
+  // Numbering of the last message received, sent on reconnect to replay missed ones
+  private epoch: string | null = null;
+  private lastSeq: number | null = null;
 
   constructor(slug: string) {
     this.slug = slug;
@@ -25,8 +29,12 @@ export class WebSocketClient {
       return;
     }
 
+    this.closed = false;
     const protocol = window.location.protocol === "https:" ? "wss:" : "ws:";
-    const wsUrl = `${protocol}//${window.location.host}/ws/slides/${this.slug}`;
+    let wsUrl = `${protocol}//${window.location.host}/ws/slides/${this.slug}`;
+    if (this.epoch !== null && this.lastSeq !== null) {
+      wsUrl += `?last_seq=${this.lastSeq}&epoch=${this.epoch}`;
+    }
 
     logger.info("Connecting to WebSocket:", wsUrl);
     this.ws = new WebSocket(wsUrl);
@@ -41,6 +49,12 @@ export class WebSocketClient {
       try {
         const message = JSON.parse(event.data) as WSMessage;
         logger.debug("WS received:", message.type, message.data);
+        if (message.type === "ping") {
+          // Server heartbeat; a client that stops answering is disconnected
+          this.send({ type: "pong" });
+          return;
+        }
+        this.trackSeq(message);
         this.handlers.forEach((handler) => handler(message));
       } catch (error) {
         logger.error("Failed to parse WebSocket message:", error);
@@ -50,7 +64,9 @@ export class WebSocketClient {
     this.ws.onclose = () => {
       logger.info("WebSocket disconnected");
       this.stopPing();
-      this.attemptReconnect();
+      if (!this.closed) {
+        this.attemptReconnect();
+      }
     };
 
     this.ws.onerror = (error) => {
@@ -59,6 +75,7 @@ export class WebSocketClient {
   }
 
   disconnect(): void {
+    this.closed = true;
     this.stopPing();
     if (this.ws) {
       this.ws.close();
@@ -78,6 +95,19 @@ export class WebSocketClient {
     }
   }
 
+  private trackSeq(message: WSMessage): void {
+    // A fresh connection starts from the current seq; a resumed one keeps its
+    // own until the replayed messages arrive, unless the server asks to resync
+    const isStart = message.type === "connected" && this.epoch === null;
+    if (isStart || message.type === "resync_required") {
+      const data = message.data as ConnectedData;
+      this.epoch = data.epoch;
+      this.lastSeq = data.seq;
+    } else if (message.seq !== undefined) {
+      this.lastSeq = message.seq;
+    }
+  }
+
   private startPing(): void {
     this.pingInterval = setInterval(() => {
       this.send({ type: "ping" });
@@ -1,17 +1,23 @@
 /**
- * Export button component - downloads project as ZIP with numbered JPG images
+ * Export button component - downloads project as ZIP with numbered JPG images, or as PDF or PPTX
  */
 
 import { useState } from "react";
 import { imagesApi } from "@/api";
+import type { ExportFormat } from "@/api";
 import { Button } from "@/components/common";
 
 interface ExportButtonProps {
   slug: string;
+  format?: ExportFormat;
   disabled?: boolean;
 }
 
-export function ExportButton({ slug, disabled = false }: ExportButtonProps): JSX.Element {
+export function ExportButton({
+  slug,
+  format = "zip",
+  disabled = false,
+}: ExportButtonProps): JSX.Element {
   const [isExporting, setIsExporting] = useState(false);
 
   const handleExport = async () => {
@@ -19,11 +25,11 @@ export function ExportButton({ slug, disabled = false }: ExportButtonProps): JSX
 
     setIsExporting(true);
     try {
-      const blob = await imagesApi.exportProject(slug);
+      const blob = await imagesApi.exportProject(slug, format);
       const url = URL.createObjectURL(blob);
       const a = document.createElement("a");
       a.href = url;
-      a.download = `${slug}.zip`;
+      a.download = `${slug}.${format}`;
       document.body.appendChild(a);
       a.click();
       document.body.removeChild(a);
@@ -61,7 +67,7 @@ export function ExportButton({ slug, disabled = false }: ExportButtonProps): JSX
             <polyline points="7 10 12 15 17 10" />
             <line x1="12" y1="15" x2="12" y2="3" />
           </svg>
-          ZIP
+          {format.toUpperCase()}
         </>
       )}
     </Button>
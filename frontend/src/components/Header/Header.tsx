@@ -61,10 +61,22 @@ export function Header({ onTitleChange, onBackToHome }: HeaderProps): JSX.Elemen
         <div className="h-5 w-px bg-[var(--md-graphite)] opacity-25" />
         <StyleBadge style={style} onClick={handleStyleClick} />
         {slug && (
-          <ExportButton
-            slug={slug}
-            disabled={!slides.some((s) => s.current_image)}
-          />
+          <>
+            <ExportButton
+              slug={slug}
+              disabled={!slides.some((s) => s.current_image)}
+            />
+            <ExportButton
+              slug={slug}
+              format="pdf"
+              disabled={!slides.some((s) => s.current_image)}
+            />
+            <ExportButton
+              slug={slug}
+              format="pptx"
+              disabled={!slides.some((s) => s.current_image)}
+            />
+          </>
         )}
         <PlayButton onClick={handlePlay} disabled={!canPlay} />
       </div>
@@ -5,13 +5,14 @@
 import { useState, useMemo } from "react";
 import { cn } from "@/utils";
 import { SlideEditModal } from "./SlideEditModal";
-import type { Slide, SlideImage } from "@/types";
+import type { GenerationProgressData, Slide, SlideImage } from "@/types";
 
 interface SlideItemProps {
   slide: Slide;
   index: number;
   isSelected: boolean;
   isGenerating: boolean;
+  progress?: GenerationProgressData;
   isDragging?: boolean;
   isDragOver?: boolean;
   onSelect: (sid: string) => void;
@@ -29,6 +30,7 @@ export function SlideItem({
   index,
   isSelected,
   isGenerating,
+  progress,
   isDragging = false,
   isDragOver = false,
   onSelect,
@@ -161,8 +163,15 @@ export function SlideItem({
 
           {/* Generating overlay */}
           {isGenerating && (
-            <div className="absolute inset-0 flex items-center justify-center bg-black/30">
+            <div className="absolute inset-0 flex flex-col items-center justify-center gap-1 bg-black/30">
               <div className="h-5 w-5 animate-spin rounded-full border-2 border-white border-t-transparent" />
+              {progress && (
+                <span className="text-[10px] font-bold text-white">
+                  {progress.queue_position > 0
+                    ? `#${progress.queue_position} in queue`
+                    : `~${Math.ceil(progress.remaining_seconds)}s`}
+                </span>
+              )}
             </div>
           )}
         </div>
@@ -24,7 +24,7 @@ export function SlideList({
   onContentChange,
   onReorder,
 }: SlideListProps): JSX.Element {
-  const { isSlideGenerating } = useUIStore();
+  const { isSlideGenerating, generationProgress } = useUIStore();
   const [draggingSid, setDraggingSid] = useState<string | null>(null);
   const [dragOverSid, setDragOverSid] = useState<string | null>(null);
 
@@ -89,6 +89,7 @@ export function SlideList({
           index={index}
           isSelected={slide.sid === selectedSid}
           isGenerating={isSlideGenerating(slide.sid)}
+          progress={generationProgress[slide.sid]}
           isDragging={slide.sid === draggingSid}
           isDragOver={slide.sid === dragOverSid && slide.sid !== draggingSid}
           onSelect={onSelect}
@@ -2,7 +2,7 @@
  * Hook for style management
  */
 
-import { useCallback } from "react";
+import { useCallback, useRef } from "react";
 import { styleApi } from "@/api";
 import { useStyleStore, useUIStore } from "@/stores";
 import { logger } from "@/utils";
@@ -16,7 +16,8 @@ export function useStyle(slug: string) {
     showSettingsModal,
     promptInput,
     setStyle,
-    setCandidates,
+    addCandidate,
+    claimStyleTask,
     setGenerating,
     setPromptInput,
     openSetupModal,
@@ -27,18 +28,24 @@ export function useStyle(slug: string) {
   } = useStyleStore();
 
   const { addToast } = useUIStore();
+  const lastGeneratedPromptRef = useRef<string | null>(null);
 
   // Generate candidate styles
   const generateCandidates = useCallback(
     async (prompt: string) => {
+      // Regenerating with the same prompt asks for fresh candidates, not cached ones
+      const force = prompt === lastGeneratedPromptRef.current;
+      lastGeneratedPromptRef.current = prompt;
       setGenerating(true);
       clearCandidates();
       setPromptInput(prompt); // Save prompt for later use in saveStyle
 
       try {
-        const response = await styleApi.generateStyle(slug, prompt);
-        setCandidates(response.candidates);
-        logger.info("Style candidates generated:", response.candidates.length);
+        // Return as soon as the first candidate is ready; the rest stream in over WebSocket
+        const response = await styleApi.generateStyle(slug, prompt, force, 1);
+        claimStyleTask(response.task_id);
+        response.candidates.forEach(addCandidate);
+        logger.info("Style candidates ready:", response.candidates.length, "pending:", response.pending);
       } catch (err) {
         addToast({
           type: "error",
@@ -49,7 +56,7 @@ export function useStyle(slug: string) {
         setGenerating(false);
       }
     },
-    [slug, setGenerating, clearCandidates, setPromptInput, setCandidates, addToast]
+    [slug, setGenerating, clearCandidates, setPromptInput, claimStyleTask, addCandidate, addToast]
   );
 
   // Save selected style
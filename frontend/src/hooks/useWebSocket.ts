@@ -3,15 +3,41 @@
  */
 
 import { useEffect, useRef, useCallback } from "react";
-import { WebSocketClient } from "@/api";
-import { useSlidesStore, useUIStore } from "@/stores";
-import type { WSMessage, GenerationCompletedData, CostUpdatedData } from "@/types";
+import { WebSocketClient, slidesApi } from "@/api";
+import { useSlidesStore, useStyleStore, useUIStore } from "@/stores";
+import type {
+  WSMessage,
+  GenerationCompletedData,
+  GenerationCancelledData,
+  GenerationProgressData,
+  CostUpdatedData,
+  StyleCandidateReadyData,
+  SlidesUpdatedData,
+  SlideCreatedData,
+  SlideUpdatedData,
+  SlideDeletedData,
+  SlidesReorderedData,
+  SelectionChangedData,
+  TitleUpdatedData,
+  StyleSavedData,
+} from "@/types";
 import { logger } from "@/utils";
 
 export function useWebSocket(slug: string) {
   const clientRef = useRef<WebSocketClient | null>(null);
-  const { updateSlideImage, setCost } = useSlidesStore();
-  const { addToast, removeGeneratingSlide, setGeneratingSlides } = useUIStore();
+  const {
+    updateSlideImage,
+    setCost,
+    setSlides,
+    setTitle,
+    mergeSlides,
+    deleteSlide,
+    reorderSlides,
+    setSelectedImageHash,
+  } = useSlidesStore();
+  const { addToast, removeGeneratingSlide, setGeneratingSlides, setGenerationProgress } =
+    useUIStore();
+  const { receiveCandidate, setStyle } = useStyleStore();
 
   // Handle incoming messages
   const handleMessage = useCallback(
@@ -51,6 +77,13 @@ export function useWebSocket(slug: string) {
           break;
         }
 
+        case "generation_cancelled": {
+          const data = message.data as GenerationCancelledData;
+          removeGeneratingSlide(data.sid);
+          logger.debug("Generation cancelled:", data.sid, data.reason);
+          break;
+        }
+
         case "cost_updated": {
           const data = message.data as CostUpdatedData;
           const currentCost = useSlidesStore.getState().cost;
@@ -64,18 +97,125 @@ export function useWebSocket(slug: string) {
           break;
         }
 
+        case "resync_required": {
+          // Missed messages could not be replayed: reload the project once
+          logger.info("WebSocket resync required, reloading project");
+          slidesApi
+            .getProject(slug)
+            .then((project) => {
+              setSlides(project.slides);
+              setTitle(project.title);
+              setStyle(project.style);
+            })
+            .catch((err) => logger.error("Failed to reload project:", err));
+          break;
+        }
+
+        // Project changes (from any tab, including this one): patch local state
+        case "slides_updated": {
+          const data = message.data as SlidesUpdatedData;
+          mergeSlides(data.slides, data.deleted, data.order);
+          if (data.title !== null) setTitle(data.title);
+          break;
+        }
+
+        case "slide_created": {
+          const data = message.data as SlideCreatedData;
+          const sids = useSlidesStore
+            .getState()
+            .slides.map((s) => s.sid)
+            .filter((sid) => sid !== data.slide.sid);
+          sids.splice(data.index, 0, data.slide.sid);
+          mergeSlides([data.slide], [], sids);
+          break;
+        }
+
+        case "slide_updated": {
+          const data = message.data as SlideUpdatedData;
+          mergeSlides([data.slide], []);
+          break;
+        }
+
+        case "slide_deleted": {
+          const data = message.data as SlideDeletedData;
+          deleteSlide(data.sid);
+          break;
+        }
+
+        case "slides_reordered": {
+          const data = message.data as SlidesReorderedData;
+          reorderSlides(data.order);
+          break;
+        }
+
+        case "selection_changed": {
+          const data = message.data as SelectionChangedData;
+          setSelectedImageHash(data.sid, data.image_hash);
+          break;
+        }
+
+        case "title_updated": {
+          const data = message.data as TitleUpdatedData;
+          setTitle(data.title);
+          break;
+        }
+
+        case "style_saved": {
+          const data = message.data as StyleSavedData;
+          setStyle(data.style);
+          break;
+        }
+
         case "generation_started": {
           logger.debug("Generation started:", message.data);
           break;
         }
 
-        case "style_generation_completed": {
-          logger.debug("Style generation completed:", message.data);
+        case "generation_progress": {
+          setGenerationProgress(message.data as GenerationProgressData);
+          break;
+        }
+
+        case "style_candidate_ready": {
+          const data = message.data as StyleCandidateReadyData;
+          receiveCandidate(data.task_id, data.candidate);
+          break;
+        }
+
+        case "style_generation_completed":
+        case "style_generation_failed":
+        case "style_generation_cancelled": {
+          logger.debug("Style generation finished:", message.type, message.data);
+          break;
+        }
+
+        case "export_started":
+        case "export_progress":
+        case "export_completed":
+        case "export_failed":
+        case "export_cancelled": {
+          logger.debug("Export job update:", message.type, message.data);
           break;
         }
       }
     },
-    [updateSlideImage, removeGeneratingSlide, setGeneratingSlides, setCost, addToast]
+    [
+      updateSlideImage,
+      removeGeneratingSlide,
+      setGeneratingSlides,
+      setGenerationProgress,
+      setCost,
+      setSlides,
+      setTitle,
+      mergeSlides,
+      deleteSlide,
+      reorderSlides,
+      setSelectedImageHash,
+      receiveCandidate,
+      setStyle,
+      addToast,
+      slug,
+    ]
   );
 
   // Connect on mount, disconnect on unmount
@@ -28,6 +28,7 @@ interface SlidesState {
   setSelectedImageHash: (sid: string, hash: string) => void;
   deleteSlide: (sid: string) => void;
   reorderSlides: (order: string[]) => void;
+  mergeSlides: (changed: Slide[], deleted: string[], order?: string[]) => void;
   setCost: (cost: CostInfo) => void;
   setLoading: (isLoading: boolean) => void;
   setError: (error: string | null) => void;
@@ -46,6 +47,16 @@ const initialState = {
   imageEngine: "gemini" as const,
 };
 
+// Ensure current_image is in the images array
+const withCurrentImage = (slide: Slide): Slide => {
+  let images = slide.images || [];
+  // If current_image exists but not in images array, add it
+  if (slide.current_image && !images.some((img) => img.hash === slide.current_image!.hash)) {
+    images = [...images, slide.current_image];
+  }
+  return { ...slide, images };
+};
+
 export const useSlidesStore = create<SlidesState>((set) => ({
   ...initialState,
 
@@ -55,15 +66,7 @@ export const useSlidesStore = create<SlidesState>((set) => ({
 
   setSlides: (slides) =>
     set((state) => ({
-      // Ensure current_image is in images array for each slide
-      slides: slides.map((slide) => {
-        let images = slide.images || [];
-        // If current_image exists but not in images array, add it
-        if (slide.current_image && !images.some((img) => img.hash === slide.current_image!.hash)) {
-          images = [...images, slide.current_image];
-        }
-        return { ...slide, images };
-      }),
+      slides: slides.map(withCurrentImage),
       // Select first slide if none selected
       selectedSid: state.selectedSid ?? slides[0]?.sid ?? null,
     })),
@@ -186,6 +189,30 @@ export const useSlidesStore = create<SlidesState>((set) => ({
       return { slides: newSlides };
     }),
 
+  mergeSlides: (changed, deleted, order) =>
+    set((state) => {
+      // Patch in slides sent by the server (new or updated), drop deleted ones
+      const slideMap = new Map(state.slides.map((s) => [s.sid, s]));
+      for (const slide of changed) {
+        slideMap.set(slide.sid, withCurrentImage(slide));
+      }
+      for (const sid of deleted) {
+        slideMap.delete(sid);
+      }
+      const sids = order ?? [
+        ...state.slides.map((s) => s.sid),
+        ...changed.map((s) => s.sid).filter((sid) => !state.slides.some((s) => s.sid === sid)),
+      ];
+      const newSlides = sids
+        .map((sid) => slideMap.get(sid))
+        .filter((s): s is Slide => s !== undefined);
+      const selectedSid =
+        state.selectedSid && slideMap.has(state.selectedSid)
+          ? state.selectedSid
+          : (newSlides[0]?.sid ?? null);
+      return { slides: newSlides, selectedSid };
+    }),
+
   setCost: (cost) => set({ cost }),
 
   setLoading: (isLoading) => set({ isLoading }),
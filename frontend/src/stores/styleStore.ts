@@ -231,6 +231,10 @@ interface StyleState {
   style: Style | null;
   candidates: StyleCandidate[];
   isGenerating: boolean;
+  // Task of the current candidate run; streamed candidates of other runs are ignored
+  styleTaskId: string | null;
+  // Candidates streamed before the run's task_id is known, by task_id
+  unclaimedCandidates: Record<string, StyleCandidate[]>;
   showSetupModal: boolean;
   showSettingsModal: boolean;
   promptInput: string;
@@ -243,6 +247,9 @@ interface StyleState {
   // Actions
   setStyle: (style: Style | null) => void;
   setCandidates: (candidates: StyleCandidate[]) => void;
+  addCandidate: (candidate: StyleCandidate) => void;
+  receiveCandidate: (taskId: string, candidate: StyleCandidate) => void;
+  claimStyleTask: (taskId: string) => void;
   setGenerating: (isGenerating: boolean) => void;
   setPromptInput: (prompt: string) => void;
   openSetupModal: () => void;
@@ -262,6 +269,8 @@ const initialState = {
   style: null,
   candidates: [],
   isGenerating: false,
+  styleTaskId: null,
+  unclaimedCandidates: {},
   showSetupModal: false,
   showSettingsModal: false,
   promptInput: "",
@@ -278,6 +287,36 @@ export const useStyleStore = create<StyleState>((set, get) => ({
 
   setCandidates: (candidates) => set({ candidates }),
 
+  // Candidates stream in over WebSocket and may race the HTTP response
+  addCandidate: (candidate) =>
+    set((state) =>
+      state.candidates.some((c) => c.id === candidate.id)
+        ? state
+        : { candidates: [...state.candidates, candidate] }
+    ),
+
+  // A candidate streamed over WebSocket: kept only if it belongs to the current run,
+  // or held until the run's task_id arrives with the HTTP response
+  receiveCandidate: (taskId, candidate) => {
+    const { styleTaskId, isGenerating, unclaimedCandidates, addCandidate } = get();
+    if (taskId === styleTaskId) {
+      addCandidate(candidate);
+    } else if (styleTaskId === null && isGenerating) {
+      set({
+        unclaimedCandidates: {
+          ...unclaimedCandidates,
+          [taskId]: [...(unclaimedCandidates[taskId] ?? []), candidate],
+        },
+      });
+    }
+  },
+
+  claimStyleTask: (taskId) => {
+    const early = get().unclaimedCandidates[taskId] ?? [];
+    set({ styleTaskId: taskId, unclaimedCandidates: {} });
+    early.forEach(get().addCandidate);
+  },
+
   setGenerating: (isGenerating) => set({ isGenerating }),
 
   setPromptInput: (promptInput) => set({ promptInput }),
@@ -296,7 +335,14 @@ export const useStyleStore = create<StyleState>((set, get) => ({
   },
 
   closeSetupModal: () =>
-    set({ showSetupModal: false, candidates: [], promptInput: "", selectedTemplate: null }),
+    set({
+      showSetupModal: false,
+      candidates: [],
+      styleTaskId: null,
+      unclaimedCandidates: {},
+      promptInput: "",
+      selectedTemplate: null,
+    }),
 
   openSettingsModal: () => {
     set({ showSettingsModal: true });
@@ -305,9 +351,16 @@ export const useStyleStore = create<StyleState>((set, get) => ({
   },
 
   closeSettingsModal: () =>
-    set({ showSettingsModal: false, candidates: [], promptInput: "", selectedTemplate: null }),
+    set({
+      showSettingsModal: false,
+      candidates: [],
+      styleTaskId: null,
+      unclaimedCandidates: {},
+      promptInput: "",
+      selectedTemplate: null,
+    }),
 
-  clearCandidates: () => set({ candidates: [] }),
+  clearCandidates: () => set({ candidates: [], styleTaskId: null, unclaimedCandidates: {} }),
 
   reset: () => set(initialState),
 
@@ -3,6 +3,7 @@
  */
 
 import { create } from "zustand";
+import type { GenerationProgressData } from "@/types";
 
 export interface Toast {
   id: string;
@@ -16,6 +17,7 @@ interface UIState {
   toasts: Toast[];
   isSidebarCollapsed: boolean;
   generatingSlides: Set<string>; // Set of sids currently generating
+  generationProgress: Record<string, GenerationProgressData>; // Latest progress per sid
 
   // Actions
   addToast: (toast: Omit<Toast, "id">) => void;
@@ -25,6 +27,7 @@ interface UIState {
   addGeneratingSlide: (sid: string) => void;
   removeGeneratingSlide: (sid: string) => void;
   setGeneratingSlides: (sids: string[]) => void;
+  setGenerationProgress: (progress: GenerationProgressData) => void;
   isSlideGenerating: (sid: string) => boolean;
   reset: () => void;
 }
@@ -33,6 +36,7 @@ const initialState = {
   toasts: [] as Toast[],
   isSidebarCollapsed: false,
   generatingSlides: new Set<string>(),
+  generationProgress: {} as Record<string, GenerationProgressData>,
 };
 
 let toastId = 0;
@@ -81,12 +85,19 @@ export const useUIStore = create<UIState>((set, get) => ({
     set((state) => {
       const newSet = new Set(state.generatingSlides);
       newSet.delete(sid);
-      return { generatingSlides: newSet };
+      const generationProgress = { ...state.generationProgress };
+      delete generationProgress[sid];
+      return { generatingSlides: newSet, generationProgress };
     }),
 
   setGeneratingSlides: (sids) =>
     set({ generatingSlides: new Set(sids) }),
 
+  setGenerationProgress: (progress) =>
+    set((state) => ({
+      generationProgress: { ...state.generationProgress, [progress.sid]: progress },
+    })),
+
   isSlideGenerating: (sid) => get().generatingSlides.has(sid),
 
   reset: () =>
@@ -2,6 +2,9 @@
  * API-related type definitions
  */
 
+import type { Slide } from "./slides";
+import type { Style } from "./style";
+
 export interface ApiResponse<T> {
   data: T;
   error?: ApiError;
@@ -22,15 +25,45 @@ export interface GenerateTaskResponse {
 // WebSocket message types
 export type WSMessageType =
   | "generation_started"
+  | "generation_progress"
   | "generation_completed"
   | "generation_failed"
+  | "generation_cancelled"
+  | "style_candidate_ready"
   | "style_generation_completed"
+  | "style_generation_failed"
+  | "style_generation_cancelled"
+  | "export_started"
+  | "export_progress"
+  | "export_completed"
+  | "export_failed"
+  | "export_cancelled"
   | "cost_updated"
-  | "sync_generating_tasks";
+  | "slides_updated"
+  | "slide_created"
+  | "slide_updated"
+  | "slide_deleted"
+  | "slides_reordered"
+  | "selection_changed"
+  | "title_updated"
+  | "style_saved"
+  | "sync_generating_tasks"
+  | "connected"
+  | "resync_required"
+  | "ping"
+  | "pong";
 
 export interface WSMessage<T = unknown> {
   type: WSMessageType;
   data: T;
+  version?: string; // Project version (ETag) after a project change event
+  seq?: number; // Per-project message number, for replay on reconnect (not on transient messages)
+}
+
+/** Sent on connect, and when missed messages can no longer be replayed */
+export interface ConnectedData {
+  epoch: string;
+  seq: number;
 }
 
 export interface GenerationStartedData {
@@ -38,6 +71,17 @@ export interface GenerationStartedData {
   sid: string;
 }
 
+export interface GenerationProgressData {
+  task_id: string;
+  sid: string;
+  engine: string;
+  queue_position: number; // 0 = running, n = n-th in line
+  elapsed_seconds: number;
+  remaining_seconds: number;
+  progress: number; // 0 - 1, estimated from historical latency
+  eta: string;
+}
+
 export interface GenerationCompletedData {
   task_id: string;
   sid: string;
@@ -45,6 +89,7 @@ export interface GenerationCompletedData {
     hash: string;
     url: string;
     thumbnail_url: string;
+    engine?: string | null;
   };
 }
 
@@ -54,14 +99,79 @@ export interface GenerationFailedData {
   error: string;
 }
 
-export interface StyleGenerationCompletedData {
-  candidates: Array<{
+export interface GenerationCancelledData {
+  task_id: string;
+  sid: string;
+  reason: "content_changed" | "slide_deleted" | "user" | string;
+}
+
+export interface StyleCandidateReadyData {
+  task_id: string;
+  candidate: {
     id: string;
     url: string;
-  }>;
+  };
+}
+
+export interface StyleGenerationCompletedData {
+  task_id: string;
 }
 
 export interface CostUpdatedData {
   total_images: number;
   estimated_cost: number;
 }
+
+export interface ExportProgressData {
+  task_id: string;
+  format: string;
+  done: number;
+  total: number;
+  progress: number; // 0 - 1
+}
+
+export interface ExportCompletedData {
+  task_id: string;
+  format: string;
+  download_url: string; // Supports Range requests; expires at expires_at
+  filename: string;
+  size: number;
+  expires_at: string;
+}
+
+export interface SlidesUpdatedData {
+  slides: Slide[]; // Created and updated slides
+  deleted: string[];
+  order: string[]; // Full slide order after the change
+  title: string | null; // New title, when it changed
+}
+
+export interface SlideCreatedData {
+  slide: Slide;
+  index: number;
+}
+
+export interface SlideUpdatedData {
+  slide: Slide;
+}
+
+export interface SlideDeletedData {
+  sid: string;
+}
+
+export interface SlidesReorderedData {
+  order: string[];
+}
+
+export interface SelectionChangedData {
+  sid: string;
+  image_hash: string;
+}
+
+export interface TitleUpdatedData {
+  title: string;
+}
+
+export interface StyleSavedData {
+  style: Style;
+}
@@ -10,6 +10,7 @@ export interface SlideImage {
   thumbnail_url?: string;
   created_at: string;
   matched: boolean;
+  engine?: string | null; // Engine that produced the image
 }
 
 export interface Slide {